@@ -1,12 +1,39 @@
 import streamlit as st
 from streamlit_ace import st_ace
 import os
+import re
 import subprocess
 import tempfile
 import graphviz
 from PIL import Image
 import io
 from themes import THEMES
+from tool_registry import ToolRegistry
+from verilator_cache import VerilatorCache
+from log_store import LogFile, LogStore
+
+# Persistent Verilator builds (next to this script, since the app chdirs per run)
+VERILATOR_CACHE = VerilatorCache(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".verilator_cache")
+)
+VERILATOR_FLAGS = ["--binary", "--trace"]
+BUILD_JOBS = str(os.cpu_count() or 1)
+TOOLS = ToolRegistry({"iverilog": None, "vvp": None, "verilator": None})
+
+# Full tool output goes to one log file per run; the console shows a page
+LOGS = LogStore(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".anandeda_logs")
+)
+CONSOLE_LINES = 200
+
+
+def run_logged(cmd, log_path):
+    """Run cmd with its stdout and stderr appended to log_path"""
+    with open(log_path, "ab") as log:
+        log.write(f"$ {' '.join(cmd)}\n".encode())
+        log.flush()
+        return subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT)
+
 
 st.set_page_config(
     page_title="AnandEDA Pro - VLSI Playground",
@@ -27,8 +54,8 @@ if "language" not in st.session_state:
     st.session_state.language = "verilog"
 if "wave_viewer" not in st.session_state:
     st.session_state.wave_viewer = "gtkwave"
-if "console_output" not in st.session_state:
-    st.session_state.console_output = ""
+if "log_path" not in st.session_state:
+    st.session_state.log_path = None
 if "schematic_png" not in st.session_state:
     st.session_state.schematic_png = None
 if "vcd_path" not in st.session_state:
@@ -276,41 +303,53 @@ with c1:
                     with open(os.path.join(tmp, f), "w") as fh:
                         fh.write(data["content"])
                 os.chdir(tmp)
-                output = ""
+                log_path = str(LOGS.new("sim"))
                 vcd_generated = False
                 if st.session_state.language == "verilog":
-                    compile_res = subprocess.run(
+                    compile_res = run_logged(
                         ["iverilog", "-o", "sim.out"]
                         + list(st.session_state.files.keys()),
-                        capture_output=True,
-                        text=True,
+                        log_path,
                     )
                     if compile_res.returncode == 0:
-                        sim_res = subprocess.run(
-                            ["vvp", "sim.out"], capture_output=True, text=True
-                        )
-                        output = sim_res.stdout + sim_res.stderr
+                        run_logged(["vvp", "sim.out"], log_path)
                         vcd_generated = os.path.exists("dump.vcd")
-                    else:
-                        output = compile_res.stderr
-                else:  # systemverilog with verilator (simplified)
+                else:  # systemverilog with verilator (persistent incremental build)
                     tb_name = tb_files[0].rsplit(".", 1)[0] if tb_files else "tb"
-                    res = subprocess.run(
-                        ["verilator", "--binary", "--trace", "--top-module", tb_name]
-                        + list(st.session_state.files.keys()),
-                        capture_output=True,
-                        text=True,
+                    build_dir, key = VERILATOR_CACHE.prepare(
+                        tb_name,
+                        VERILATOR_FLAGS,
+                        {f: d["content"] for f, d in st.session_state.files.items()},
+                        TOOLS.version("verilator"),
                     )
-                    output = res.stdout + res.stderr
-                    if res.returncode == 0 and os.path.exists("obj_dir"):
-                        run_res = subprocess.run(
-                            ["./obj_dir/V" + tb_name], capture_output=True, text=True
+                    os.chdir(build_dir)
+                    if os.path.exists("dump.vcd"):
+                        os.remove("dump.vcd")
+                    built = VERILATOR_CACHE.is_fresh(build_dir, key, tb_name)
+                    if built:
+                        with open(log_path, "a") as log:
+                            log.write(
+                                f"Verilator cache hit: reusing {build_dir.name}\n"
+                            )
+                    else:
+                        res = run_logged(
+                            ["verilator", *VERILATOR_FLAGS, "-j", BUILD_JOBS]
+                            + ["--top-module", tb_name]
+                            + list(st.session_state.files.keys()),
+                            log_path,
                         )
-                        output += "\n" + run_res.stdout + run_res.stderr
+                        built = res.returncode == 0
+                        if built:
+                            VERILATOR_CACHE.mark_built(build_dir, key)
+                    # A failed build leaves the previous model in build_dir:
+                    # running it would show stale results as current ones
+                    binary = VERILATOR_CACHE.binary(build_dir, tb_name)
+                    if built and binary.exists():
+                        run_logged([str(binary)], log_path)
                     vcd_generated = os.path.exists("dump.vcd")
-                st.session_state.console_output = output or "No output"
+                st.session_state.log_path = log_path
                 if vcd_generated:
-                    st.session_state.vcd_path = os.path.join(tmp, "dump.vcd")
+                    st.session_state.vcd_path = os.path.join(os.getcwd(), "dump.vcd")
 
 with c2:
     if st.button("🌊 View Waves"):
@@ -365,7 +404,41 @@ with c5:
 # Console
 st.markdown("---")
 st.subheader("📟 Console Output")
-st.code(st.session_state.console_output, language="text")
+if st.session_state.log_path and os.path.exists(st.session_state.log_path):
+    with LogFile(st.session_state.log_path) as log:
+        total = log.index_all()
+        l1, l2 = st.columns([1, 3])
+        with l1:
+            first = st.number_input(
+                "Jump to line",
+                min_value=1,
+                max_value=max(1, total),
+                value=max(1, total - CONSOLE_LINES + 1),
+            )
+        with l2:
+            pattern = st.text_input("Search (regex)")
+        start = first - 1
+        if pattern:
+            try:
+                matches = log.search(pattern)
+            except re.error as e:
+                st.error(f"Bad regex: {e}")
+            else:
+                shown = ", ".join(str(n + 1) for n in matches[:50])
+                more = " …" if len(matches) > 50 else ""
+                st.caption(f"{len(matches):,} matching lines: {shown}{more}")
+                if matches:
+                    start = matches[0]
+        st.caption(
+            f"Lines {start + 1:,}-{min(total, start + CONSOLE_LINES):,} of "
+            f"{total:,} | full log: {st.session_state.log_path}"
+        )
+        st.code(
+            "\n".join(log.lines(start, start + CONSOLE_LINES)) or "No output",
+            language="text",
+        )
+else:
+    st.code("No output", language="text")
 
 # Schematic Display
 if st.session_state.schematic_png and os.path.exists(st.session_state.schematic_png):
@@ -0,0 +1,5 @@
+"""
+Scaling benchmarks for MAVENIK ARENA: synthetic designs from a few lines
+to 100k+ lines, timed end to end through the TUI's own code paths.
+Run with `python -m bench --help`.
+"""
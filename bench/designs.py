@@ -0,0 +1,237 @@
+"""
+Synthetic Verilog designs of scalable size. Every design has the same top
+(`bench_top` with clk, rst and a 32-bit result) and is driven by the same
+self-checking-free testbench, so any design can go through compile,
+simulate and synthesis unchanged. Sizes are requested in lines; the
+generators pick the number of units (counters, adder leaves, FSMs or
+hierarchy levels) that gets closest.
+"""
+
+TOP = "bench_top"
+TESTBENCH = "bench_tb"
+TESTBENCH_FILE = "bench_top_tb.v"
+
+# Modules per file for the deep hierarchy (one level per module)
+MODULES_PER_FILE = 64
+
+COUNTER_WIDTHS = (4, 8, 16, 24, 32, 48, 64)
+
+
+class Design:
+    """Generated sources: {file name: text}, the design file and the top"""
+
+    def __init__(self, kind: str, units: int, files: dict, design_file: str):
+        self.kind = kind
+        self.units = units
+        self.files = files
+        self.design_file = design_file
+
+    @property
+    def lines(self) -> int:
+        return sum(text.count("\n") for text in self.files.values())
+
+    @property
+    def modules(self) -> int:
+        return sum(text.count("\nendmodule") for text in self.files.values())
+
+    def write(self, root) -> None:
+        for name, text in self.files.items():
+            (root / name).write_text(text)
+
+
+def _top_header(lines: list) -> None:
+    lines += [
+        f"module {TOP} (",
+        "    input clk,",
+        "    input rst,",
+        "    output [31:0] result",
+        ");",
+    ]
+
+
+# --- GENERATORS ---
+def counters(units: int) -> Design:
+    """A bank of free-running N-bit counters XOR-folded into the result"""
+    lines = ["// Counter bank"]
+    _top_header(lines)
+    lines.append("    wire [31:0] mix_0 = 32'd0;")
+    for i in range(units):
+        width = COUNTER_WIDTHS[i % len(COUNTER_WIDTHS)]
+        lines += [
+            "",
+            f"    // counter {i}: {width}-bit",
+            f"    reg [{width - 1}:0] count_{i};",
+            "    always @(posedge clk) begin",
+            f"        if (rst) count_{i} <= {width}'d0;",
+            f"        else count_{i} <= count_{i} + {width}'d{i % 7 + 1};",
+            "    end",
+            f"    wire [31:0] mix_{i + 1} = mix_{i} ^ count_{i};",
+        ]
+    lines += ["", f"    assign result = mix_{units};", "endmodule", ""]
+    return Design("counters", units, {"bench_top.v": "\n".join(lines)}, "bench_top.v")
+
+
+def adder_tree(units: int) -> Design:
+    """units 16-bit leaf registers summed by a balanced tree of adders"""
+    lines = ["// Adder tree"]
+    _top_header(lines)
+    lines += [f"    reg [15:0] leaf_{i};" for i in range(units)]
+    lines += ["", "    always @(posedge clk) begin", "        if (rst) begin"]
+    lines += [f"            leaf_{i} <= 16'd{i % 65536};" for i in range(units)]
+    lines += ["        end else begin"]
+    lines += [f"            leaf_{i} <= leaf_{i} + 16'd1;" for i in range(units)]
+    lines += ["        end", "    end", ""]
+
+    level = [f"leaf_{i}" for i in range(units)]
+    nodes = 0
+    while len(level) > 1:
+        merged = []
+        for a, b in zip(level[::2], level[1::2]):
+            lines.append(f"    wire [31:0] sum_{nodes} = {a} + {b};")
+            merged.append(f"sum_{nodes}")
+            nodes += 1
+        if len(level) % 2:
+            merged.append(level[-1])
+        level = merged
+    lines += ["", f"    assign result = {level[0]};", "endmodule", ""]
+    return Design("adder_tree", units, {"bench_top.v": "\n".join(lines)}, "bench_top.v")
+
+
+def fsm_bank(units: int, states: int = 8) -> Design:
+    """units independent Moore FSMs, each stepped by one bit of a tick counter"""
+    lines = ["// FSM bank"]
+    for i in range(units):
+        lines += [
+            "",
+            f"module fsm_{i} (",
+            "    input clk,",
+            "    input rst,",
+            "    input go,",
+            "    output reg [7:0] out",
+            ");",
+            "    reg [3:0] state;",
+            "    always @(posedge clk) begin",
+            "        if (rst) begin",
+            "            state <= 4'd0;",
+            "            out <= 8'd0;",
+            "        end else begin",
+            "            case (state)",
+        ]
+        for s in range(states):
+            nxt = (s + 1) % states
+            lines += [
+                f"                4'd{s}: begin",
+                f"                    state <= go ? 4'd{nxt} : 4'd{s};",
+                f"                    out <= 8'd{(i * states + s) % 256};",
+                "                end",
+            ]
+        lines += [
+            "                default: state <= 4'd0;",
+            "            endcase",
+            "        end",
+            "    end",
+            "endmodule",
+        ]
+
+    lines.append("")
+    _top_header(lines)
+    lines += [
+        "    reg [7:0] tick;",
+        "    always @(posedge clk) tick <= rst ? 8'd0 : tick + 8'd1;",
+        "    wire [31:0] mix_0 = 32'd0;",
+    ]
+    for i in range(units):
+        lines += [
+            f"    wire [7:0] out_{i};",
+            f"    fsm_{i} u_fsm_{i} (.clk(clk), .rst(rst), .go(tick[{i % 8}]), "
+            f".out(out_{i}));",
+            f"    wire [31:0] mix_{i + 1} = mix_{i} ^ (out_{i} << {i % 25});",
+        ]
+    lines += [f"    assign result = mix_{units};", "endmodule", ""]
+    return Design("fsm_bank", units, {"bench_top.v": "\n".join(lines)}, "bench_top.v")
+
+
+def hierarchy(units: int) -> Design:
+    """A chain of units nested modules, spread over several files"""
+    files = {}
+    for first in range(0, units, MODULES_PER_FILE):
+        lines = [f"// Hierarchy levels {first}+"]
+        for i in range(first, min(first + MODULES_PER_FILE, units)):
+            lines += [
+                "",
+                f"module level_{i} (",
+                "    input clk,",
+                "    input rst,",
+                "    input [31:0] din,",
+                "    output [31:0] dout",
+                ");",
+                "    reg [31:0] stage;",
+                "    always @(posedge clk)",
+                f"        stage <= rst ? 32'd0 : (din ^ 32'd{i}) + 32'd1;",
+            ]
+            if i + 1 < units:
+                lines.append(
+                    f"    level_{i + 1} u_next (.clk(clk), .rst(rst), "
+                    ".din(stage), .dout(dout));"
+                )
+            else:
+                lines.append("    assign dout = stage;")
+            lines.append("endmodule")
+        files[f"hier_{first // MODULES_PER_FILE}.v"] = "\n".join(lines) + "\n"
+
+    lines = ["// Deep hierarchy"]
+    _top_header(lines)
+    lines += [
+        "    reg [31:0] seed;",
+        "    always @(posedge clk) seed <= rst ? 32'd1 : seed + 32'd3;",
+        "    level_0 u_level_0 (.clk(clk), .rst(rst), .din(seed), .dout(result));",
+        "endmodule",
+        "",
+    ]
+    files["bench_top.v"] = "\n".join(lines)
+    return Design("hierarchy", units, files, "bench_top.v")
+
+
+# Generator and its approximate lines per unit
+DESIGNS = {
+    "counters": (counters, 8),
+    "adder_tree": (adder_tree, 4),
+    "fsm_bank": (fsm_bank, 55),
+    "hierarchy": (hierarchy, 13),
+}
+
+
+def testbench(cycles: int) -> str:
+    """Clock/reset driver for bench_top that dumps every signal"""
+    return "\n".join(
+        [
+            "`timescale 1ns/1ps",
+            f"module {TESTBENCH};",
+            "    reg clk = 0;",
+            "    reg rst = 1;",
+            "    wire [31:0] result;",
+            "",
+            f"    {TOP} dut (.clk(clk), .rst(rst), .result(result));",
+            "",
+            "    always #5 clk = ~clk;",
+            "",
+            "    initial begin",
+            '        $dumpfile("dump.vcd");',
+            f"        $dumpvars(0, {TESTBENCH});",
+            "        #20 rst = 0;",
+            f"        #{10 * cycles};",
+            '        $display("result = %h", result);',
+            "        $finish;",
+            "    end",
+            "endmodule",
+            "",
+        ]
+    )
+
+
+def generate(kind: str, lines: int, cycles: int = 200) -> Design:
+    """A design of roughly `lines` lines plus its testbench file"""
+    make, per_unit = DESIGNS[kind]
+    design = make(max(1, lines // per_unit))
+    design.files[TESTBENCH_FILE] = testbench(cycles)
+    return design
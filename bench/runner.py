@@ -0,0 +1,359 @@
+"""
+Benchmark runner. Each design is generated at each size in a scratch
+directory and driven through a headless MavenikArena exactly as a user
+would: both editors are loaded from the file tree, then file sync,
+compile, simulate, VCD load (vcd_reader), indexing (vcd_index) and
+columnar caching (wave_cache), synthesis, stats parsing and schematic
+are timed through the app's own actions and job scheduler. Tools that
+are not installed (or all of them with --stub-tools) are replaced by
+stubs.
+
+    python -m bench --designs counters,fsm_bank --sizes 10,1000,100000
+    python -m bench --compare old_results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench.designs import DESIGNS, TESTBENCH_FILE, generate
+from bench.stubs import STUBS, write_guards, write_stubs
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+DEFAULT_SIZES = (10, 1000, 10000, 100000)
+RESULTS_PATH = "bench_results.json"
+
+# Random value lookups timed on each dump's checkpoint index
+LOOKUPS = 100
+
+# Seconds a single stage may take before it is cancelled
+STAGE_TIMEOUT = 600
+
+STAGES = (
+    "editor_load",
+    "file_sync",
+    "compile",
+    "simulate",
+    "vcd_load",
+    "vcd_index",
+    "wave_cache",
+    "synthesize",
+    "stats_parse",
+    "schematic",
+)
+
+
+def stage(seconds: float, ok: bool, **info) -> dict:
+    return {"seconds": round(seconds, 4), "ok": bool(ok), **info}
+
+
+# --- STAGES ---
+async def wait_idle(app, timeout: float) -> None:
+    """Wait until the scheduler has no pending or running jobs"""
+    deadline = time.monotonic() + timeout
+    while app.scheduler.pending or app.scheduler.running:
+        if time.monotonic() > deadline:
+            app.scheduler.cancel_all()
+            raise TimeoutError
+        await asyncio.sleep(0.005)
+
+
+async def timed_action(app, action, timeout: float) -> dict:
+    """Run an F-key action and time it until its job has finished"""
+    finished = app.scheduler.finished
+    last = finished[-1] if finished else None
+    start = time.perf_counter()
+    action()
+    try:
+        await wait_idle(app, timeout)
+    except TimeoutError:
+        return stage(time.perf_counter() - start, False, error="timeout")
+    elapsed = time.perf_counter() - start
+    job = finished[-1] if finished else None
+    if job is None or job is last:
+        return stage(elapsed, False, error="no job submitted")
+    return stage(elapsed, job.state == "done", state=job.state)
+
+
+async def load_editors(app, pilot, root, design) -> dict:
+    """Select the design and testbench in the file tree; timed until painted"""
+    from textual.widgets import DirectoryTree
+
+    start = time.perf_counter()
+    for name in (design.design_file, TESTBENCH_FILE):
+        app.on_directory_tree_file_selected(
+            DirectoryTree.FileSelected(None, root / name)
+        )
+    await pilot.pause()
+    ok = app.design_path is not None and app.testbench_path is not None
+    return stage(time.perf_counter() - start, ok)
+
+
+def read_vcd(path) -> dict:
+    """Parse the header and stream every value change"""
+    from vcd_reader import VcdReader
+
+    with VcdReader(path) as vcd:
+        signals = len(vcd.header.signals)
+        changes = sum(1 for _ in vcd.changes())
+    return {"bytes": os.path.getsize(path), "signals": signals, "changes": changes}
+
+
+def index_vcd(path, lookups: int = LOOKUPS) -> dict:
+    """Build the dump's checkpoint index, then time random value lookups"""
+    from vcd_index import VcdIndex
+    from vcd_reader import VcdReader
+
+    rng = random.Random(0)
+    with VcdReader(path) as vcd:
+        start = time.perf_counter()
+        index = VcdIndex.build(vcd)
+        build = time.perf_counter() - start
+        codes = index.codes
+        last = index.times[-1] if index.times else 0
+        start = time.perf_counter()
+        for _ in range(lookups):
+            index.value_at(rng.choice(codes), rng.randint(0, last))
+        lookup = (time.perf_counter() - start) / lookups
+    return {
+        "build_s": round(build, 4),
+        "checkpoints": len(index.times),
+        "lookup_ms": round(lookup * 1000, 3),
+    }
+
+
+def cache_vcd(path) -> dict:
+    """Build the dump's columnar cache, reopen it and count every 1-bit
+    signal's rising edges"""
+    from wave_cache import WaveCache
+
+    start = time.perf_counter()
+    WaveCache.build(path)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    cache = WaveCache.load(path)
+    load = time.perf_counter() - start
+    start = time.perf_counter()
+    edges = sum(
+        cache.wave(code).edge_count()
+        for code, width in zip(cache.codes, cache.meta["widths"])
+        if width == 1
+    )
+    analysis = time.perf_counter() - start
+    return {
+        "build_s": round(build, 4),
+        "load_ms": round(load * 1000, 3),
+        "edges": edges,
+        "edges_ms": round(analysis * 1000, 3),
+    }
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return time.perf_counter() - start, value
+
+
+async def run_stages(app, pilot, root, design, timeout: float) -> dict:
+    from synth_pipeline import SynthArtifacts, summarize_stats
+
+    stages = {"editor_load": await load_editors(app, pilot, root, design)}
+    seconds, ok = timed(app.sync_files)
+    stages["file_sync"] = stage(seconds, ok)
+    stages["compile"] = await timed_action(app, app.action_compile, timeout)
+    stages["simulate"] = await timed_action(app, app.action_simulate, timeout)
+
+    vcd = app.last_sim / "dump.vcd" if app.last_sim else None
+    if vcd is not None and vcd.exists():
+        seconds, info = timed(read_vcd, vcd)
+        stages["vcd_load"] = stage(seconds, True, **info)
+        seconds, info = timed(index_vcd, vcd)
+        stages["vcd_index"] = stage(seconds, True, **info)
+        seconds, info = timed(cache_vcd, vcd)
+        stages["wave_cache"] = stage(seconds, True, **info)
+    else:
+        for name in ("vcd_load", "vcd_index", "wave_cache"):
+            stages[name] = stage(0.0, False, error="no dump.vcd")
+
+    stages["synthesize"] = await timed_action(app, app.action_synthesize, timeout)
+    synth_dir = app.runs.latest("synth")
+    if synth_dir is not None:
+        seconds, stats = timed(summarize_stats, SynthArtifacts(synth_dir).stats)
+        stages["stats_parse"] = stage(seconds, True, cells=stats["cells"])
+    else:
+        stages["stats_parse"] = stage(0.0, False, error="no stat.json")
+
+    stages["schematic"] = await timed_action(app, app.action_schematic, timeout)
+    return stages
+
+
+async def bench_case(design, root, repeat: int, timeout: float) -> dict:
+    """Start the app in root (holding the design) and run every stage"""
+    import mavenik_cloude
+
+    os.chdir(root)
+    app = mavenik_cloude.MavenikArena()
+    # Stub paths change per run; keep them out of the user's tool cache
+    app.tools.cache_path = None
+    async with app.run_test(size=(160, 48)) as pilot:
+        while app.ready_s is None:
+            await pilot.pause(0.01)
+        ready_s = app.ready_s
+        await pilot.press("enter")
+        loop = asyncio.get_running_loop()
+        versions = await loop.run_in_executor(None, app.tools.probe_all)
+        iterations = [
+            await run_stages(app, pilot, root, design, timeout) for _ in range(repeat)
+        ]
+    return {
+        "design": design.kind,
+        "units": design.units,
+        "lines": design.lines,
+        "files": len(design.files),
+        "modules": design.modules,
+        "ready_s": round(ready_s, 4),
+        "tools": versions,
+        "iterations": iterations,
+    }
+
+
+# --- SETUP AND REPORTING ---
+def configure_tools(bin_dir, force: bool) -> list:
+    """Point TOOL_PATHS at stubs for missing tools (or all); returns their names"""
+    import mavenik_cloude
+    from tool_registry import ToolRegistry
+
+    registry = ToolRegistry(mavenik_cloude.TOOL_PATHS, cache_path=None)
+    names = [name for name in STUBS if force or registry.resolve(name) is None]
+    mavenik_cloude.TOOL_PATHS.update(write_stubs(bin_dir, names))
+    return names
+
+
+def source_version() -> str:
+    try:
+        proc = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return "unknown"
+    return proc.stdout.strip() or "unknown"
+
+
+def format_case(case: dict) -> str:
+    first = case["iterations"][0]
+    cells = [f"{case['design']:<11}{case['lines']:>8} lines"]
+    for name in STAGES:
+        mark = "" if first[name]["ok"] else "!"
+        cells.append(f"{name} {first[name]['seconds']:.3f}s{mark}")
+    return " | ".join(cells)
+
+
+def compare(old: dict, new: dict) -> None:
+    """Print new/old time ratios for every stage both reports measured"""
+    before = {(c["design"], c["units"]): c for c in old["results"]}
+    print(f"\n📊 {new['version']} vs {old['version']} (ratio < 1 is faster)")
+    for case in new["results"]:
+        previous = before.get((case["design"], case["units"]))
+        if previous is None:
+            continue
+        ratios = []
+        for name in STAGES:
+            a = previous["iterations"][0].get(name, {}).get("seconds")
+            b = case["iterations"][0].get(name, {}).get("seconds")
+            if a and b is not None:
+                ratios.append(f"{name} {b / a:.2f}x")
+        print(f"  {case['design']:<11}{case['lines']:>8} lines | {' | '.join(ratios)}")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m bench", description="MAVENIK ARENA scaling benchmark"
+    )
+    parser.add_argument("--designs", default=",".join(DESIGNS))
+    parser.add_argument(
+        "--sizes", default=",".join(str(size) for size in DEFAULT_SIZES)
+    )
+    parser.add_argument("--cycles", type=int, default=200, help="simulated cycles")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per design")
+    parser.add_argument("--stub-tools", action="store_true", help="stub all tools")
+    parser.add_argument("--timeout", type=float, default=STAGE_TIMEOUT)
+    parser.add_argument("--out", default=RESULTS_PATH)
+    parser.add_argument("--compare", help="earlier results JSON to compare with")
+    parser.add_argument("--keep", action="store_true", help="keep scratch dirs")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    designs = [name.strip() for name in args.designs.split(",") if name.strip()]
+    unknown = [name for name in designs if name not in DESIGNS]
+    if unknown:
+        print(f"✗ Unknown design(s): {', '.join(unknown)} (have {', '.join(DESIGNS)})")
+        return 2
+    sizes = [int(size) for size in args.sizes.split(",")]
+    out = Path(args.out).resolve()
+    cwd = Path.cwd()
+
+    work = Path(tempfile.mkdtemp(prefix="mavenik-bench-"))
+    write_guards(work / "guards")
+    stubbed = configure_tools(work / "stubs", args.stub_tools)
+    os.environ["BENCH_CYCLES"] = str(args.cycles)
+    if stubbed:
+        print(f"🧩 Stubbed tools: {', '.join(stubbed)}")
+
+    results = []
+    try:
+        for kind in designs:
+            for size in sizes:
+                design = generate(kind, size, args.cycles)
+                root = work / f"{kind}-{design.units}"
+                root.mkdir()
+                design.write(root)
+                case = asyncio.run(bench_case(design, root, args.repeat, args.timeout))
+                os.chdir(cwd)
+                results.append(case)
+                print(format_case(case), flush=True)
+    finally:
+        os.chdir(cwd)
+        if args.keep:
+            print(f"📁 Scratch designs kept in {work}")
+        else:
+            shutil.rmtree(work, ignore_errors=True)
+
+    report = {
+        "version": source_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "cycles": args.cycles,
+        "stubbed_tools": stubbed,
+        "results": results,
+    }
+    out.write_text(json.dumps(report, indent=2))
+    print(f"📄 Results: {out}")
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text()), report)
+    failed = [
+        name
+        for case in results
+        for iteration in case["iterations"]
+        for name, result in iteration.items()
+        if not result["ok"]
+    ]
+    return 1 if failed else 0
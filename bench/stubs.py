@@ -0,0 +1,176 @@
+"""
+Stand-in tool executables for machines without the EDA tools installed.
+They accept the same command lines as the real tools and produce outputs
+of a size that follows the design (a VCD with one variable per declared
+reg/wire, stat.json and schematic.dot scaled to the source), so the app
+side of every flow is exercised realistically. Their own run time is not
+representative of the real tools.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Python prelude shared by the stubs
+PRELUDE = """\
+import json, os, re, sys
+DECL_RE = re.compile(r"^\\s*(?:reg|wire)\\s*(?:\\[(\\d+):\\d+\\])?\\s*(\\w+)", re.M)
+
+def scan(paths):
+    lines, signals = 0, []
+    for path in paths:
+        with open(path) as f:
+            text = f.read()
+        lines += text.count("\\n")
+        signals += [(int(msb or 0) + 1, name) for msb, name in DECL_RE.findall(text)]
+    return lines, signals
+
+def version(banner, flag="-V"):
+    if sys.argv[1:] == [flag]:
+        print(banner)
+        sys.exit(0)
+"""
+
+IVERILOG = """\
+version("Icarus Verilog version 0.0 (bench stub)")
+args, out, sources = sys.argv[1:], "a.out", []
+while args:
+    arg = args.pop(0)
+    if arg in ("-o", "-s"):
+        value = args.pop(0)
+        out = value if arg == "-o" else out
+    elif arg.endswith((".v", ".sv")):
+        sources.append(arg)
+lines, signals = scan(sources)
+with open(out, "w") as f:
+    f.write("#! vvp (bench stub)\\n")
+    json.dump({"lines": lines, "signals": signals}, f)
+"""
+
+VVP = """\
+version("Icarus Verilog runtime version 0.0 (bench stub)")
+with open(sys.argv[1]) as f:
+    image = json.loads(f.read().split("\\n", 1)[1])
+cycles = int(os.environ.get("BENCH_CYCLES", "200"))
+
+def ident(i):
+    code = ""
+    while True:
+        code += chr(33 + i % 94)
+        i //= 94
+        if not i:
+            return code
+
+signals = [(1, "clk")] + [tuple(s) for s in image["signals"]]
+print("VCD info: dumpfile dump.vcd opened for output.")
+with open("dump.vcd", "w") as f:
+    f.write("$timescale 1ps $end\\n$scope module bench_tb $end\\n")
+    for i, (width, name) in enumerate(signals):
+        f.write(f"$var wire {width} {ident(i)} {name} $end\\n")
+    f.write("$upscope $end\\n$enddefinitions $end\\n#0\\n$dumpvars\\n")
+    for i, (width, name) in enumerate(signals):
+        f.write(f"0{ident(i)}\\n" if width == 1 else f"b0 {ident(i)}\\n")
+    f.write("$end\\n")
+    for step in range(1, 2 * cycles + 1):
+        f.write(f"#{step * 5000}\\n{step % 2}!\\n")
+        if step % 2:
+            continue
+        for i, (width, name) in enumerate(signals[1:], 1):
+            if step // 2 % (i % 8 + 1) == 0:
+                value = (step * i) & ((1 << width) - 1)
+                f.write(f"{value & 1}{ident(i)}\\n" if width == 1 else
+                        f"b{value:b} {ident(i)}\\n")
+print(f"result = {len(signals):08x}")
+"""
+
+YOSYS = """\
+version("Yosys 0.0 (bench stub)")
+state = {"lines": 0, "signals": []}
+
+def handle(command):
+    words = command.split()
+    if not words:
+        return
+    if words[0] == "read_verilog":
+        state["lines"], state["signals"] = scan(w for w in words[1:] if w[0] != "-")
+        print(f"Parsed {state['lines']} lines.")
+    elif words[:3] == ["tee", "-q", "-o"]:
+        cells = 2 * state["lines"]
+        stats = {"design": {
+            "num_wires": len(state["signals"]),
+            "num_wire_bits": sum(w for w, _ in state["signals"]),
+            "num_cells": cells,
+            "num_cells_by_type": {"$_AND_": cells // 2, "$_XOR_": cells // 4,
+                                  "$_DFF_P_": cells - cells // 2 - cells // 4},
+        }}
+        with open(words[3], "w") as f:
+            json.dump(stats, f)
+    elif words[0] == "show":
+        with open(words[-1] + ".dot", "w") as f:
+            f.write("digraph design {\\n")
+            for i, (_, name) in enumerate(state["signals"]):
+                f.write(f'  n{i} [label="{name}"];\\n')
+                if i:
+                    f.write(f"  n{i - 1} -> n{i};\\n")
+            f.write("}\\n")
+    elif words[0] in ("write_json", "write_verilog"):
+        with open(words[-1], "w") as f:
+            f.write("// bench stub netlist\\n")
+
+if "-s" in sys.argv:
+    with open(sys.argv[sys.argv.index("-s") + 1]) as f:
+        for line in f:
+            for command in line.split(";"):
+                handle(command)
+    sys.exit(0)
+
+sys.stdout.write("yosys> ")
+sys.stdout.flush()
+for line in sys.stdin:
+    for command in line.split(";"):
+        handle(command)
+    sys.stdout.write("\\nyosys> ")
+    sys.stdout.flush()
+"""
+
+DOT = """\
+if sys.argv[1:] == ["-V"]:
+    sys.stderr.write("dot - graphviz version 0.0 (bench stub)\\n")
+    sys.exit(0)
+args = sys.argv[1:]
+out = args[args.index("-o") + 1]
+source = next(a for a in args if a.endswith(".dot"))
+with open(source) as f:
+    nodes = f.read().count("label=")
+with open(out, "wb") as f:
+    f.write(b"\\x89PNG\\r\\n\\x1a\\n" + bytes(nodes))
+"""
+
+STUBS = {"iverilog": IVERILOG, "vvp": VVP, "yosys": YOSYS, "dot": DOT}
+
+# Commands the app launches for the user that must not open windows
+GUARDS = ("xdg-open",)
+
+
+def write_stubs(bin_dir, names) -> dict:
+    """Write the named stubs into bin_dir; returns {tool: stub path}"""
+    bin_dir = Path(bin_dir)
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for name in names:
+        path = bin_dir / name
+        path.write_text(f"#!{sys.executable}\n{PRELUDE}\n{STUBS[name]}")
+        path.chmod(0o755)
+        paths[name] = str(path)
+    return paths
+
+
+def write_guards(bin_dir) -> None:
+    """No-op stand-ins for GUARDS; put bin_dir first on $PATH to use them"""
+    bin_dir = Path(bin_dir)
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    for name in GUARDS:
+        path = bin_dir / name
+        path.write_text("#!/bin/sh\nexit 0\n")
+        path.chmod(0o755)
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
@@ -0,0 +1,92 @@
+"""
+Content-addressed build cache for compiled simulation images (.vvp).
+Entries are keyed on the sources, compiler flags and compiler version.
+"""
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+# Number of compiled images kept before the oldest are pruned
+MAX_ENTRIES = 32
+
+
+def hash_key(*parts) -> str:
+    """Stable sha256 over an ordered list of str/bytes parts"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode()
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def write_if_changed(path, text: str) -> bool:
+    """Write text to path only when it differs; returns True if written"""
+    path = Path(path)
+    try:
+        if path.read_text() == text:
+            return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    # Replace atomically so a tool already reading the old file is unaffected
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+    return True
+
+
+class BuildCache:
+    """Stores compiled images under <root>/<key><suffix>"""
+
+    def __init__(self, root, suffix: str = ".vvp", max_entries: int = MAX_ENTRIES):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.suffix = suffix
+        self.max_entries = max_entries
+
+    def key(self, sources, flags: str, version: str) -> str:
+        """Key over every source file (name and content), flags and version"""
+        texts = [f"{path}\0{Path(path).read_text()}" for path in sources]
+        return hash_key(flags, version, *texts)
+
+    def entry(self, key: str) -> Path:
+        return self.root / f"{key}{self.suffix}"
+
+    def lookup(self, key: str):
+        """Return the cached image path or None"""
+        path = self.entry(key)
+        if path.exists():
+            os.utime(path)
+            return path
+        return None
+
+    def restore(self, key: str, dest) -> bool:
+        """Copy a cached image to dest; returns False on a miss"""
+        cached = self.lookup(key)
+        if cached is None:
+            return False
+        tmp = Path(f"{dest}.tmp")
+        shutil.copyfile(cached, tmp)
+        os.replace(tmp, dest)
+        return True
+
+    def store(self, key: str, built) -> Path:
+        """Copy a freshly built image into the cache atomically"""
+        path = self.entry(key)
+        tmp = path.with_name(path.name + ".tmp")
+        shutil.copyfile(built, tmp)
+        os.replace(tmp, path)
+        self.prune()
+        return path
+
+    def prune(self) -> None:
+        entries = sorted(
+            self.root.glob(f"*{self.suffix}"),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for stale in entries[self.max_entries :]:
+            stale.unlink(missing_ok=True)
@@ -0,0 +1,192 @@
+"""
+Console widget for tool output. Lines are kept in a bounded ring buffer
+(the oldest are dropped past max_lines). Writes are queued and moved into
+the buffer once per rendered frame, however many arrived, and only the
+rows on screen are rendered, so appending stays cheap however long the
+log gets. LineLimiter caps how many lines per second a noisy tool may
+put on the console.
+"""
+
+import re
+import time
+from collections import deque
+
+from rich.cells import cell_len
+from rich.segment import Segment
+from rich.style import Style
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+# Lines kept before the oldest are dropped
+MAX_LINES = 20000
+
+# Tool output lines per second shown on the console (None: unlimited)
+RATE_LIMIT = 1000
+
+# Suppressed lines at the very end of the output shown with the summary
+TAIL_LINES = 5
+
+# Control characters that would corrupt the terminal if rendered
+CONTROL_RE = re.compile("[\x00-\x08\x0b-\x1f\x7f]")
+
+LEVEL_STYLES = {
+    "info": Style(),
+    "success": Style(color="green"),
+    "warning": Style(color="yellow"),
+    "error": Style(color="red"),
+}
+
+
+class ConsoleView(ScrollView, can_focus=True):
+    """Append-only, virtualized log of (text, level) lines"""
+
+    DEFAULT_CSS = """
+    ConsoleView {
+        background: $surface;
+        color: $text;
+        overflow: auto;
+    }
+    """
+
+    def __init__(self, max_lines: int = MAX_LINES, **kwargs):
+        super().__init__(**kwargs)
+        self.lines = deque(maxlen=max_lines)
+        self.pending = []  # (text, level) written since the last frame
+        self.max_width = 0
+        self.dropped = 0
+        self.shift = 0  # lines dropped since the last layout update
+        self.layout_pending = False
+        # Stick to the newest line until the user scrolls up
+        self.follow = True
+
+    @property
+    def max_lines(self) -> int:
+        return self.lines.maxlen
+
+    @property
+    def text(self) -> str:
+        """Buffered lines as one string"""
+        self.flush()
+        return "".join(f"{line}\n" for line, _ in self.lines)
+
+    def write(self, text: str, level: str = "info") -> "ConsoleView":
+        """Append text, one console line per line of text"""
+        return self.write_lines(text.splitlines(), level)
+
+    def write_line(self, line: str, level: str = "info") -> "ConsoleView":
+        return self.write_lines([line], level)
+
+    def write_lines(self, lines, level: str = "info") -> "ConsoleView":
+        """Queue lines; they are shown after the next refresh"""
+        self.pending.extend((line, level) for line in lines)
+        if self.pending and not self.layout_pending:
+            self.layout_pending = True
+            self.call_after_refresh(self.update_layout)
+        return self
+
+    def flush(self) -> None:
+        """Move queued lines into the ring buffer"""
+        pending, self.pending = self.pending, []
+        if not pending:
+            return
+        overflow = len(pending) - self.max_lines
+        if overflow > 0:
+            # Lines that would be dropped straight away are never processed
+            pending = pending[overflow:]
+        before = len(self.lines)
+        for line, level in pending:
+            line = CONTROL_RE.sub("\ufffd", line.expandtabs())
+            self.lines.append((line, level))
+            self.max_width = max(self.max_width, cell_len(line))
+        dropped = max(0, overflow) + before + len(pending) - len(self.lines)
+        self.dropped += dropped
+        self.shift += dropped
+
+    def update_layout(self) -> None:
+        """Apply every write since the last frame in one go"""
+        self.layout_pending = False
+        self.flush()
+        shift, self.shift = self.shift, 0
+        self.virtual_size = Size(self.max_width, len(self.lines))
+        if self.follow:
+            self.scroll_end(animate=False, immediate=True, x_axis=False)
+        elif shift:
+            # Keep the rows the user scrolled to in place as old ones go
+            self.scroll_to(y=max(0, self.scroll_y - shift), animate=False)
+        self.refresh()
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        self.follow = new_value >= self.max_scroll_y
+
+    def on_resize(self) -> None:
+        if self.follow:
+            self.scroll_end(animate=False, immediate=True, x_axis=False)
+
+    def clear(self) -> "ConsoleView":
+        self.lines.clear()
+        self.pending.clear()
+        self.max_width = 0
+        self.shift = 0
+        self.virtual_size = Size(0, 0)
+        self.refresh()
+        return self
+
+    def show(self, text: str, level: str = "info") -> "ConsoleView":
+        """Replace the contents with text"""
+        return self.clear().write(text, level)
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        index = scroll_y + y
+        width = self.size.width
+        base = self.rich_style
+        if index >= len(self.lines):
+            return Strip.blank(width, base)
+        line, level = self.lines[index]
+        style = base + LEVEL_STYLES.get(level, LEVEL_STYLES["info"])
+        strip = Strip([Segment(line, style)], cell_len(line))
+        return strip.crop_extend(scroll_x, scroll_x + width, base)
+
+
+class LineLimiter:
+    """Token bucket letting `rate` lines per second through, in bursts of up
+    to one second's worth; the rest are counted as suppressed"""
+
+    def __init__(self, rate=RATE_LIMIT, tail: int = TAIL_LINES):
+        self.rate = rate
+        self.tokens = float(rate or 0)
+        self.stamp = time.monotonic()
+        self.suppressed = 0
+        # (tag, line) suppressed since the last line that was let through
+        self.tail = deque(maxlen=tail)
+
+    def admit(self, count: int = 1) -> int:
+        """How many of the next count lines may be shown"""
+        if not self.rate:
+            return count
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        allowed = min(count, int(self.tokens))
+        self.tokens -= allowed
+        self.suppressed += count - allowed
+        return allowed
+
+    def allow(self) -> bool:
+        return self.admit() == 1
+
+    def filter(self, lines, tag=None) -> list:
+        """The leading lines that may be shown now; the rest are suppressed"""
+        allowed = self.admit(len(lines))
+        if allowed:
+            self.tail.clear()
+        if allowed < len(lines):
+            rest = lines[allowed:][-self.tail.maxlen :] if self.tail.maxlen else []
+            self.tail.extend((tag, line) for line in rest)
+        return lines[:allowed]
+
+    def summary(self, log_path=None) -> str:
+        where = f", full log at {log_path}" if log_path else ""
+        return f"… {self.suppressed:,} lines suppressed{where}"
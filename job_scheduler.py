@@ -0,0 +1,175 @@
+"""
+Central job scheduler for EDA actions (compile, simulate, synth, lint...).
+Jobs are queued by priority, serialized on shared artifacts and can be
+superseded or preempted; cancelling a job kills its tool process group.
+"""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+
+from tracing import TRACER
+
+# Job priorities (lower runs first)
+INTERACTIVE = 0
+BACKGROUND = 1
+
+# Finished jobs kept for the queue panel
+HISTORY_SIZE = 20
+
+
+class Job:
+    """A queued unit of work built from a coroutine factory"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name, factory, kind, priority, resources):
+        self.id = next(self._ids)
+        self.name = name
+        self.factory = factory
+        self.kind = kind
+        self.priority = priority
+        self.resources = frozenset(resources)
+        self.state = "pending"
+        self.error = None
+        self.task = None
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def active(self) -> bool:
+        return self.state in ("pending", "running")
+
+    def sort_key(self):
+        return (self.priority, self.submitted, self.id)
+
+
+class JobScheduler:
+    """Runs jobs on the current asyncio loop with a fixed number of slots"""
+
+    def __init__(self, max_running: int = 2, on_change=None):
+        self.max_running = max_running
+        self.on_change = on_change
+        self.pending = []
+        self.running = []
+        self.finished = deque(maxlen=HISTORY_SIZE)
+
+    def submit(self, name, factory, kind=None, priority=INTERACTIVE, resources=()):
+        """Queue factory() to run; an older job of the same kind is superseded"""
+        kind = kind or name
+        for job in self.pending + self.running:
+            if job.kind == kind:
+                self.cancel(job, "superseded")
+
+        job = Job(name, factory, kind, priority, resources)
+        self.pending.append(job)
+        self._dispatch()
+        return job
+
+    def cancel(self, job, reason: str = "cancelled") -> bool:
+        """Drop a pending job or kill a running one"""
+        if job in self.pending:
+            self.pending.remove(job)
+            self._finish(job, reason)
+            return True
+        if job in self.running and job.task is not None:
+            job.state = reason
+            job.task.cancel()
+            return True
+        return False
+
+    def cancel_all(self) -> int:
+        jobs = self.pending + self.running
+        return sum(self.cancel(job) for job in jobs)
+
+    def jobs(self):
+        """Running, then pending (in run order), then recent history"""
+        pending = sorted(self.pending, key=Job.sort_key)
+        return self.running + pending + list(reversed(self.finished))
+
+    def _conflicts(self, job):
+        return [r for r in self.running if r.resources & job.resources]
+
+    def _dispatch(self) -> None:
+        for job in sorted(self.pending, key=Job.sort_key):
+            blockers = self._conflicts(job)
+            if not blockers and len(self.running) >= self.max_running:
+                background = [r for r in self.running if r.priority > job.priority]
+                blockers = background[-1:] or None
+            if blockers:
+                # Interactive work may preempt lower-priority jobs in its way
+                if all(b.priority > job.priority for b in blockers):
+                    for blocker in blockers:
+                        self._preempt(blocker)
+                else:
+                    continue
+            if blockers is None:
+                break
+            self._start(job)
+        self._notify()
+
+    def _preempt(self, job) -> None:
+        """Kill a running job and requeue a fresh copy of it"""
+        self.cancel(job, "preempted")
+        self.running.remove(job)
+        retry = Job(job.name, job.factory, job.kind, job.priority, job.resources)
+        self.pending.append(retry)
+
+    def _start(self, job) -> None:
+        self.pending.remove(job)
+        self.running.append(job)
+        job.state = "running"
+        job.started = time.monotonic()
+        job.task = asyncio.ensure_future(self._run(job))
+        job.task.add_done_callback(lambda task: self._settle(job))
+
+    async def _run(self, job) -> None:
+        state = "done"
+        try:
+            with TRACER.track(f"#{job.id} {job.name}"), TRACER.span(
+                job.name, "job", queued_s=round(job.started - job.submitted, 3)
+            ) as span:
+                ok = await job.factory()
+                span["ok"] = ok is not False
+            if ok is False:
+                state = "failed"
+        except asyncio.CancelledError:
+            state = job.state if job.state != "running" else "cancelled"
+        except Exception as e:
+            state = "failed"
+            job.error = str(e)
+        finally:
+            if job in self.running:
+                self.running.remove(job)
+            self._finish(job, state)
+            self._dispatch()
+
+    def _settle(self, job) -> None:
+        """Release a job whose task was cancelled before its first step
+        (_run's finally never ran, so it still holds a slot and resources)"""
+        if job.finished is not None:
+            return
+        if job in self.running:
+            self.running.remove(job)
+        self._finish(job, job.state if job.state != "running" else "cancelled")
+        self._dispatch()
+
+    def _finish(self, job, state: str) -> None:
+        job.state = state
+        job.finished = time.monotonic()
+        if job.started is None:
+            job.started = job.finished
+        self.finished.append(job)
+        self._notify()
+
+    def _notify(self) -> None:
+        if self.on_change:
+            self.on_change()
@@ -0,0 +1,219 @@
+"""
+Pager widget for LogFile. Only the rows on screen are read from the
+mapped log, the index is built off the UI thread as the file grows, and
+in follow mode the view sticks to the end of a log that is still being
+written (e.g. a running simulation).
+"""
+
+import asyncio
+from bisect import bisect_left, bisect_right
+
+from rich.cells import cell_len
+from rich.segment import Segment
+from rich.style import Style
+from textual.binding import Binding
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from console_view import CONTROL_RE
+from log_store import LogFile
+
+# Seconds between checks for new output
+POLL_INTERVAL = 0.25
+
+NUMBER_STYLE = Style(color="bright_black")
+MATCH_STYLE = Style(color="yellow")
+CURSOR_STYLE = Style(reverse=True)
+
+
+class LogPager(ScrollView, can_focus=True):
+    """Scrollable view of a LogFile with line numbers and search matches"""
+
+    BINDINGS = [
+        Binding("f", "toggle_follow", "Follow"),
+        Binding("n", "next_match", "Next match"),
+        Binding("N", "previous_match", "Previous match"),
+        Binding("g", "goto_line(0)", "Top", show=False),
+        Binding("G", "goto_end", "Bottom", show=False),
+    ]
+
+    DEFAULT_CSS = """
+    LogPager {
+        background: $surface;
+        color: $text;
+        overflow: auto;
+    }
+    """
+
+    def __init__(self, path=None, follow: bool = True, **kwargs):
+        super().__init__(**kwargs)
+        self.log_file = None
+        self.follow = follow
+        self.cursor = None  # line jumped to, highlighted
+        self.matches = []
+        self.pattern = None
+        self.max_width = 0
+        self.polling = False
+        # Lines indexed when last shown (the index grows in a thread)
+        self.line_count = 0
+        if path is not None:
+            self.open(path)
+
+    def on_mount(self) -> None:
+        self.set_interval(POLL_INTERVAL, self.poll)
+        self.call_after_refresh(self.update_lines)
+        self.call_after_refresh(self.poll)
+
+    def open(self, path) -> None:
+        """Show another log, from the end if following"""
+        if self.log_file is not None:
+            self.log_file.close()
+        self.log_file = LogFile(path)
+        self.cursor = None
+        self.matches = []
+        self.pattern = None
+        self.max_width = 0
+        self.line_count = len(self.log_file)
+        self.virtual_size = Size(0, self.line_count)
+        self.scroll_to(0, 0, animate=False)
+        if self.is_mounted:
+            self.call_after_refresh(self.update_lines)
+            self.call_after_refresh(self.poll)
+
+    def close(self) -> None:
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+            self.line_count = 0
+
+    def on_unmount(self) -> None:
+        self.close()
+
+    async def poll(self) -> None:
+        """Map and index new output (in a thread) and update the view"""
+        log = self.log_file
+        if log is None or self.polling:
+            return
+        self.polling = True
+        try:
+            log.refresh()
+            while not log.complete and log is self.log_file:
+                await asyncio.to_thread(log.index)
+                self.update_lines()
+        finally:
+            self.polling = False
+
+    def update_lines(self) -> None:
+        """Show the lines indexed so far"""
+        if self.log_file is None:
+            return
+        self.line_count = len(self.log_file)
+        self.virtual_size = Size(self.max_width, self.line_count)
+        if self.follow:
+            self.scroll_end(animate=False, immediate=True, x_axis=False)
+        self.refresh()
+        self.post_status()
+
+    def post_status(self) -> None:
+        """Let the screen update its status line"""
+        status = getattr(self.screen, "update_status", None)
+        if status is not None:
+            status()
+
+    # --- NAVIGATION ---
+    def goto(self, number: int) -> None:
+        """Scroll line number (0-based) to the top third and highlight it"""
+        if not self.line_count:
+            return
+        self.follow = False
+        self.cursor = max(0, min(number, self.line_count - 1))
+        top = max(0, self.cursor - self.size.height // 3)
+        self.scroll_to(y=top, animate=False, immediate=True)
+        self.refresh()
+        self.post_status()
+
+    def action_goto_line(self, number: int) -> None:
+        self.goto(number)
+
+    def action_goto_end(self) -> None:
+        self.follow = True
+        self.cursor = None
+        self.scroll_end(animate=False, immediate=True, x_axis=False)
+        self.post_status()
+
+    def action_toggle_follow(self) -> None:
+        if self.follow:
+            self.follow = False
+            self.post_status()
+        else:
+            self.action_goto_end()
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        if new_value < old_value:
+            self.follow = False
+
+    async def search(self, pattern: str) -> int:
+        """Find every line matching a regex (in a thread); returns the count"""
+        if self.log_file is None:
+            return 0
+        self.pattern = pattern
+        log = self.log_file
+        matches = await asyncio.to_thread(log.search, pattern, 0)
+        if log is not self.log_file:
+            return 0
+        # Lines indexed after the snapshot are not shown yet
+        self.matches = [n for n in matches if n < self.line_count]
+        if self.matches:
+            self.action_next_match(from_top=True)
+        self.refresh()
+        self.post_status()
+        return len(self.matches)
+
+    def action_next_match(self, from_top: bool = False) -> None:
+        if not self.matches:
+            return
+        here = int(self.scroll_y) - 1 if from_top else self.current_line()
+        index = bisect_right(self.matches, here)
+        self.goto(self.matches[index % len(self.matches)])
+
+    def action_previous_match(self) -> None:
+        if not self.matches:
+            return
+        index = bisect_left(self.matches, self.current_line()) - 1
+        self.goto(self.matches[index % len(self.matches)])
+
+    def current_line(self) -> int:
+        return self.cursor if self.cursor is not None else int(self.scroll_y)
+
+    # --- RENDERING ---
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        number = scroll_y + y
+        width = self.size.width
+        base = self.rich_style
+        if number >= self.line_count:
+            return Strip.blank(width, base)
+        digits = len(str(self.line_count))
+        gutter = f"{number + 1:>{digits}} "
+        line = CONTROL_RE.sub("\ufffd", self.log_file.line(number).expandtabs())
+        if cell_len(line) + len(gutter) > self.max_width:
+            # Widen the scrollable area as longer lines come into view
+            self.max_width = cell_len(line) + len(gutter)
+            self.call_after_refresh(self.update_width)
+
+        style = base
+        index = bisect_left(self.matches, number)
+        if index < len(self.matches) and self.matches[index] == number:
+            style += MATCH_STYLE
+        if number == self.cursor:
+            style += CURSOR_STYLE
+        strip = Strip(
+            [Segment(gutter, base + NUMBER_STYLE), Segment(line, style)],
+            len(gutter) + cell_len(line),
+        )
+        return strip.crop_extend(scroll_x, scroll_x + width, base)
+
+    def update_width(self) -> None:
+        self.virtual_size = Size(self.max_width, self.line_count)
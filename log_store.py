@@ -0,0 +1,257 @@
+"""
+Disk-backed tool logs. Every command writes its full output to a log file
+of its own (simulations keep theirs in the run directory), and logs are
+read back through LogFile: a memory-mapped view with a line-offset index,
+so paging, jumping to a line and regex search work on gigabyte-scale logs
+without holding them in Python strings. The index grows in chunks as the
+file does (follow mode) and is saved next to a finished log for reuse.
+"""
+
+import mmap
+import os
+import re
+import tempfile
+import time
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+
+# Command logs kept before the oldest are deleted
+KEEP_LOGS = 200
+
+# Bytes indexed per step
+INDEX_CHUNK = 16 * 1024**2
+
+# Logs at least this large get their index saved next to them
+SAVE_INDEX_MIN = 4 * 1024**2
+INDEX_SUFFIX = ".idx"
+
+# Lines per index checkpoint
+STRIDE = 64
+
+# Matching lines returned by one search
+SEARCH_LIMIT = 10000
+
+STRIDE_RE = re.compile(b"(?:[^\n]*\n){%d}" % STRIDE)
+
+
+def lines_re(count: int):
+    """Regex matching count whole lines"""
+    return re.compile(b"(?:[^\n]*\n){%d}" % count)
+
+
+class LogStore:
+    """One log file per command in a directory, oldest pruned past `keep`"""
+
+    def __init__(self, root, keep: int = KEEP_LOGS):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.keep = keep
+
+    def new(self, name: str) -> Path:
+        """Fresh, empty log for one run of name (e.g. the tool)"""
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        fd, path = tempfile.mkstemp(
+            prefix=f"{stamp}-{name}-", suffix=".log", dir=self.root
+        )
+        Path(path).chmod(0o644)  # mkstemp is owner-only
+        with open(fd, "wb"):
+            pass
+        self.gc()
+        return Path(path)
+
+    def paths(self) -> list:
+        """Every log here, oldest first"""
+        return sorted(self.root.glob("*.log"), key=lambda p: p.stat().st_mtime)
+
+    def gc(self) -> list:
+        """Delete the oldest logs (and their indexes) beyond keep"""
+        paths = self.paths()
+        removed = paths[: max(0, len(paths) - self.keep)]
+        for path in removed:
+            path.unlink(missing_ok=True)
+            index_path(path).unlink(missing_ok=True)
+        return removed
+
+
+def index_path(path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+class LogFile:
+    """Memory-mapped, line-indexed read access to a (possibly growing) log
+
+    The index is sparse: it holds the byte offset of every STRIDE-th line,
+    so it stays small however long the log gets, and a line is found by
+    skipping at most STRIDE - 1 newlines from its checkpoint.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.file = open(self.path, "rb")
+        self.map = None
+        self.size = 0
+        self.reset()
+        self.refresh()
+        self.load_index()
+
+    def reset(self) -> None:
+        self.offsets = array("Q", [0])  # start of lines 0, STRIDE, 2 * STRIDE...
+        self.count = 0  # newlines seen after the last checkpoint
+        self.tail = 0  # start of the line after the last newline seen
+        self.scanned = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self.map = None
+        self.file.close()
+
+    # --- GROWTH AND INDEXING ---
+    def refresh(self) -> bool:
+        """Map bytes appended since the last call; True if the size changed"""
+        size = self.file.seek(0, 2)
+        if size == self.size:
+            return False
+        if size < self.size:
+            self.reset()  # truncated or rewritten
+        # A search may still be reading the old map; it is freed with it
+        self.map = mmap.mmap(self.file.fileno(), size, access=mmap.ACCESS_READ)
+        self.size = size
+        return True
+
+    @property
+    def complete(self) -> bool:
+        """Every mapped byte has been indexed"""
+        return self.scanned >= self.size
+
+    def index(self, budget: int = INDEX_CHUNK) -> bool:
+        """Index up to budget more bytes; True once everything mapped is"""
+        if self.complete:
+            return True
+        start = self.scanned
+        chunk = self.map[start : min(self.size, start + budget)]
+        newlines = chunk.count(b"\n")
+        pos = 0
+        if self.count + newlines >= STRIDE:
+            # Finish the open group, then take whole groups of STRIDE lines
+            match = lines_re(STRIDE - self.count).match(chunk)
+            groups = [match.end()]
+            groups += map(re.Match.end, STRIDE_RE.finditer(chunk, match.end()))
+            self.offsets.extend(start + end for end in groups)
+            pos = groups[-1]
+            self.count = 0
+            self.tail = start + pos
+            newlines = chunk.count(b"\n", pos)
+        if newlines:
+            self.count += newlines
+            self.tail = start + chunk.rfind(b"\n") + 1
+        self.scanned = start + len(chunk)
+        if self.complete and self.size >= SAVE_INDEX_MIN:
+            self.save_index()
+        return self.complete
+
+    def index_all(self) -> int:
+        """Index everything mapped; returns the line count"""
+        while not self.index():
+            pass
+        return len(self)
+
+    def load_index(self) -> bool:
+        """Reuse the saved index if the log has not changed since"""
+        try:
+            data = index_path(self.path).read_bytes()
+        except OSError:
+            return False
+        stat = os.fstat(self.file.fileno())
+        saved = array("Q")
+        saved.frombytes(data[: len(data) // 8 * 8])
+        if len(saved) < 5 or saved[:2].tolist() != [stat.st_size, stat.st_mtime_ns]:
+            return False
+        if stat.st_size != self.size:
+            return False
+        self.count, self.tail = saved[2:4]
+        self.offsets = saved[4:]
+        self.scanned = self.size
+        return True
+
+    def save_index(self) -> None:
+        stat = os.fstat(self.file.fileno())
+        if stat.st_size != self.scanned:
+            return
+        header = array("Q", [stat.st_size, stat.st_mtime_ns, self.count, self.tail])
+        try:
+            index_path(self.path).write_bytes(header.tobytes() + self.offsets.tobytes())
+        except OSError:
+            # e.g. a read-only or since renamed run directory; the index is
+            # rebuilt next time
+            pass
+
+    # --- READING ---
+    def __len__(self) -> int:
+        """Lines indexed so far, counting an unterminated last line"""
+        lines = (len(self.offsets) - 1) * STRIDE + self.count
+        return lines + (self.tail < self.scanned)
+
+    def start_of(self, number: int) -> int:
+        """Byte offset where a line starts"""
+        group, skip = divmod(number, STRIDE)
+        pos = self.offsets[group]
+        for _ in range(skip):
+            pos = self.map.find(b"\n", pos, self.scanned) + 1
+        return pos
+
+    def lines(self, start: int, stop: int) -> list:
+        """Lines start..stop-1 (as far as indexed), decoded"""
+        start, stop = max(0, start), min(stop, len(self))
+        if start >= stop:
+            return []
+        data, end = self.map, self.scanned
+        pos = self.start_of(start)
+        lines = []
+        for _ in range(stop - start):
+            nl = data.find(b"\n", pos, end)
+            line = data[pos : end if nl < 0 else nl]
+            lines.append(line.decode(errors="replace").rstrip("\r"))
+            pos = nl + 1
+        return lines
+
+    def line(self, number: int) -> str:
+        return self.lines(number, number + 1)[0]
+
+    def line_at(self, offset: int) -> int:
+        """Number of the line holding byte offset"""
+        group = bisect_right(self.offsets, offset) - 1
+        return group * STRIDE + self.map[self.offsets[group] : offset].count(b"\n")
+
+    def search(self, pattern, start: int = 0, limit: int = SEARCH_LIMIT, flags=0):
+        """Numbers of the indexed lines matching a regex, from line start on
+
+        The pattern runs over the mapped bytes (str patterns are UTF-8
+        encoded, ^ and $ match at line boundaries) and line numbers are
+        counted between matches, so no line is decoded.
+        """
+        if isinstance(pattern, str):
+            pattern = pattern.encode()
+        regex = re.compile(pattern, flags | re.MULTILINE)
+        data, end = self.map, self.scanned
+        matches = []
+        if data is None or start >= len(self):
+            return matches
+        number, pos = start, self.start_of(start)
+        while len(matches) < limit:
+            match = regex.search(data, pos, end)
+            if match is None:
+                break
+            number += data[pos : match.start()].count(b"\n")
+            matches.append(number)
+            pos = data.find(b"\n", match.start(), end) + 1
+            if not pos:
+                break
+            number += 1
+        return matches
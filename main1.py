@@ -1,6 +1,7 @@
 import os
 import subprocess
 import datetime
+from pathlib import Path
 from textual.app import App, ComposeResult
 from textual.widgets import (
     Header,
@@ -16,6 +17,10 @@ from textual.screen import Screen, ModalScreen
 from textual.binding import Binding
 from textual import events
 
+from build_cache import hash_key
+from console_view import ConsoleView
+from run_store import RunStore
+
 # --- 1. START SCREEN (DESIGNED BY MAYANK ANAND) ---
 LOGO_TEXT = r"""
   ___                       _ _____                       
@@ -76,6 +81,7 @@ class EditorScreen(Screen):
         self.view_mode = "split"
         self.sidebar_visible = True
         self.current_path = ""
+        self.runs = RunStore(Path.cwd() / ".anandforge_runs")
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -112,7 +118,7 @@ class EditorScreen(Screen):
                     yield Button("🔄 VIEW", id="btn_cycle", classes="eda-btn")
 
                 yield Static("OUTPUT CONSOLE:", id="con-label")
-                yield TextArea(id="console", read_only=True)
+                yield ConsoleView(id="console")
         yield Footer()
 
     # --- ROUTING ENGINE ---
@@ -189,46 +195,65 @@ class EditorScreen(Screen):
             self.query_one("#tree").reload()
 
     def handle_eda(self, action):
-        with open("top_active.v", "w") as f:
-            f.write(self.query_one("#design_ed").text)
-        with open("tb_active.v", "w") as f:
-            f.write(self.query_one("#tb_ed").text)
-
-        if action == "run_sim":
-            self.exec_and_log(
-                "iverilog -o sim.out top_active.v tb_active.v && vvp sim.out",
-                "SIMULATION",
-            )
-        elif action == "run_synth":
-            res = self.exec_and_log(
-                "yosys -p 'read_verilog -sv top_active.v; proc; opt; stat'", "SYNTHESIS"
-            )
-            stats = [l.strip() for l in res.split("\n") if "Number of" in l]
-            self.query_one("#synth_report").update("\n".join(stats[:4]))
-        elif action == "run_schem":
-            subprocess.run(
-                "yosys -p 'read_verilog -sv top_active.v; proc; opt; show -format dot -prefix forge_out'",
-                shell=True,
-            )
-            if os.path.exists("forge_out.dot"):
-                subprocess.run("dot -Tpng forge_out.dot -o forge_out.png", shell=True)
-                subprocess.Popen(["xdg-open", "forge_out.png"])
-        elif action == "run_gtk":
-            if os.path.exists("dump.vcd"):
-                subprocess.Popen(["gtkwave", "dump.vcd"])
-        elif action == "run_surfer":
-            if os.path.exists("dump.vcd"):
-                subprocess.Popen(["surfer", "dump.vcd"])
-
-    def exec_and_log(self, cmd, title):
-        res = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        if action in ["run_gtk", "run_surfer"]:
+            run_dir = self.runs.latest("run_sim")
+            if run_dir and (run_dir / "dump.vcd").exists():
+                tool = "gtkwave" if action == "run_gtk" else "surfer"
+                subprocess.Popen([tool, str(run_dir / "dump.vcd")])
+            return
+
+        # Each run gets its own copy of the active buffers and its own outputs
+        sources = {
+            "top_active.v": self.query_one("#design_ed").text,
+            "tb_active.v": self.query_one("#tb_ed").text,
+        }
+        key = hash_key(action, *sources.values())
+        with self.runs.staging(action) as run_dir:
+            for name, text in sources.items():
+                (run_dir / name).write_text(text)
+
+            if action == "run_sim":
+                res = self.exec_and_log(
+                    "iverilog -o sim.out top_active.v tb_active.v && vvp sim.out",
+                    "SIMULATION",
+                    run_dir,
+                )
+            elif action == "run_synth":
+                res = self.exec_and_log(
+                    "yosys -p 'read_verilog -sv top_active.v; proc; opt; stat'",
+                    "SYNTHESIS",
+                    run_dir,
+                )
+                stats = [l.strip() for l in res.stdout.split("\n") if "Number of" in l]
+                self.query_one("#synth_report").update("\n".join(stats[:4]))
+            elif action == "run_schem":
+                res = subprocess.run(
+                    "yosys -p 'read_verilog -sv top_active.v; proc; opt; show -format dot -prefix forge_out'",
+                    shell=True,
+                    cwd=run_dir,
+                )
+                if (run_dir / "forge_out.dot").exists():
+                    res = subprocess.run(
+                        "dot -Tpng forge_out.dot -o forge_out.png",
+                        shell=True,
+                        cwd=run_dir,
+                    )
+            if res.returncode != 0:
+                return
+            run_dir = self.runs.publish(action, key, run_dir, replace=True)
+
+        if action == "run_schem" and (run_dir / "forge_out.png").exists():
+            subprocess.Popen(["xdg-open", str(run_dir / "forge_out.png")])
+
+    def exec_and_log(self, cmd, title, cwd=None):
+        res = subprocess.run(cmd, shell=True, capture_output=True, text=True, cwd=cwd)
         time_stamp = datetime.datetime.now().strftime("%H:%M:%S")
         f_out = f"╔{'═'*40}╗\n║ [{time_stamp}] {title} RESULTS ║\n╠{'═'*40}╣\n{res.stdout}{res.stderr}\n╚{'═'*40}╝"
-        self.query_one("#console").text = f_out
-        return res.stdout
+        self.query_one("#console").show(f_out)
+        return res
 
     def log_msg(self, msg):
-        self.query_one("#console").text += f"\n[SYS]: {msg}"
+        self.query_one("#console").write(f"[SYS]: {msg}")
 
 
 # --- 4. ERROR-FREE CSS ---
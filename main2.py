@@ -1,5 +1,6 @@
 import os
 import subprocess
+from pathlib import Path
 from textual.app import App, ComposeResult
 from textual.widgets import (
     Header,
@@ -15,6 +16,10 @@ from textual.screen import Screen, ModalScreen
 from textual.binding import Binding
 from textual import events
 
+from build_cache import hash_key
+from console_view import ConsoleView
+from run_store import RunStore
+
 # --- 1. STARTUP SCREEN ---
 LOGO_TEXT = r"""
   ___                       _ _____                       
@@ -74,6 +79,7 @@ class EditorScreen(Screen):
         self.view_mode = "split"
         self.sidebar_visible = True
         self.current_path = ""
+        self.runs = RunStore(Path.cwd() / ".anandforge_runs")
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -109,7 +115,7 @@ class EditorScreen(Screen):
                     yield Button("🔄 VIEW", id="btn_cycle", classes="eda-btn")
 
                 yield Static("CONSOLE:", id="con-label")
-                yield TextArea(id="console", read_only=True)
+                yield ConsoleView(id="console")
         yield Footer()
 
     # --- THE STRICT ROUTER ---
@@ -136,7 +142,7 @@ class EditorScreen(Screen):
                     f"📄 DESIGN: {os.path.basename(self.current_path)}"
                 )
         except Exception as e:
-            self.query_one("#console").text = f"Error opening: {e}"
+            self.query_one("#console").show(f"Error opening: {e}")
 
     # --- SIDEBAR TOGGLE ---
     def action_toggle_sidebar(self) -> None:
@@ -159,11 +165,11 @@ class EditorScreen(Screen):
         try:
             with open(self.current_path, "w") as f:
                 f.write(content)
-            self.query_one("#console").text = (
+            self.query_one("#console").show(
                 f"SUCCESS: Saved {os.path.basename(self.current_path)}"
             )
         except Exception as e:
-            self.query_one("#console").text = f"Save Error: {e}"
+            self.query_one("#console").show(f"Save Error: {e}")
 
     # --- FILE OPS ---
     def action_new_file_shortcut(self) -> None:
@@ -200,34 +206,54 @@ class EditorScreen(Screen):
 
     # --- EDA ENGINE ---
     def handle_eda(self, action):
-        # Save current active buffers to run simulation
-        with open("top_active.v", "w") as f:
-            f.write(self.query_one("#design_ed").text)
-        with open("tb_active.v", "w") as f:
-            f.write(self.query_one("#tb_ed").text)
-
-        files = "top_active.v tb_active.v"
-
-        if action == "run_sim":
-            cmd = f"iverilog -g2012 -o sim.out {files} && vvp sim.out"
-            res = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            self.query_one("#console").text = f"SIMULATION:\n{res.stdout}{res.stderr}"
-        elif action == "run_synth":
-            cmd = f"yosys -p 'read_verilog -sv top_active.v; proc; opt; stat'"
-            res = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            self.query_one("#console").text = f"SYNTHESIS:\n{res.stdout}{res.stderr}"
-        elif action in ["run_gtk", "run_surfer"]:
+        if action in ["run_gtk", "run_surfer"]:
             tool = "gtkwave" if action == "run_gtk" else "surfer"
-            if os.path.exists("dump.vcd"):
-                subprocess.Popen([tool, "dump.vcd"])
-        elif action == "run_schem":
-            subprocess.run(
-                f"yosys -p 'read_verilog -sv top_active.v; proc; opt; show -format dot -prefix out'",
-                shell=True,
-            )
-            if os.path.exists("out.dot"):
-                subprocess.run("dot -Tpng out.dot -o out.png", shell=True)
-                subprocess.Popen(["xdg-open", "out.png"])
+            run_dir = self.runs.latest("run_sim")
+            if run_dir and (run_dir / "dump.vcd").exists():
+                subprocess.Popen([tool, str(run_dir / "dump.vcd")])
+            return
+
+        # Each run gets its own copy of the active buffers and its own outputs
+        sources = {
+            "top_active.v": self.query_one("#design_ed").text,
+            "tb_active.v": self.query_one("#tb_ed").text,
+        }
+        key = hash_key(action, *sources.values())
+        with self.runs.staging(action) as run_dir:
+            for name, text in sources.items():
+                (run_dir / name).write_text(text)
+            files = "top_active.v tb_active.v"
+
+            if action == "run_sim":
+                res = self.run_in(
+                    run_dir, f"iverilog -g2012 -o sim.out {files} && vvp sim.out"
+                )
+                self.query_one("#console").show(
+                    f"SIMULATION:\n{res.stdout}{res.stderr}"
+                )
+            elif action == "run_synth":
+                res = self.run_in(
+                    run_dir, "yosys -p 'read_verilog -sv top_active.v; proc; opt; stat'"
+                )
+                self.query_one("#console").show(f"SYNTHESIS:\n{res.stdout}{res.stderr}")
+            elif action == "run_schem":
+                res = self.run_in(
+                    run_dir,
+                    "yosys -p 'read_verilog -sv top_active.v; proc; opt; show -format dot -prefix out'",
+                )
+                if res.returncode == 0:
+                    res = self.run_in(run_dir, "dot -Tpng out.dot -o out.png")
+            if res.returncode != 0:
+                return
+            run_dir = self.runs.publish(action, key, run_dir, replace=True)
+
+        if action == "run_schem":
+            subprocess.Popen(["xdg-open", str(run_dir / "out.png")])
+
+    def run_in(self, run_dir, cmd):
+        return subprocess.run(
+            cmd, shell=True, capture_output=True, text=True, cwd=run_dir
+        )
 
     def action_cycle_focus(self) -> None:
         d_p, t_p = self.query_one("#design-pane"), self.query_one("#tb-pane")
@@ -5,9 +5,24 @@ Created by: MAYANK ANAND
 Offline Alternative to EDA Playground
 """
 
+import time
+
+# Reference point for the boot screen's time-to-interactive
+STARTED = time.monotonic()
+
+from startup_profile import StartupProfile
+
+# With --profile-startup, every import below is timed
+PROFILE = StartupProfile.from_argv(__name__)
+
+import asyncio
+import fnmatch
 import os
+import re
 import subprocess
+from collections import Counter
 from pathlib import Path
+
 from textual.app import App, ComposeResult
 from textual.widgets import (
     Header,
@@ -18,41 +33,67 @@ from textual.widgets import (
     DirectoryTree,
     Input,
     Label,
+    DataTable,
 )
 from textual.containers import Horizontal, Vertical, Container, ScrollableContainer
 from textual.screen import Screen, ModalScreen
 from textual.binding import Binding
-
-# Import themes
-try:
-    from themes import THEMES
-except ImportError:
-    THEMES = {
-        "Monokai": {
-            "ace": "monokai",
-            "bg": "#272822",
-            "txt": "#F8F8F2",
-            "acc": "#66D9EF",
-            "con": "#1E1E1E",
-            "accent2": "#A6E22E",
-        }
+from textual.css.query import NoMatches
+
+from build_cache import BuildCache, hash_key, write_if_changed
+from console_view import ConsoleView, LineLimiter
+from job_scheduler import BACKGROUND, INTERACTIVE, JobScheduler
+from log_pager import LogPager
+from log_store import SEARCH_LIMIT, LogStore
+from module_index import ModuleIndex
+from run_store import RunStore
+from sim_cache import LOG as SIM_LOG, load_result, save_result, sim_key
+from synth_pipeline import SynthArtifacts, summarize_stats
+from tool_registry import ToolRegistry
+from tool_runner import ToolResult, ToolRunner
+from tracing import TRACER
+from verilator_cache import (
+    VerilatorCache,
+    load_runs,
+    record_run,
+    single_thread_baseline,
+)
+from yosys_session import YosysError, YosysSession
+
+# Used until themes.py has loaded (and if it is missing)
+FALLBACK_THEMES = {
+    "Monokai": {
+        "ace": "monokai",
+        "bg": "#272822",
+        "txt": "#F8F8F2",
+        "acc": "#66D9EF",
+        "con": "#1E1E1E",
+        "accent2": "#A6E22E",
     }
+}
+
+
+# --- DEFERRED LOADING (runs in a worker after the first frame) ---
+def load_themes() -> dict:
+    try:
+        from themes import THEMES
+    except ImportError:
+        return FALLBACK_THEMES
+    return THEMES
+
+
+def load_verilog_parser():
+    """Tree-sitter parser for Verilog, or None if unavailable"""
+    try:
+        from tree_sitter import Language, Parser
+        import tree_sitter_verilog
 
-# Tree-sitter integration
-TREE_SITTER_ENABLED = False
-try:
-    from tree_sitter import Language, Parser
-    import tree_sitter_verilog
+        return Parser(Language(tree_sitter_verilog.language()))
+    except Exception:
+        return None
 
-    # Try to load Verilog language
-    VERILOG_LANGUAGE = tree_sitter_verilog.language()
-    verilog_parser = Parser(VERILOG_LANGUAGE)
-    TREE_SITTER_ENABLED = True
-except Exception as e:
-    print(f"Tree-sitter not available: {e}")
-    verilog_parser = None
 
-# Tool paths
+# Preferred tool locations; tools not found here are looked up on $PATH
 TOOL_PATHS = {
     "iverilog": "/usr/bin/iverilog",
     "vvp": "/usr/bin/vvp",
@@ -60,8 +101,48 @@ TOOL_PATHS = {
     "yosys": "/usr/bin/yosys",
     "gtkwave": "/usr/bin/gtkwave",
     "surfer": "/usr/local/bin/surfer",
+    "dot": "/usr/bin/dot",
 }
 
+# Default per-command timeout in seconds (simulation runs unbounded, cancel with Ctrl+K)
+COMMAND_TIMEOUT = 60
+
+# Console lines kept in memory (older lines are dropped)
+CONSOLE_MAX_LINES = 20000
+
+# Tool output lines per second shown on the console; the rest go to the log
+CONSOLE_RATE_LIMIT = 1000
+
+# Seconds between reads of a running simulation's dump (live waves, F8)
+FOLLOW_INTERVAL = 0.5
+
+# Flags passed to every iverilog compile (part of the build cache key)
+IVERILOG_FLAGS = "-g2012"
+
+# Model flags for Verilator simulation (part of the build dir key)
+VERILATOR_FLAGS = ["--binary", "--trace"]
+# Model name when Verilator chooses the top itself
+VERILATOR_MODEL = "top"
+
+
+def duplicate_names(paths) -> list:
+    """File names shared by several of paths"""
+    counts = Counter(Path(path).name for path in paths)
+    return sorted(name for name, count in counts.items() if count > 1)
+
+
+def top_flag(top) -> str:
+    """Verilator's --top-module option, or nothing to let it find the top"""
+    return f"--top-module {top} " if top else ""
+
+
+# --- PROJECT TREE ---
+class ProjectTree(DirectoryTree):
+    """DirectoryTree whose directory scans are timed by --profile-startup"""
+
+    def filter_paths(self, paths):
+        return PROFILE.timed_paths("directory_tree.scan", paths)
+
 
 # --- BOOT SCREEN ---
 class BootScreen(Screen):
@@ -163,18 +244,24 @@ class BootScreen(Screen):
                 id="boot_subtitle",
             )
             yield Static("BY MAYANK ANAND", id="boot_creator")
-            if TREE_SITTER_ENABLED:
-                yield Static("🌲 Tree-sitter: ENABLED", id="boot_info")
-            else:
-                yield Static(
-                    "Tree-sitter: Disabled (fallback to basic highlighting)",
-                    id="boot_info",
-                )
+            yield Static("⏳ Loading parser, themes and tools...", id="boot_info")
             yield Static("PRESS [ENTER] TO START FORGING", id="boot_prompt")
 
     def on_mount(self) -> None:
         self.logo_index = 0
         self.set_interval(1.0, self.cycle_logo)
+        self.call_after_refresh(self.first_paint)
+
+    def first_paint(self) -> None:
+        self.first_paint_s = time.monotonic() - STARTED
+
+    def show_ready(self, tree_sitter: bool, ready_s: float) -> None:
+        """Report what loaded and the time-to-interactive"""
+        status = "🌲 Tree-sitter: ENABLED" if tree_sitter else "Tree-sitter: Disabled"
+        first_paint = getattr(self, "first_paint_s", ready_s)
+        self.query_one("#boot_info", Static).update(
+            f"{status} | first frame {first_paint:.2f}s | ready in {ready_s:.2f}s"
+        )
 
     def cycle_logo(self) -> None:
         self.logo_index = (self.logo_index + 1) % len(self.LOGOS)
@@ -329,10 +416,11 @@ class ThemeSelectorModal(ModalScreen):
     def compose(self) -> ComposeResult:
         with Container(id="theme_container"):
             yield Static(
-                f"🎨 THEME SELECTOR ({len(THEMES)} Themes Available)", id="theme_title"
+                f"🎨 THEME SELECTOR ({len(self.app.themes)} Themes Available)",
+                id="theme_title",
             )
             with ScrollableContainer(id="theme_scroll"):
-                for theme_name in sorted(THEMES.keys()):
+                for theme_name in sorted(self.app.themes.keys()):
                     yield Button(
                         f"🎨 {theme_name}",
                         id=f"theme_{theme_name}",
@@ -349,6 +437,666 @@ class ThemeSelectorModal(ModalScreen):
             self.dismiss(theme_name)
 
 
+# --- REGRESSION MODAL ---
+class RegressionScreen(ModalScreen):
+    """Live pass/fail/time table for a Run All regression"""
+
+    BINDINGS = [("escape", "close", "Close")]
+
+    CSS = """
+    RegressionScreen {
+        align: center middle;
+    }
+    
+    #regress_container {
+        width: 90%;
+        height: 85%;
+        border: thick #FFD700;
+        background: #1a1a1a;
+        padding: 1 2;
+    }
+    
+    #regress_title {
+        text-align: center;
+        text-style: bold;
+        color: #FFD700;
+        height: 2;
+    }
+    
+    #regress_table {
+        height: 1fr;
+        border: solid #333333;
+    }
+    
+    #regress_summary {
+        color: #00FF41;
+        height: 2;
+        margin-top: 1;
+    }
+    """
+
+    STATUS_ICONS = {
+        "queued": "… queued",
+        "pass": "✓ PASS",
+        "fail": "✗ FAIL",
+        "error": "⚠ ERROR",
+    }
+
+    def __init__(self, cases):
+        super().__init__()
+        self.cases = cases
+        self.results = {}
+
+    def compose(self) -> ComposeResult:
+        with Container(id="regress_container"):
+            yield Static(
+                f"🧪 REGRESSION ({len(self.cases)} testbenches)", id="regress_title"
+            )
+            yield DataTable(id="regress_table", cursor_type="row")
+            yield Static("Running...", id="regress_summary")
+
+    def on_mount(self) -> None:
+        table = self.query_one("#regress_table", DataTable)
+        table.add_column("TESTBENCH", key="name")
+        table.add_column("STATUS", key="status")
+        table.add_column("TIME", key="time")
+        for case in self.cases:
+            table.add_row(case.name, self.STATUS_ICONS["queued"], "-", key=case.name)
+
+    def add_result(self, result: dict) -> None:
+        self.results[result["name"]] = result
+        try:
+            table = self.query_one("#regress_table", DataTable)
+            summary = self.query_one("#regress_summary", Static)
+        except NoMatches:
+            return
+        table.update_cell(result["name"], "status", self.STATUS_ICONS[result["status"]])
+        table.update_cell(result["name"], "time", f"{result['time']:.2f}s")
+
+        counts = {"pass": 0, "fail": 0, "error": 0}
+        for r in self.results.values():
+            counts[r["status"]] += 1
+        summary.update(
+            f"{len(self.results)}/{len(self.cases)} done | "
+            f"✓ {counts['pass']} pass | ✗ {counts['fail']} fail | "
+            f"⚠ {counts['error']} error"
+        )
+
+    def action_close(self) -> None:
+        self.dismiss(None)
+
+
+# --- TRACE PANEL ---
+class TraceScreen(ModalScreen):
+    """Most recent tracing spans, newest first, with per-category totals"""
+
+    BINDINGS = [
+        ("escape", "close", "Close"),
+        ("e", "export", "Export Chrome trace"),
+        ("c", "clear", "Clear"),
+    ]
+
+    # Rows shown; the full ring buffer goes into the export
+    MAX_ROWS = 500
+
+    CSS = """
+    TraceScreen {
+        align: center middle;
+    }
+    
+    #trace_container {
+        width: 95%;
+        height: 90%;
+        border: thick #FFD700;
+        background: #1a1a1a;
+        padding: 1 2;
+    }
+    
+    #trace_title {
+        text-align: center;
+        text-style: bold;
+        color: #FFD700;
+        height: 2;
+    }
+    
+    #trace_table {
+        height: 1fr;
+        border: solid #333333;
+    }
+    
+    #trace_summary {
+        color: #00FF41;
+        height: 2;
+        margin-top: 1;
+    }
+    """
+
+    def compose(self) -> ComposeResult:
+        with Container(id="trace_container"):
+            yield Static(
+                "🔬 TRACE (E: export Chrome trace | C: clear | Esc: close)",
+                id="trace_title",
+            )
+            yield DataTable(id="trace_table", cursor_type="row")
+            yield Static("", id="trace_summary")
+
+    def on_mount(self) -> None:
+        table = self.query_one("#trace_table", DataTable)
+        table.add_columns("TRACK", "SPAN", "CATEGORY", "MS", "DETAILS")
+        self.refresh_spans()
+
+    def refresh_spans(self) -> None:
+        table = self.query_one("#trace_table", DataTable)
+        table.clear()
+        spans = TRACER.recent(self.MAX_ROWS)
+        totals = {}
+        for span in spans:
+            totals[span.cat] = totals.get(span.cat, 0.0) + span.dur
+            details = " ".join(f"{k}={v}" for k, v in span.args.items())
+            table.add_row(
+                span.track, span.name, span.cat, f"{span.dur * 1000:.1f}", details
+            )
+        self.query_one("#trace_summary", Static).update(
+            f"{len(spans)} spans | "
+            + " | ".join(f"{cat} {t:.2f}s" for cat, t in sorted(totals.items()))
+        )
+
+    def action_export(self) -> None:
+        path = self.app.export_trace()
+        self.query_one("#trace_summary", Static).update(f"📄 Trace written: {path}")
+
+    def action_clear(self) -> None:
+        TRACER.clear()
+        self.refresh_spans()
+
+    def action_close(self) -> None:
+        self.dismiss(None)
+
+
+# --- LOG PAGER ---
+class LogScreen(ModalScreen):
+    """Full tool logs from disk: page, jump to a line, search, follow"""
+
+    BINDINGS = [
+        ("escape", "close", "Close"),
+        ("/", "prompt('/')", "Search"),
+        (":", "prompt(':')", "Go to line"),
+        ("[", "switch_log(-1)", "Previous log"),
+        ("]", "switch_log(1)", "Next log"),
+    ]
+
+    CSS = """
+    LogScreen {
+        align: center middle;
+    }
+    
+    #log_container {
+        width: 95%;
+        height: 90%;
+        border: thick #FFD700;
+        background: #1a1a1a;
+        padding: 1 2;
+    }
+    
+    #log_title {
+        text-align: center;
+        text-style: bold;
+        color: #FFD700;
+        height: 2;
+    }
+    
+    #log_pager {
+        height: 1fr;
+        border: solid #333333;
+    }
+    
+    #log_status {
+        color: #00FF41;
+        height: 1;
+    }
+    """
+
+    def __init__(self, paths):
+        super().__init__()
+        self.paths = paths
+        self.index = len(paths) - 1
+        self.note = ""
+
+    def compose(self) -> ComposeResult:
+        with Container(id="log_container"):
+            yield Static(
+                "📜 LOGS (/: search | :N go to line | n/N: next/prev match | "
+                "F: follow | [ ]: prev/next log | Esc: close)",
+                id="log_title",
+            )
+            yield LogPager(self.paths[self.index], id="log_pager")
+            yield Static("", id="log_status")
+            yield Input(placeholder="/regex or :line", id="log_input")
+
+    def on_mount(self) -> None:
+        self.query_one("#log_pager", LogPager).focus()
+
+    def action_prompt(self, prefix: str) -> None:
+        field = self.query_one("#log_input", Input)
+        field.value = prefix
+        field.focus()
+        field.cursor_position = len(prefix)
+
+    def action_switch_log(self, step: int) -> None:
+        self.index = (self.index + step) % len(self.paths)
+        self.note = ""
+        self.query_one("#log_pager", LogPager).open(self.paths[self.index])
+
+    async def on_input_submitted(self, event: Input.Submitted) -> None:
+        text = event.value.strip()
+        event.input.value = ""
+        pager = self.query_one("#log_pager", LogPager)
+        pager.focus()
+        self.note = ""
+        if text.lstrip(":").isdigit():
+            pager.goto(int(text.lstrip(":")) - 1)
+        elif text.lstrip("/"):
+            try:
+                found = await pager.search(text.lstrip("/"))
+            except re.error as e:
+                self.note = f"✗ Bad regex: {e}"
+            else:
+                limit = " (search limit)" if found >= SEARCH_LIMIT else ""
+                self.note = f"🔍 {found:,} matching lines{limit}"
+        self.update_status()
+
+    def update_status(self) -> None:
+        pager = self.query_one("#log_pager", LogPager)
+        log = pager.log_file
+        if log is None:
+            return
+        parts = [
+            log.path.name,
+            f"line {pager.current_line() + 1:,}/{pager.line_count:,}",
+            "▶ following" if pager.follow else "⏸ paused",
+        ]
+        if not log.complete:
+            parts.append(f"indexing {log.scanned * 100 // max(1, log.size)}%")
+        if self.note:
+            parts.append(self.note)
+        self.query_one("#log_status", Static).update(" | ".join(parts))
+
+    def action_close(self) -> None:
+        self.dismiss(None)
+
+
+def simulated_time(live) -> str:
+    """How far a followed dump has got, e.g. "1.25ms" """
+    from vcd_reader import timescale_seconds
+    from wave_view import format_time
+
+    return format_time(live.end_time, timescale_seconds(live.timescale))
+
+
+def live_note(live) -> str:
+    """Status of a followed dump: simulated time so far, or the run ended"""
+    if not live.ready:
+        return "⏳ Waiting for the simulation's dump..."
+    simulated = simulated_time(live)
+    if live.running:
+        return f"🔴 LIVE {simulated} simulated (Ctrl+K: kill run)"
+    return f"⏹ Run ended at {simulated}"
+
+
+class WaveScreen(ModalScreen):
+    """In-terminal waveforms of a simulation's dump (its columnar cache is
+    built on first open), or of a running one's as it grows (live)"""
+
+    BINDINGS = [
+        ("escape", "close", "Close"),
+        ("/", "prompt", "Filter signals"),
+        ("ctrl+k", "app.cancel_jobs", "Kill run"),
+    ]
+
+    CSS = """
+    WaveScreen {
+        align: center middle;
+    }
+    
+    #wave_container {
+        width: 95%;
+        height: 90%;
+        border: thick #00BFFF;
+        background: #1a1a1a;
+        padding: 1 2;
+    }
+    
+    #wave_title {
+        text-align: center;
+        text-style: bold;
+        color: #00BFFF;
+        height: 2;
+    }
+    
+    #wave_view {
+        height: 1fr;
+        border: solid #333333;
+    }
+    
+    #wave_status {
+        color: #00FF41;
+        height: 1;
+    }
+    """
+
+    def __init__(self, vcd_path, live=None):
+        super().__init__()
+        self.vcd_path = vcd_path
+        self.live = live
+        self.version = 0  # of live when last shown
+        self.cache = None
+        self.note = ""
+
+    def compose(self) -> ComposeResult:
+        # numpy is only imported once waveforms are opened
+        from wave_view import WaveView
+
+        with Container(id="wave_container"):
+            yield Static(
+                "🌊 WAVES (←/→: cursor | Shift+←/→: pan | +/-: zoom | F: fit | "
+                "n/N: next/prev change | /: filter | Esc: close)",
+                id="wave_title",
+            )
+            yield WaveView(id="wave_view")
+            yield Static("⏳ Loading waveforms...", id="wave_status")
+            yield Input(
+                placeholder="signals to show, e.g. tb.* (empty: all)", id="wave_input"
+            )
+
+    async def on_mount(self) -> None:
+        from vcd_reader import VcdError
+        from wave_cache import WaveCache
+
+        view = self.query_one("#wave_view")
+        view.focus()
+        if self.live is not None:
+            self.set_interval(FOLLOW_INTERVAL, self.follow)
+            self.follow()
+            return
+        try:
+            self.cache = await asyncio.to_thread(WaveCache.open, self.vcd_path)
+        except (OSError, VcdError) as e:
+            self.query_one("#wave_status", Static).update(
+                f"✗ Cannot read waveforms: {e}"
+            )
+            return
+        view.show(self.cache, self.cache.signals)
+
+    def follow(self) -> None:
+        """Show what the running simulation has dumped since the last call"""
+        live = self.live
+        if live.version != self.version:
+            self.version = live.version
+            view = self.query_one("#wave_view")
+            if self.cache is None and live.ready:
+                self.cache = live
+                view.show(live, live.signals)
+            elif self.cache is not None:
+                view.reload()
+        self.update_status()
+
+    def action_prompt(self) -> None:
+        field = self.query_one("#wave_input", Input)
+        field.focus()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        pattern = event.value.strip()
+        view = self.query_one("#wave_view")
+        view.focus()
+        if self.cache is None:
+            return
+        names = self.cache.signals
+        if pattern:
+            names = [name for name in names if fnmatch.fnmatchcase(name, pattern)]
+        if names:
+            self.note = f"🔍 {pattern}" if pattern else ""
+            view.set_signals(names)
+        else:
+            self.note = f"⚠ No signal matches {pattern}"
+            self.update_status()
+
+    def update_status(self) -> None:
+        parts = [self.query_one("#wave_view").status()]
+        if self.live is not None:
+            parts.append(live_note(self.live))
+        if self.note:
+            parts.append(self.note)
+        status = " | ".join(part for part in parts if part)
+        self.query_one("#wave_status", Static).update(status)
+
+    def action_close(self) -> None:
+        self.dismiss(None)
+
+
+class MonitorScreen(ModalScreen):
+    """Tabular monitor of a simulation's dump: signals sampled at a clock's
+    edges, in place of $monitor tables in the testbench (live while the
+    simulation runs)"""
+
+    BINDINGS = [
+        ("escape", "close", "Close"),
+        ("/", "prompt", "Choose signals"),
+        ("e", "cycle_edge", "Edge"),
+        ("p", "toggle_sampling", "Pre/post edge"),
+        ("c", "toggle_changes", "Changes only"),
+        ("ctrl+k", "app.cancel_jobs", "Kill run"),
+    ]
+
+    CSS = """
+    MonitorScreen {
+        align: center middle;
+    }
+    
+    #monitor_container {
+        width: 95%;
+        height: 90%;
+        border: thick #00FF41;
+        background: #1a1a1a;
+        padding: 1 2;
+    }
+    
+    #monitor_title {
+        text-align: center;
+        text-style: bold;
+        color: #00FF41;
+        height: 2;
+    }
+    
+    #monitor_table {
+        height: 1fr;
+        border: solid #333333;
+    }
+    
+    #monitor_status {
+        color: #00FF41;
+        height: 1;
+    }
+    """
+
+    def __init__(self, vcd_path, live=None):
+        super().__init__()
+        self.vcd_path = vcd_path
+        self.live = live
+        self.version = 0  # of live when last sampled
+        self.building = False
+        self.cache = None
+        self.monitor = None
+        self.clock = None
+        self.names = []
+        self.edge = "rising"
+        self.before = False
+        self.only_changes = False
+        self.note = ""
+
+    def compose(self) -> ComposeResult:
+        # numpy is only imported once the monitor is opened
+        from wave_monitor import MonitorTable
+
+        with Container(id="monitor_container"):
+            yield Static(
+                "📋 MONITOR (/: signals | E: edge | P: pre/post edge | "
+                "C: changes only | g/G: top/bottom | Esc: close)",
+                id="monitor_title",
+            )
+            yield MonitorTable(id="monitor_table")
+            yield Static("⏳ Loading waveforms...", id="monitor_status")
+            yield Input(
+                placeholder="@clock[:rising|falling|both] signal globs, "
+                "e.g. @tb.clk tb.rst tb.count*",
+                id="monitor_input",
+            )
+
+    async def on_mount(self) -> None:
+        from vcd_reader import VcdError
+        from wave_cache import WaveCache
+
+        self.query_one("#monitor_table").focus()
+        if self.live is not None:
+            self.set_interval(FOLLOW_INTERVAL, self.follow)
+            await self.follow()
+            return
+        try:
+            self.cache = await asyncio.to_thread(WaveCache.open, self.vcd_path)
+        except (OSError, VcdError) as e:
+            self.query_one("#monitor_status", Static).update(
+                f"✗ Cannot read waveforms: {e}"
+            )
+            return
+        await self.start()
+
+    async def follow(self) -> None:
+        """Sample what the running simulation has dumped since the last call"""
+        live = self.live
+        if live.version != self.version and not self.building:
+            self.version = live.version
+            if self.cache is None and live.ready:
+                self.cache = live
+                await self.start()
+            elif self.monitor is not None:
+                await self.rebuild()
+        self.update_status()
+
+    async def start(self) -> None:
+        """Pick a clock and its neighbours to sample"""
+        from wave_monitor import default_signals, guess_clock
+
+        self.clock = guess_clock(self.cache)
+        if self.clock is None:
+            self.note = "⚠ No clock found: enter @clock and signals"
+            self.update_status()
+            return
+        self.names = default_signals(self.cache, self.clock)
+        await self.rebuild()
+
+    async def rebuild(self) -> None:
+        """Sample the signals again (in a thread) and show the table"""
+        from wave_monitor import Monitor
+
+        def build():
+            monitor = Monitor(
+                self.cache, self.clock, self.names, self.edge, self.before
+            )
+            monitor.changes_only(self.only_changes)
+            return monitor
+
+        table = self.query_one("#monitor_table")
+        at_end = table.scroll_y >= table.max_scroll_y
+        self.building = True
+        try:
+            self.monitor = await asyncio.to_thread(build)
+        finally:
+            self.building = False
+        table.show(self.monitor)
+        if self.live is not None and at_end:
+            # Keep the newest edges in view while the run goes on
+            table.scroll_end(animate=False, immediate=True, x_axis=False)
+        self.update_status()
+
+    def action_prompt(self) -> None:
+        self.query_one("#monitor_input", Input).focus()
+
+    async def on_input_submitted(self, event: Input.Submitted) -> None:
+        from wave_monitor import EDGES
+
+        self.query_one("#monitor_table").focus()
+        if self.cache is None:
+            return
+        self.note = ""
+        clock, edge, globs = self.clock, self.edge, []
+        for token in event.value.split():
+            if token.startswith("@"):
+                clock, _, kind = token[1:].partition(":")
+                edge = kind or edge
+            else:
+                globs.append(token)
+        if clock not in self.cache.names:
+            self.note = f"⚠ No signal {clock}"
+        elif edge not in EDGES:
+            self.note = f"⚠ Edge must be one of {', '.join(EDGES)}"
+        else:
+            names = self.names
+            if globs:
+                names = [
+                    name
+                    for name in self.cache.signals
+                    if name != clock
+                    and any(fnmatch.fnmatchcase(name, glob) for glob in globs)
+                ]
+            if globs and not names:
+                self.note = f"⚠ No signal matches {' '.join(globs)}"
+            else:
+                self.clock, self.edge, self.names = clock, edge, names
+                await self.rebuild()
+                return
+        self.update_status()
+
+    async def action_cycle_edge(self) -> None:
+        from wave_monitor import EDGES
+
+        if self.monitor is not None:
+            self.edge = EDGES[(EDGES.index(self.edge) + 1) % len(EDGES)]
+            await self.rebuild()
+
+    async def action_toggle_sampling(self) -> None:
+        if self.monitor is not None:
+            self.before = not self.before
+            await self.rebuild()
+
+    def action_toggle_changes(self) -> None:
+        if self.monitor is not None:
+            self.only_changes = not self.only_changes
+            self.monitor.changes_only(self.only_changes)
+            self.query_one("#monitor_table").update_rows()
+            self.update_status()
+
+    def update_status(self) -> None:
+        parts = []
+        monitor = self.monitor
+        if monitor is not None:
+            table = self.query_one("#monitor_table")
+            parts += [
+                f"{self.edge} edges of {self.clock}",
+                "sampled before edge" if self.before else "sampled after edge",
+                f"row {min(table.current_row() + 1, len(monitor)):,}/"
+                f"{len(monitor):,}",
+            ]
+            if self.only_changes:
+                parts.append(f"changes only (of {len(monitor.times):,} edges)")
+        if self.live is not None:
+            parts.append(live_note(self.live))
+        if self.note:
+            parts.append(self.note)
+        self.query_one("#monitor_status", Static).update(" | ".join(parts))
+
+    def action_close(self) -> None:
+        self.dismiss(None)
+
+
 # --- MAIN APPLICATION ---
 class MavenikArena(App):
     """Main VLSI TUI IDE Application"""
@@ -365,9 +1113,17 @@ class MavenikArena(App):
         Binding("ctrl+t", "theme_selector", "Themes"),
         Binding("f5", "compile", "Compile"),
         Binding("f6", "simulate", "Simulate"),
+        Binding("shift+f6", "force_simulate", "Rerun Sim"),
+        Binding("f10", "simulate_verilator", "Verilator Sim"),
+        Binding("ctrl+j", "toggle_threads", "MT Sim"),
         Binding("f7", "synthesize", "Synthesize"),
         Binding("f8", "view_waves", "Waves"),
+        Binding("shift+f8", "show_monitor", "Monitor"),
         Binding("f9", "schematic", "Schematic"),
+        Binding("ctrl+r", "run_all", "Run All"),
+        Binding("ctrl+k", "cancel_jobs", "Cancel Jobs"),
+        Binding("f12", "show_trace", "Trace"),
+        Binding("ctrl+l", "show_logs", "Logs"),
     ]
 
     CSS = """
@@ -456,6 +1212,17 @@ class MavenikArena(App):
         border: solid #333333;
     }
     
+    #job_pane {
+        width: 30;
+        border-left: solid #333333;
+        background: #1a1a1a;
+    }
+    
+    #job_queue {
+        padding: 0 1;
+        color: #00FF41;
+    }
+    
     #tool_panel {
         width: 42;
         border-left: solid #333333;
@@ -525,8 +1292,28 @@ class MavenikArena(App):
         self.design_path = None
         self.testbench_path = None
         self.current_theme_name = "Monokai"
+        self.scheduler = JobScheduler(on_change=self.refresh_job_panel)
+        self.tools = ToolRegistry(TOOL_PATHS)
+        self.build_cache = BuildCache(self.workspace / ".build_cache")
+        self.verilator_cache = VerilatorCache(self.workspace / ".verilator_cache")
+        self.verilator_threads = 1
+        self.last_iverilog_sim = None
+        self.yosys = YosysSession(self.tools.path("yosys"))
+        self.runs = RunStore(self.workspace / "runs", in_use=self.runs_in_use)
+        self.logs = LogStore(self.workspace / "logs")
+        self.sources_dir = None
+        self.last_compile = None
+        self.last_sim = None
+        self.live = None  # LiveWaves of the running simulation's dump
+        self.sim_plusargs = []
+        self.module_index = ModuleIndex(Path.cwd())
+        self.themes = FALLBACK_THEMES
+        self.verilog_parser = None
+        self.ready_s = None
 
     def compose(self) -> ComposeResult:
+        PROFILE.unhook_imports()
+        PROFILE.start("compose")
         yield Static(
             "⚡ MAVENIK ARENA | MAYANK ANAND VLSI WORKSTATION ⚡", id="main_header"
         )
@@ -535,7 +1322,7 @@ class MavenikArena(App):
             # Sidebar
             with Vertical(id="sidebar"):
                 yield Static("📁 PROJECT EXPLORER", classes="panel_header")
-                yield DirectoryTree("./", id="file_tree")
+                yield ProjectTree("./", id="file_tree")
 
                 with Container(id="file_ops"):
                     yield Button(
@@ -594,9 +1381,12 @@ class MavenikArena(App):
                     # Console
                     with Vertical(id="console_pane"):
                         yield Static("💻 SYSTEM CONSOLE", classes="panel_header")
-                        yield TextArea(
-                            "", read_only=True, id="console", show_line_numbers=False
-                        )
+                        yield ConsoleView(CONSOLE_MAX_LINES, id="console")
+
+                    # Job queue
+                    with Vertical(id="job_pane"):
+                        yield Static("📋 JOBS (Ctrl+K cancel)", classes="panel_header")
+                        yield Static("No jobs yet", id="job_queue")
 
                     # Tool panel
                     with Vertical(id="tool_panel"):
@@ -625,6 +1415,21 @@ class MavenikArena(App):
                                     id="tool_simulate",
                                     classes="tool_btn primary",
                                 )
+                                yield Button(
+                                    "🏎 Verilator Sim (F10)",
+                                    id="tool_verilator",
+                                    classes="tool_btn primary",
+                                )
+                                yield Button(
+                                    "🧵 Threads: 1 (Ctrl+J)",
+                                    id="tool_threads",
+                                    classes="tool_btn secondary",
+                                )
+                                yield Button(
+                                    "🧪 Run All (Ctrl+R)",
+                                    id="tool_regress",
+                                    classes="tool_btn secondary",
+                                )
 
                             # Analysis
                             with Container(classes="tool_section"):
@@ -644,7 +1449,17 @@ class MavenikArena(App):
                             with Container(classes="tool_section"):
                                 yield Static("🌊 WAVEFORMS", classes="section_label")
                                 yield Button(
-                                    "📺 GTKWave (F8)",
+                                    "🌊 Waves (F8)",
+                                    id="tool_waves",
+                                    classes="tool_btn primary",
+                                )
+                                yield Button(
+                                    "📋 Monitor (Shift+F8)",
+                                    id="tool_monitor",
+                                    classes="tool_btn secondary",
+                                )
+                                yield Button(
+                                    "📺 GTKWave",
                                     id="tool_gtkwave",
                                     classes="tool_btn secondary",
                                 )
@@ -655,33 +1470,89 @@ class MavenikArena(App):
                                 )
 
         yield Footer()
+        PROFILE.stop("compose")
 
     def on_mount(self) -> None:
-        """Initialize application"""
-        self.push_screen(BootScreen())
-        self.log_console("🚀 MAVENIK ARENA initialized", "success")
-        self.log_console(f"📁 Workspace: {self.workspace}", "info")
-        if TREE_SITTER_ENABLED:
+        """Initialize application; slow setup continues in load_deferred"""
+        PROFILE.mark("on_mount")
+        self.boot = BootScreen()
+        self.push_screen(self.boot)
+        with PROFILE.phase("on_mount.console_init"):
+            self.log_console("🚀 MAVENIK ARENA initialized", "success")
+            self.log_console(f"📁 Workspace: {self.workspace}", "info")
+        self.set_interval(0.5, self.refresh_job_panel)
+        self.call_after_refresh(PROFILE.mark, "first_paint")
+        self.run_worker(self.load_deferred, thread=True, group="startup")
+
+    def load_deferred(self) -> None:
+        """Worker thread: load the parser and themes and resolve tool paths"""
+        with PROFILE.phase("deferred.tree_sitter"):
+            parser = load_verilog_parser()
+        with PROFILE.phase("deferred.themes"):
+            themes = load_themes()
+        with PROFILE.phase("deferred.resolve_tools"):
+            for tool_name in TOOL_PATHS:
+                self.tools.resolve(tool_name)
+        self.call_from_thread(self.on_deferred_loaded, parser, themes)
+
+    def on_deferred_loaded(self, parser, themes) -> None:
+        self.verilog_parser = parser
+        self.themes = themes
+        self.module_index = ModuleIndex(Path.cwd(), parser=parser)
+        if parser is not None:
             self.log_console("🌲 Tree-sitter: ENABLED for advanced parsing", "success")
         else:
             self.log_console(
                 "⚠ Tree-sitter: DISABLED (using fallback highlighting)", "warning"
             )
-        self.check_tools()
+        with PROFILE.phase("check_tools"):
+            self.check_tools()
+
+        self.ready_s = time.monotonic() - STARTED
+        PROFILE.mark("ready")
+        self.log_console(f"⏱ Ready in {self.ready_s:.2f}s", "info")
+        if self.screen is self.boot:
+            self.boot.show_ready(parser is not None, self.ready_s)
+            if PROFILE.enabled:
+                # Profiling measures up to usable editors, so skip the prompt
+                self.pop_screen()
+        if PROFILE.enabled:
+            self.query_one("#design_editor", TextArea).focus()
+            self.call_after_refresh(self.editors_ready)
+
+    def editors_ready(self) -> None:
+        PROFILE.mark("editors_ready")
+        self.exit()
+
+    def on_unmount(self) -> None:
+        """Stop the persistent Yosys worker"""
+        self.yosys.close()
 
     def check_tools(self) -> None:
-        """Check if tools are installed"""
+        """Resolve tools now; probe their versions in the background"""
         self.log_console("\n🔍 Checking installed tools...", "info")
 
-        for tool_name, tool_path in TOOL_PATHS.items():
-            if os.path.exists(tool_path):
+        for tool_name in TOOL_PATHS:
+            tool_path = self.tools.resolve(tool_name)
+            if tool_path:
                 self.log_console(f"  ✓ {tool_name}: {tool_path}", "success")
             else:
-                self.log_console(f"  ✗ {tool_name}: Not found at {tool_path}", "error")
+                self.log_console(
+                    f"  ✗ {tool_name}: Not found on $PATH or at {TOOL_PATHS[tool_name]}",
+                    "error",
+                )
+        self.run_worker(self.probe_tools, thread=True, group="probe")
+
+    def probe_tools(self) -> None:
+        versions = self.tools.probe_all()
+        found = [f"{tool} ({v})" for tool, v in versions.items() if v != "missing"]
+        self.call_from_thread(
+            self.log_console, f"🔧 Versions: {', '.join(found) or 'none'}", "info"
+        )
 
     def log_console(self, message: str, level: str = "info") -> None:
         """Add message to console with color coding"""
-        console = self.query_one("#console", TextArea)
+        console = self.query_one("#console", ConsoleView)
 
         # Simple text coloring
         if level == "success":
@@ -693,10 +1564,7 @@ class MavenikArena(App):
         else:
             prefix = ">> "
 
-        console.text += f"{prefix}{message}\n"
-
-        # Auto-scroll to bottom
-        console.scroll_end(animate=False)
+        console.write(f"{prefix}{message}", level)
 
     def on_directory_tree_file_selected(
         self, event: DirectoryTree.FileSelected
@@ -742,52 +1610,106 @@ class MavenikArena(App):
 
     def sync_files(self) -> bool:
         """Save current editor contents to files and create combined file"""
+        with TRACER.span("sync files", "io"):
+            return self._sync_files()
+
+    def _sync_files(self) -> bool:
         try:
-            # Save design
-            if self.design_path:
-                design_content = self.query_one("#design_editor", TextArea).text
-                with open(self.design_path, "w") as f:
-                    f.write(design_content)
+            design_content = self.query_one("#design_editor", TextArea).text
+            testbench_content = self.query_one("#testbench_editor", TextArea).text
+            changed = False
 
-            # Save testbench
+            # Save design / testbench (only touch disk when the editor changed)
+            if self.design_path:
+                changed |= write_if_changed(self.design_path, design_content)
             if self.testbench_path:
-                testbench_content = self.query_one("#testbench_editor", TextArea).text
-                with open(self.testbench_path, "w") as f:
-                    f.write(testbench_content)
-
-            # Create FRESH combined file for simulation (ALWAYS LATEST)
-            combined_path = self.workspace / "top_active.sv"
-            with open(combined_path, "w") as f:
-                f.write("// MAVENIK ARENA - Auto-generated combined file\n")
-                f.write("// Generated: Fresh compilation\n\n")
-                f.write("// ===== DESIGN MODULE =====\n")
-                f.write(self.query_one("#design_editor", TextArea).text)
-                f.write("\n\n// ===== TESTBENCH MODULE =====\n")
-                f.write(self.query_one("#testbench_editor", TextArea).text)
-
-            self.log_console("💾 Files synchronized (LATEST VERSION)", "success")
+                changed |= write_if_changed(self.testbench_path, testbench_content)
+
+            # Combined file for simulation, snapshotted per content so a
+            # running job never sees another instance's edits
+            sources_dir = self.runs.snapshot(
+                "src",
+                {
+                    "top_active.sv": "// MAVENIK ARENA - Auto-generated combined file\n"
+                    "// Generated: Fresh compilation\n\n"
+                    "// ===== DESIGN MODULE =====\n"
+                    f"{design_content}"
+                    "\n\n// ===== TESTBENCH MODULE =====\n"
+                    f"{testbench_content}"
+                },
+            )
+            changed |= sources_dir != self.sources_dir
+            self.sources_dir = sources_dir
+
+            if changed:
+                self.log_console("💾 Files synchronized (LATEST VERSION)", "success")
+            else:
+                self.log_console("💾 Sources unchanged since last sync", "info")
             return True
 
         except Exception as e:
             self.log_console(f"Error syncing files: {str(e)}", "error")
             return False
 
-    def run_command(self, cmd: str, cwd: str = None) -> tuple:
-        """Execute shell command and return output"""
-        try:
-            result = subprocess.run(
-                cmd,
-                shell=True,
-                capture_output=True,
-                text=True,
-                cwd=cwd or str(self.workspace),
-                timeout=60,
-            )
-            return result.returncode, result.stdout, result.stderr
-        except subprocess.TimeoutExpired:
-            return -1, "", "Command timeout (60s exceeded)"
-        except Exception as e:
-            return -1, "", str(e)
+    async def run_command(
+        self,
+        cmd: str,
+        cwd: str = None,
+        timeout=COMMAND_TIMEOUT,
+        on_line=None,
+        log_file=None,
+        limiter=None,
+        streams=("stdout", "stderr"),
+    ) -> ToolResult:
+        """Execute shell command, streaming its output into the console
+
+        Only lines from `streams` are shown, at most CONSOLE_RATE_LIMIT per
+        second; the full output is kept in log_file (a new file under logs/
+        by default). Callers passing their own limiter report what it
+        suppressed (see report_suppressed).
+        """
+
+        tool = Path(cmd.split()[0]).name
+        log_file = log_file or self.logs.new(tool)
+        show = on_line or self.echo
+        owned = limiter is None
+        limiter = limiter or LineLimiter(CONSOLE_RATE_LIMIT)
+
+        def limited(stream, lines):
+            if stream in streams:
+                lines = [line for line in lines if line.strip()]
+                for line in limiter.filter(lines, (show, stream)):
+                    show(stream, line)
+
+        result = await ToolRunner().run(
+            cmd,
+            cwd=cwd or str(self.workspace),
+            on_lines=limited,
+            timeout=timeout,
+            log_file=log_file,
+        )
+
+        if owned:
+            self.report_suppressed(limiter, log_file)
+        level = "success" if result.ok else "warning"
+        self.log_console(f"⏱ {tool}: {result.summary()}", level)
+        return result
+
+    def echo(self, stream: str, line: str) -> None:
+        """Show a line of tool output (stderr as errors)"""
+        self.log_console(line, "error" if stream == "stderr" else "info")
+
+    def report_suppressed(self, limiter: LineLimiter, log_file=None) -> None:
+        """Summarize output kept off the console and show how it ended"""
+        if not limiter.suppressed:
+            return
+        if log_file is not None:
+            log_file = Path(log_file)
+            if log_file.is_relative_to(self.workspace):
+                log_file = log_file.relative_to(self.workspace)
+        self.log_console(limiter.summary(log_file), "warning")
+        for (show, stream), line in limiter.tail:
+            show(stream, line)
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle all button clicks"""
@@ -802,203 +1724,704 @@ class MavenikArena(App):
         elif btn_id == "btn_themes":
             self.action_theme_selector()
 
-        # Tool operations (ALWAYS sync first to use LATEST files)
+        # Tool operations (each action syncs first to use LATEST files)
         elif btn_id.startswith("tool_"):
-            if not self.sync_files():
-                self.log_console("✗ Cannot proceed - file sync failed", "error")
-                return
-
             if btn_id == "tool_compile":
                 self.action_compile()
             elif btn_id == "tool_lint":
                 self.action_lint()
             elif btn_id == "tool_simulate":
                 self.action_simulate()
+            elif btn_id == "tool_verilator":
+                self.action_simulate_verilator()
+            elif btn_id == "tool_threads":
+                self.action_toggle_threads()
+            elif btn_id == "tool_regress":
+                self.action_run_all()
             elif btn_id == "tool_synth":
                 self.action_synthesize()
             elif btn_id == "tool_schem":
                 self.action_schematic()
+            elif btn_id == "tool_waves":
+                self.action_view_waves()
+            elif btn_id == "tool_monitor":
+                self.action_show_monitor()
             elif btn_id == "tool_gtkwave":
                 self.action_view_waves("gtkwave")
             elif btn_id == "tool_surfer":
                 self.action_view_waves("surfer")
 
+    def sync_or_abort(self) -> bool:
+        """Sync editors before a tool run, logging if that fails"""
+        if self.sync_files():
+            return True
+        self.log_console("✗ Cannot proceed - file sync failed", "error")
+        return False
+
+    def runs_in_use(self) -> list:
+        """Runs the app still reads from, kept by the run store's gc"""
+        return [self.sources_dir, self.last_compile, self.last_sim]
+
+    def resolve_sources(self, role: str):
+        """(top module, files) for the "testbench" or "design" editor
+
+        When the editors are backed by files, the module index supplies the
+        transitive set of files (submodules in other files included) of the
+        editor file's modules. The top is the one module there that none of
+        the others instantiates; with several (or none) it is left to the
+        tools. Otherwise the synced top_active.sv snapshot is used with no
+        explicit top.
+        """
+        path = self.testbench_path if role == "testbench" else self.design_path
+        if path and self.design_path:
+            with TRACER.span("index refresh", "index") as span:
+                span["reparsed"] = self.module_index.refresh()
+            tops = self.module_index.modules_in(path)
+            if tops:
+                prefer = [p for p in (self.testbench_path, self.design_path) if p]
+                files, missing, ambiguous = self.module_index.closure(tops, prefer)
+                if missing:
+                    self.log_console(
+                        f"⚠ No definition found for: {', '.join(sorted(missing))}",
+                        "warning",
+                    )
+                for module, paths in sorted(ambiguous.items()):
+                    names = ", ".join(path.name for path in paths[1:])
+                    self.log_console(
+                        f"⚠ {module} is defined in several files; using "
+                        f"{paths[0].name} (also in {names})",
+                        "warning",
+                    )
+                return self.module_index.top_of(path), files
+        return None, [self.sources_dir / "top_active.sv"]
+
+    async def tool_version(self, tool: str) -> str:
+        """Tool version for cache keys (waits for the background probe if needed)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.tools.version, tool)
+
     def action_compile(self) -> None:
         """Compile with iverilog"""
-        self.log_console("\n🔨 COMPILING with iverilog (LATEST files)...", "info")
+        if self.sync_or_abort():
+            self.scheduler.submit(
+                "compile",
+                self._compile_flow,
+                priority=INTERACTIVE,
+                resources={"design.vvp"},
+            )
 
-        cmd = f"{TOOL_PATHS['iverilog']} -g2012 -o {self.workspace}/design.vvp {self.workspace}/top_active.sv"
-        code, stdout, stderr = self.run_command(cmd)
+    async def _compile_flow(self) -> bool:
+        self.log_console("\n🔨 COMPILING with iverilog (LATEST files)...", "info")
 
-        if code == 0:
+        top, sources = self.resolve_sources("testbench")
+        flags = f"{IVERILOG_FLAGS} -s {top}" if top else IVERILOG_FLAGS
+        version = await self.tool_version("iverilog")
+        with TRACER.span("cache lookup", "cache") as span:
+            key = self.build_cache.key(sources, flags, version)
+            run_dir = self.runs.find("compile", key)
+            span["hit"] = run_dir is not None
+        if run_dir is not None:
+            self.runs.set_latest("compile", run_dir)
+            self.last_compile = run_dir
+            self.log_console(f"⚡ Build cache hit ({run_dir.name})", "success")
             self.log_console("✓ Compilation successful!", "success")
-            if stdout:
-                self.log_console(stdout, "info")
-        else:
-            self.log_console("✗ Compilation failed!", "error")
-            if stderr:
-                for line in stderr.split("\n"):
-                    if line.strip():
-                        self.log_console(line, "error")
+            return True
+
+        with self.runs.staging("compile") as staging:
+            vvp_file = staging / "design.vvp"
+            if self.build_cache.restore(key, vvp_file):
+                self.log_console(
+                    f"⚡ Build cache hit ({key[:12]}) - reused design.vvp", "success"
+                )
+            else:
+                files = " ".join(str(path) for path in sources)
+                cmd = f"{self.tools.path('iverilog')} {flags} -o {vvp_file} {files}"
+                result = await self.run_command(cmd, cwd=str(staging))
+                if not result.ok:
+                    if not result.cancelled:
+                        self.log_console("✗ Compilation failed!", "error")
+                    return False
+                self.build_cache.store(key, vvp_file)
+            self.last_compile = self.runs.publish("compile", key, staging)
+
+        self.log_console(
+            f"✓ Compilation successful! ({self.last_compile.name})", "success"
+        )
+        return True
 
     def action_lint(self) -> None:
         """Lint with Verilator"""
+        if self.sync_or_abort():
+            self.scheduler.submit(
+                "lint", self._lint_flow, priority=BACKGROUND, resources=()
+            )
+
+    async def _lint_flow(self) -> bool:
         self.log_console("\n⚡ LINTING with Verilator (LATEST files)...", "info")
 
-        cmd = f"{TOOL_PATHS['verilator']} --lint-only -Wall {self.workspace}/top_active.sv"
-        code, stdout, stderr = self.run_command(cmd)
+        def echo(stream, line):
+            self.log_console(line, "warning" if stream == "stderr" else "info")
 
-        if "Error" not in stderr and "%Error" not in stderr:
-            self.log_console("✓ Lint check passed!", "success")
-        else:
-            self.log_console("⚠ Lint warnings/errors found:", "warning")
+        top, sources = self.resolve_sources("testbench")
+        files = " ".join(str(path) for path in sources)
+        cmd = f"{self.tools.path('verilator')} --lint-only -Wall {top_flag(top)}{files}"
+        result = await self.run_command(cmd, on_line=echo)
 
-        if stderr:
-            for line in stderr.split("\n"):
-                if line.strip():
-                    self.log_console(line, "warning")
+        if result.cancelled:
+            return False
+        with TRACER.span("parse lint output", "parse"):
+            clean = "Error" not in result.stderr and "%Error" not in result.stderr
+        if clean:
+            self.log_console("✓ Lint check passed!", "success")
+            return True
+        self.log_console("⚠ Lint warnings/errors found", "warning")
+        return False
+
+    def action_simulate(self, force: bool = False) -> None:
+        """Run simulation (replayed from the result cache when unchanged)"""
+        if self.sync_or_abort():
+            self.scheduler.submit(
+                "simulate",
+                lambda: self._simulate_flow(force),
+                priority=INTERACTIVE,
+                resources={"design.vvp"},
+            )
 
-        if stdout:
-            self.log_console(stdout, "info")
+    def action_force_simulate(self) -> None:
+        """Re-run simulation even if a cached result exists"""
+        self.action_simulate(force=True)
 
-    def action_simulate(self) -> None:
-        """Run simulation"""
+    async def _simulate_flow(self, force: bool = False) -> bool:
         self.log_console("\n▶ SIMULATING (LATEST files)...", "info")
 
-        vvp_file = self.workspace / "design.vvp"
-        if not vvp_file.exists():
+        compile_dir = self.last_compile or self.runs.latest("compile")
+        vvp_file = compile_dir / "design.vvp" if compile_dir else None
+        if vvp_file is None or not vvp_file.exists():
             self.log_console("✗ No compiled design. Run compile (F5) first!", "error")
-            return
-
-        cmd = f"{TOOL_PATHS['vvp']} {vvp_file}"
-        code, stdout, stderr = self.run_command(cmd)
+            return False
 
-        if code == 0:
-            self.log_console("✓ Simulation complete!", "success")
+        version = await self.tool_version("vvp")
+        with TRACER.span("sim cache lookup", "cache") as span:
+            key = sim_key(vvp_file, self.sim_plusargs, version)
+            run_dir = None if force else self.runs.find("sim", key)
+            result = load_result(run_dir) if run_dir else None
+            span["hit"] = result is not None
+        if result is not None:
+            self.runs.set_latest("sim", run_dir)
+            limiter = LineLimiter(CONSOLE_RATE_LIMIT)
+            with TRACER.span("replay output", "ui"):
+                for stream, text in (
+                    ("stdout", result.stdout),
+                    ("stderr", result.stderr),
+                ):
+                    lines = [line for line in text.splitlines() if line.strip()]
+                    # Tagged like run_command's lines: report_suppressed
+                    # replays the tail as show(stream, line)
+                    for line in limiter.filter(lines, (self.echo, stream)):
+                        self.echo(stream, line)
+            self.report_suppressed(limiter, run_dir / SIM_LOG)
+            self.log_console(
+                f"⚡ Simulation cache hit ({run_dir.name}) - replayed "
+                f"{result.summary()} (Shift+F6 to re-run)",
+                "success",
+            )
+        else:
+            from wave_live import LiveWaves
+
+            cmd = " ".join([self.tools.path("vvp"), str(vvp_file), *self.sim_plusargs])
+            limiter = LineLimiter(CONSOLE_RATE_LIMIT)
+            with self.runs.staging("sim") as staging:
+                # The dump is parsed as it is written: F8 / Shift+F8 show the
+                # run so far, and the job panel its simulated time
+                live = self.live = LiveWaves(staging / "dump.vcd")
+                follower = asyncio.create_task(self.follow_dump(live))
+                finished = False
+                try:
+                    result = await self.run_command(
+                        cmd,
+                        cwd=str(staging),
+                        timeout=None,
+                        log_file=staging / SIM_LOG,
+                        limiter=limiter,
+                    )
+                    finished = True
+                finally:
+                    follower.cancel()
+                    self.live = None
+                    live.running = False
+                    if not finished:
+                        # Preempted or failed: nothing will keep the dump
+                        await asyncio.to_thread(live.close)
+                if result.cancelled:
+                    await asyncio.to_thread(live.close)
+                    self.report_suppressed(limiter)
+                    return False
+                await asyncio.to_thread(live.update)
+                save_result(staging, result)
+                run_dir = self.runs.publish("sim", key, staging, replace=True)
+            await self.keep_dump(live, run_dir / "dump.vcd")
+            self.report_suppressed(limiter, run_dir / SIM_LOG)
+
+        self.last_sim = run_dir
+        if not result.ok:
+            self.log_console("✗ Simulation failed!", "error")
+            return False
+        self.last_iverilog_sim = result.elapsed
+        self.log_console(f"✓ Simulation complete! ({run_dir.name})", "success")
+
+        # Check for VCD file
+        vcd_file = run_dir / "dump.vcd"
+        if vcd_file.exists():
+            self.log_console(f"📊 Waveform generated: {vcd_file.name}", "success")
+        return True
+
+    async def follow_dump(self, live) -> None:
+        """Parse a running simulation's dump as it grows (until cancelled)"""
+        while True:
+            await asyncio.to_thread(live.update)
+            await asyncio.sleep(FOLLOW_INTERVAL)
+
+    async def keep_dump(self, live, vcd_file) -> None:
+        """Save a finished dump's live parse as its wave cache, so opening
+        it does not parse it again"""
+        try:
+            if live.complete:
+                await asyncio.to_thread(live.save, vcd_file)
+        except OSError:
+            pass  # the cache is built when the dump is opened instead
+        finally:
+            await asyncio.to_thread(live.close)
+
+    def action_simulate_verilator(self) -> None:
+        """Build a Verilator model on all cores and run it"""
+        if self.sync_or_abort():
+            self.scheduler.submit(
+                "verilator",
+                self._verilator_flow,
+                priority=INTERACTIVE,
+                resources={"verilator"},
+            )
 
-            # Check for VCD file
-            vcd_file = self.workspace / "dump.vcd"
-            if vcd_file.exists():
-                self.log_console(f"📊 Waveform generated: {vcd_file.name}", "success")
+    def action_toggle_threads(self) -> None:
+        """Switch the Verilator model between 1 thread and all cores"""
+        cores = os.cpu_count() or 1
+        self.verilator_threads = cores if self.verilator_threads == 1 else 1
+        self.query_one("#tool_threads", Button).label = (
+            f"🧵 Threads: {self.verilator_threads} (Ctrl+J)"
+        )
+        self.log_console(
+            f"🧵 Verilator model threads: {self.verilator_threads}", "info"
+        )
 
-            if stdout:
-                for line in stdout.split("\n"):
-                    if line.strip():
-                        self.log_console(line, "info")
+    async def _verilator_flow(self) -> bool:
+        self.log_console("\n🏎 SIMULATING with Verilator (LATEST files)...", "info")
+
+        top, paths = self.resolve_sources("testbench")
+
+        threads = self.verilator_threads
+        flags = VERILATOR_FLAGS + (["--threads", str(threads)] if threads > 1 else [])
+        # Without a known top Verilator picks it; the model is then named
+        # after a fixed prefix rather than the top
+        model = top or VERILATOR_MODEL
+        if top is None:
+            flags += ["--prefix", f"V{model}"]
+        # The build dir holds the sources side by side, by file name
+        clashes = duplicate_names(paths)
+        if clashes:
+            self.log_console(
+                f"✗ Verilator needs distinct file names; several sources are "
+                f"named {', '.join(clashes)}",
+                "error",
+            )
+            return False
+        sources = {path.name: path.read_text() for path in paths}
+        version = await self.tool_version("verilator")
+        build_dir, key = self.verilator_cache.prepare(model, flags, sources, version)
+        binary = self.verilator_cache.binary(build_dir, model)
+
+        build_s = 0.0
+        cached = self.verilator_cache.is_fresh(build_dir, key, model)
+        if cached:
+            self.log_console(f"⚡ Verilator cache hit ({build_dir.name})", "success")
         else:
-            self.log_console("✗ Simulation failed!", "error")
-            if stderr:
-                for line in stderr.split("\n"):
-                    if line.strip():
-                        self.log_console(line, "error")
+            cores = os.cpu_count() or 1
+            cmd = (
+                f"{self.tools.path('verilator')} {' '.join(flags)} -j {cores} "
+                f"{top_flag(top)}{' '.join(sources)}"
+            )
+            result = await self.run_command(cmd, cwd=str(build_dir), timeout=None)
+            if not result.ok:
+                if not result.cancelled:
+                    self.log_console("✗ Verilator build failed!", "error")
+                return False
+            build_s = result.elapsed
+            self.verilator_cache.mark_built(build_dir, key)
+
+        limiter = LineLimiter(CONSOLE_RATE_LIMIT)
+        with self.runs.staging("sim") as staging:
+            result = await self.run_command(
+                str(binary),
+                cwd=str(staging),
+                timeout=None,
+                log_file=staging / SIM_LOG,
+                limiter=limiter,
+            )
+            if not result.ok:
+                self.report_suppressed(limiter)
+                if not result.cancelled:
+                    self.log_console("✗ Verilator simulation failed!", "error")
+                return False
+            run_key = hash_key("verilator", key, str(threads))
+            self.last_sim = self.runs.publish("sim", run_key, staging, replace=True)
+        self.report_suppressed(limiter, self.last_sim / SIM_LOG)
+
+        history = self.workspace / "verilator_runs.jsonl"
+        baseline = single_thread_baseline(load_runs(history, model))
+        record_run(
+            history,
+            {
+                "time": time.time(),
+                "top": model,
+                "threads": threads,
+                "cached": cached,
+                "build_s": round(build_s, 3),
+                "sim_s": round(result.elapsed, 3),
+            },
+        )
+
+        self.log_console("✓ Verilator simulation complete!", "success")
+        self.log_console(
+            f"⏱ build {build_s:.2f}s | sim {result.elapsed:.2f}s | threads {threads}",
+            "info",
+        )
+        if baseline and threads > 1:
+            self.log_console(
+                f"🚀 {baseline / result.elapsed:.1f}x vs single-threaded model", "info"
+            )
+        if self.last_iverilog_sim:
+            self.log_console(
+                f"🚀 {self.last_iverilog_sim / result.elapsed:.1f}x vs iverilog vvp",
+                "info",
+            )
+        vcd_file = self.last_sim / "dump.vcd"
+        if vcd_file.exists():
+            self.log_console(f"📊 Waveform generated: {vcd_file}", "success")
+        return True
 
     def action_synthesize(self) -> None:
         """Synthesize with Yosys"""
-        self.log_console("\n🔨 SYNTHESIZING with Yosys (LATEST files)...", "info")
+        if self.sync_or_abort():
+            self.scheduler.submit(
+                "synthesize",
+                self._synthesize_flow,
+                priority=BACKGROUND,
+                resources={"yosys"},
+            )
 
-        script = f"""read_verilog -sv {self.workspace}/top_active.sv
-hierarchy -auto-top
-proc; opt; fsm; opt; memory; opt
-techmap; opt
-stat
-"""
+    async def run_yosys(self, commands, script_file: Path, top, sources):
+        """Run yosys commands on the design sources; returns (ok, stdout)
 
-        script_file = self.workspace / "synth.ys"
+        Uses the persistent worker when available, else a cold `yosys -s`.
+        """
+        if YosysSession.available():
+            loop = asyncio.get_running_loop()
+            start = time.monotonic()
+            try:
+                with TRACER.span("yosys worker", "tool") as span:
+                    output, reparsed = await loop.run_in_executor(
+                        None, self.yosys.request, sources, commands, top
+                    )
+                    span["reparsed"] = reparsed
+            except asyncio.CancelledError:
+                self.yosys.close()
+                raise
+            except YosysError as e:
+                for line in str(e).splitlines():
+                    if line.strip():
+                        self.log_console(line, "error")
+                return False, ""
+            note = "re-parsed sources" if reparsed else "design already loaded"
+            self.log_console(
+                f"⏱ yosys worker: {time.monotonic() - start:.2f}s ({note})", "success"
+            )
+            return True, output
+
+        files = " ".join(str(path) for path in sources)
+        hierarchy = f"hierarchy -top {top}" if top else "hierarchy -auto-top"
+        script = f"read_verilog -sv {files}\n{hierarchy}\n"
+        script += "\n".join(commands) + "\n"
         script_file.write_text(script)
 
-        cmd = f"{TOOL_PATHS['yosys']} -s {script_file}"
-        code, stdout, stderr = self.run_command(cmd)
-
-        if code == 0:
-            self.log_console("✓ Synthesis complete!", "success")
-
-            # Extract key stats
-            if stdout:
-                for line in stdout.split("\n"):
-                    if any(
-                        keyword in line
-                        for keyword in [
-                            "Number of cells",
-                            "Chip area",
-                            "cells:",
-                            "wires:",
-                        ]
-                    ):
-                        self.log_console(line.strip(), "info")
-        else:
+        cmd = f"{self.tools.path('yosys')} -s {script_file}"
+        result = await self.run_command(
+            cmd, cwd=str(script_file.parent), streams=("stderr",)
+        )
+        return result.ok, result.stdout
+
+    async def synthesize_artifacts(self):
+        """SynthArtifacts (stats, netlist, synth_out.v, schematic.dot) for the
+        current sources, or None if synthesis failed"""
+        top, sources = self.resolve_sources("design")
+        version = await self.tool_version("yosys")
+        with TRACER.span("cache lookup", "cache") as span:
+            key = SynthArtifacts.sources_key(sources, top, version)
+            run_dir = self.runs.find("synth", key)
+            fresh = run_dir is not None and SynthArtifacts(run_dir).is_fresh(key)
+            span["hit"] = fresh
+        if fresh:
+            self.runs.set_latest("synth", run_dir)
+            self.log_console("⚡ Synthesis artifacts up to date", "success")
+            return SynthArtifacts(run_dir)
+
+        with self.runs.staging("synth") as staging:
+            synth = SynthArtifacts(staging)
+            ok, _ = await self.run_yosys(
+                synth.commands(), staging / "synth.ys", top, sources
+            )
+            if not ok:
+                return None
+            synth.mark(key)
+            run_dir = self.runs.publish("synth", key, staging, replace=True)
+        return SynthArtifacts(run_dir)
+
+    async def _synthesize_flow(self) -> bool:
+        self.log_console("\n🔨 SYNTHESIZING with Yosys (LATEST files)...", "info")
+
+        synth = await self.synthesize_artifacts()
+        if synth is None:
             self.log_console("✗ Synthesis failed!", "error")
-            if stderr:
-                for line in stderr.split("\n"):
-                    if line.strip():
-                        self.log_console(line, "error")
+            return False
+
+        with TRACER.span("parse stat.json", "parse"):
+            stats = summarize_stats(synth.stats)
+        self.log_console(f"Number of cells: {stats['cells']}", "info")
+        self.log_console(
+            f"Number of wires: {stats['wires']} ({stats['wire_bits']} bits)", "info"
+        )
+        if stats["area"] is not None:
+            self.log_console(f"Chip area: {stats['area']}", "info")
+        for cell_type, count in sorted(stats["cell_types"].items()):
+            self.log_console(f"  {cell_type}: {count}", "info")
+        self.log_console(f"📄 Netlist: {synth.verilog}, {synth.netlist.name}", "info")
+        self.log_console("✓ Synthesis complete!", "success")
+        return True
 
     def action_schematic(self) -> None:
         """Generate schematic"""
+        if self.sync_or_abort():
+            self.scheduler.submit(
+                "schematic",
+                self._schematic_flow,
+                priority=INTERACTIVE,
+                resources={"yosys"},
+            )
+
+    async def _schematic_flow(self) -> bool:
         self.log_console("\n📐 GENERATING SCHEMATIC (LATEST files)...", "info")
 
-        script = f"""read_verilog -sv {self.workspace}/top_active.sv
-hierarchy -auto-top
-proc; opt
-show -format dot -prefix {self.workspace}/schematic
-"""
+        synth = await self.synthesize_artifacts()
+        if synth is None:
+            self.log_console("✗ Schematic generation failed!", "error")
+            return False
 
-        script_file = self.workspace / "schem.ys"
-        script_file.write_text(script)
+        png_file = synth.png
+        if synth.png_stale():
+            await self.run_command(
+                f"{self.tools.path('dot')} -Tpng {synth.dot} -o {png_file}"
+            )
 
-        cmd = f"{TOOL_PATHS['yosys']} -s {script_file}"
-        code, stdout, stderr = self.run_command(cmd)
-
-        if code == 0:
-            dot_file = self.workspace / "schematic.dot"
-            if dot_file.exists():
-                # Convert to PNG
-                png_file = self.workspace / "schematic.png"
-                result = subprocess.run(
-                    f"dot -Tpng {dot_file} -o {png_file}",
-                    shell=True,
-                    capture_output=True,
+        if png_file.exists():
+            self.log_console("✓ Schematic generated!", "success")
+            self.log_console(f"📐 Opening: {png_file.name}", "info")
+
+            # Try to open with xdg-open
+            try:
+                subprocess.Popen(["xdg-open", str(png_file)])
+            except:
+                self.log_console(
+                    "⚠ Auto-open failed. Check: " + str(png_file), "warning"
                 )
+        else:
+            self.log_console(
+                "⚠ Could not convert DOT to PNG (graphviz needed)", "warning"
+            )
+        return True
 
-                if png_file.exists():
-                    self.log_console("✓ Schematic generated!", "success")
-                    self.log_console(f"📐 Opening: {png_file.name}", "info")
+    def action_run_all(self) -> None:
+        """Compile and simulate every testbench in the workspace in parallel"""
+        import regression  # deferred: pulls in multiprocessing and XML
 
-                    # Try to open with xdg-open
-                    try:
-                        subprocess.Popen(["xdg-open", str(png_file)])
-                    except:
-                        self.log_console(
-                            "⚠ Auto-open failed. Check: " + str(png_file), "warning"
-                        )
-                else:
-                    self.log_console(
-                        "⚠ Could not convert DOT to PNG (graphviz needed)", "warning"
-                    )
-            else:
-                self.log_console("⚠ DOT file not generated", "warning")
-        else:
-            self.log_console("✗ Schematic generation failed!", "error")
+        if not self.sync_or_abort():
+            return
+        self.module_index.refresh()
+        cases = regression.discover(Path.cwd(), self.module_index)
+        if not cases:
+            self.log_console("⚠ No testbenches (*_tb.v / tb_*.v) found", "warning")
+            return
+        screen = RegressionScreen(cases)
+        self.push_screen(screen)
+        self.scheduler.submit(
+            "regression",
+            lambda: self._regression_flow(cases, screen),
+            priority=BACKGROUND,
+        )
 
-    def action_view_waves(self, viewer: str) -> None:
-        """Open waveform viewer with LATEST VCD"""
-        vcd_file = self.workspace / "dump.vcd"
+    async def _regression_flow(self, cases, screen) -> bool:
+        with self.runs.staging("regression") as out_root:
+            return await self._run_regression(cases, screen, out_root)
 
-        if not vcd_file.exists():
-            self.log_console(f"✗ No waveform file. Run simulation (F6) first!", "error")
+    async def _run_regression(self, cases, screen, out_root) -> bool:
+        import regression
+
+        self.log_console(
+            f"\n🧪 REGRESSION: {len(cases)} testbenches on {os.cpu_count()} cores...",
+            "info",
+        )
+
+        loop = asyncio.get_running_loop()
+        pool = regression.make_pool()
+        results = []
+        finished = False
+        try:
+            futures = [
+                loop.run_in_executor(
+                    pool,
+                    regression.run_case,
+                    case,
+                    out_root,
+                    self.tools.path("iverilog"),
+                    self.tools.path("vvp"),
+                )
+                for case in cases
+            ]
+            for future in asyncio.as_completed(futures):
+                result = await future
+                results.append(result)
+                screen.add_result(result)
+            finished = True
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            if not finished:
+                # Cancelled or preempted: stop the tools already running too
+                regression.kill_running(out_root)
+
+        with TRACER.span("write junit", "io"):
+            regression.write_junit(results, out_root / "junit.xml")
+        key = hash_key(*(case.name for case in cases), str(time.time()))
+        run_dir = self.runs.publish("regression", key, out_root)
+        junit = run_dir / "junit.xml"
+        passed = sum(r["status"] == "pass" for r in results)
+        level = "success" if passed == len(results) else "warning"
+        self.log_console(f"🧪 Regression: {passed}/{len(results)} passed", level)
+        self.log_console(f"📄 JUnit summary: {junit}", "info")
+        return passed == len(results)
+
+    def action_show_trace(self) -> None:
+        """Show recent tracing spans"""
+        self.push_screen(TraceScreen())
+
+    def action_show_logs(self) -> None:
+        """Page through full tool logs, newest last"""
+        paths = self.log_files()
+        if not paths:
+            self.log_console("⚠ No tool logs yet", "warning")
+            return
+        self.push_screen(LogScreen(paths))
+
+    def log_files(self) -> list:
+        """Command logs and simulation logs (running ones too), oldest first"""
+        paths = self.logs.paths() + list(self.runs.root.glob(f"*/{SIM_LOG}"))
+        return sorted(paths, key=lambda p: p.stat().st_mtime)
+
+    def export_trace(self) -> str:
+        """Write the span ring buffer as Chrome / Perfetto trace JSON"""
+        path = TRACER.export(self.workspace / "trace.json")
+        self.log_console(f"🔬 Trace written: {path} (open in ui.perfetto.dev)", "info")
+        return path
+
+    def action_cancel_jobs(self) -> None:
+        """Cancel every pending and running job"""
+        cancelled = self.scheduler.cancel_all()
+        if cancelled:
+            self.log_console(f"⛔ Cancelled {cancelled} job(s)", "warning")
+        else:
+            self.log_console("⚠ No jobs to cancel", "warning")
+
+    def refresh_job_panel(self) -> None:
+        """Redraw the job queue panel"""
+        icons = {
+            "running": "▶",
+            "pending": "…",
+            "done": "✓",
+            "failed": "✗",
+            "cancelled": "⛔",
+            "superseded": "↷",
+            "preempted": "⏸",
+        }
+        lines = []
+        live = self.live
+        for job in self.scheduler.jobs():
+            timing = f" {job.elapsed:.1f}s" if job.state != "pending" else ""
+            if job.name == "simulate" and job.state == "running":
+                # Simulated time so far, read from the dump as it is written
+                if live is not None and live.ready:
+                    timing += f" ⏱ {simulated_time(live)}"
+            lines.append(f"{icons.get(job.state, '?')} #{job.id} {job.name}{timing}")
+        try:
+            panel = self.query_one("#job_queue", Static)
+        except NoMatches:
+            return
+        panel.update("\n".join(lines) or "No jobs yet")
+
+    def latest_vcd(self):
+        """dump.vcd of the LATEST simulation, or None (logged)"""
+        run_dir = self.last_sim or self.runs.latest("sim")
+        vcd_file = run_dir / "dump.vcd" if run_dir else None
+        if vcd_file is None or not vcd_file.exists():
+            self.log_console("✗ No waveform file. Run simulation (F6) first!", "error")
+            return None
+        return vcd_file
+
+    def action_show_monitor(self) -> None:
+        """Signal table at clock edges, built from the LATEST VCD (or from
+        the running simulation's, live)"""
+        if self.live is not None:
+            self.log_console("🔴 Following the running simulation's dump", "info")
+            self.push_screen(MonitorScreen(self.live.vcd_path, live=self.live))
+            return
+        vcd_file = self.latest_vcd()
+        if vcd_file is not None:
+            self.push_screen(MonitorScreen(vcd_file))
+
+    def action_view_waves(self, viewer: str = "tui") -> None:
+        """Open the LATEST VCD in the built-in viewer (or GTKWave / Surfer);
+        during a simulation the built-in viewer follows its dump live"""
+        if viewer == "tui" and self.live is not None:
+            self.log_console("🔴 Following the running simulation's dump", "info")
+            self.push_screen(WaveScreen(self.live.vcd_path, live=self.live))
+            return
+        vcd_file = self.latest_vcd()
+        if vcd_file is None:
+            return
+
+        if viewer == "tui":
+            self.push_screen(WaveScreen(vcd_file))
             return
 
         self.log_console(f"\n🌊 Opening {viewer.upper()} (LATEST waveform)...", "info")
 
         try:
             if viewer == "gtkwave":
-                subprocess.Popen([TOOL_PATHS["gtkwave"], str(vcd_file)])
+                subprocess.Popen([self.tools.path("gtkwave"), str(vcd_file)])
                 self.log_console("✓ GTKWave launched", "success")
             else:
-                subprocess.Popen([TOOL_PATHS["surfer"], str(vcd_file)])
+                subprocess.Popen([self.tools.path("surfer"), str(vcd_file)])
                 self.log_console("✓ Surfer launched", "success")
 
         except FileNotFoundError:
-            self.log_console(f"✗ {viewer} not found at {TOOL_PATHS[viewer]}", "error")
+            self.log_console(
+                f"✗ {viewer} not found on $PATH or at {TOOL_PATHS[viewer]}", "error"
+            )
         except Exception as e:
             self.log_console(f"✗ Could not launch {viewer}: {str(e)}", "error")
 
@@ -1099,11 +2522,7 @@ module {module_name}_tb;
         #100 $finish;
     end
     
-    // Monitor outputs
-    initial begin
-        $monitor("Time=%0t rst=%b data_in=%h data_out=%h", 
-                 $time, rst, data_in, data_out);
-    end
+    // No $monitor needed: Shift+F8 tabulates dump.vcd at each clock edge
 
 endmodule
 """
@@ -1131,7 +2550,7 @@ endmodule
 
     def apply_theme(self, theme_name: str) -> None:
         """Apply selected theme"""
-        if theme_name in THEMES:
+        if theme_name in self.themes:
             self.current_theme_name = theme_name
             self.log_console(f"🎨 Theme changed to: {theme_name}", "success")
             self.log_console("⚠ Note: Full theme requires restart", "warning")
@@ -1189,3 +2608,4 @@ endmodule
 if __name__ == "__main__":
     app = MavenikArena()
     app.run()
+    PROFILE.dump()
@@ -1,3 +1,8 @@
+from startup_profile import StartupProfile
+
+# With --profile-startup, every import below is timed
+PROFILE = StartupProfile.from_argv(__name__)
+
 import os
 import asyncio
 import subprocess
@@ -13,13 +18,19 @@ from textual.widgets import (
     TextArea,
     Button,
     Label,
-    Log,
     DirectoryTree,
     Input,
 )
 from textual.binding import Binding
 from textual.screen import Screen, ModalScreen
 
+from build_cache import hash_key
+from console_view import ConsoleView, LineLimiter
+from log_store import LogStore
+from run_store import RunStore
+from tracing import TRACER
+from yosys_session import YosysError, YosysSession
+
 
 # --- TERMINAL DETECTOR ---
 def get_terminal_cmd():
@@ -29,6 +40,14 @@ def get_terminal_cmd():
     return "x-terminal-emulator"
 
 
+# --- PROJECT TREE ---
+class ProjectTree(DirectoryTree):
+    """DirectoryTree whose directory scans are timed by --profile-startup"""
+
+    def filter_paths(self, paths):
+        return PROFILE.timed_paths("directory_tree.scan", paths)
+
+
 # --- SPLASH SCREEN ---
 class Splash(Screen):
     """Intro screen designed by Mayank Anand"""
@@ -146,14 +165,17 @@ class AnandForge(App):
         Binding("f1", "view_rtl", "RTL View"),
         Binding("f2", "view_tb", "TB View"),
         Binding("f3", "view_split", "Split View"),
+        Binding("f12", "export_trace", "Export Trace"),
     ]
 
     def compose(self) -> ComposeResult:
+        PROFILE.unhook_imports()
+        PROFILE.start("compose")
         yield Header()
         with Horizontal(id="main-container"):
             with Vertical(id="sidebar"):
                 yield Label("PROJECT MANAGER", classes="lbl")
-                yield DirectoryTree("./", id="tree")
+                yield ProjectTree("./", id="tree")
                 with Horizontal(classes="file-ops"):
                     yield Button("NEW", id="btn_new", variant="success")
                     yield Button("DEL", id="btn_del", variant="error")
@@ -186,14 +208,35 @@ class AnandForge(App):
                         )
 
                 with Vertical(id="console-area"):
-                    yield Log(id="console")
+                    yield ConsoleView(id="console")
         yield Footer()
+        PROFILE.stop("compose")
 
     def on_mount(self):
+        PROFILE.mark("on_mount")
         self.push_screen(Splash())
         self.active_rtl = self.active_tb = None
-        self.term_cmd = get_terminal_cmd()
-        self.log_msg(f"System Ready. Terminal: {self.term_cmd}")
+        with PROFILE.phase("on_mount.terminal_detect"):
+            self.term_cmd = get_terminal_cmd()
+        with PROFILE.phase("on_mount.workers"):
+            self.yosys = YosysSession()
+            self.runs = RunStore(Path.cwd() / ".anandforge_runs")
+            self.logs = LogStore(Path.cwd() / ".anandforge_logs")
+        with PROFILE.phase("on_mount.console_init"):
+            self.log_msg(f"System Ready. Terminal: {self.term_cmd}")
+        self.call_after_refresh(PROFILE.mark, "first_paint")
+        if PROFILE.enabled:
+            # Profiling measures up to usable editors, so skip the splash
+            self.pop_screen()
+            self.query_one("#ed_rtl", TextArea).focus()
+            self.call_after_refresh(self.editors_ready)
+
+    def editors_ready(self):
+        PROFILE.mark("editors_ready")
+        self.exit()
+
+    def on_unmount(self):
+        self.yosys.close()
 
     def log_msg(self, msg):
         self.query_one("#console").write_line(f"[{time.strftime('%H:%M:%S')}] » {msg}")
@@ -217,10 +260,11 @@ class AnandForge(App):
             pass
 
     def action_save_files(self):
-        if self.active_rtl:
-            Path(self.active_rtl).write_text(self.query_one("#ed_rtl").text)
-        if self.active_tb:
-            Path(self.active_tb).write_text(self.query_one("#ed_tb").text)
+        with TRACER.span("save files", "io"):
+            if self.active_rtl:
+                Path(self.active_rtl).write_text(self.query_one("#ed_rtl").text)
+            if self.active_tb:
+                Path(self.active_tb).write_text(self.query_one("#ed_tb").text)
         self.log_msg("Files saved.")
 
     def on_button_pressed(self, event):
@@ -250,9 +294,13 @@ class AnandForge(App):
         elif bid == "btn_schem":
             self.run_schematic()
         elif bid == "btn_gtk":
-            subprocess.Popen(["gtkwave", "dump.vcd"])
+            self.open_waves("gtkwave")
         elif bid == "btn_surf":
-            subprocess.Popen(["surfer", "dump.vcd"])
+            self.open_waves("surfer")
+
+    def action_export_trace(self):
+        path = TRACER.export(Path.cwd() / "anandforge_trace.json")
+        self.log_msg(f"Trace written: {path} (open in ui.perfetto.dev)")
 
     def action_toggle_sidebar(self):
         sb = self.query_one("#sidebar")
@@ -283,32 +331,77 @@ class AnandForge(App):
             os.rename(node.data.path, Path(node.data.path).parent / new_name)
             self.query_one("#tree").reload()
 
-    async def run_process(self, cmd, name):
+    def open_waves(self, viewer):
+        run_dir = self.runs.latest("sim")
+        if run_dir is None or not (run_dir / "dump.vcd").exists():
+            self.log_msg("No waveform yet - run a simulation first.")
+            return
+        subprocess.Popen([viewer, str(run_dir / "dump.vcd")])
+
+    def run_key(self, *parts):
+        """Content key of the active files plus any extra parts"""
+        files = [p for p in (self.active_rtl, self.active_tb) if p]
+        return hash_key(*parts, *(f"{p}\0{Path(p).read_text()}" for p in files))
+
+    async def run_process(self, cmd, name, cwd=None, log_file=None, limiter=None):
+        """Run a tool; a rate-limited share of its output goes to the console
+        and all of it to log_file, a new file under .anandforge_logs unless
+        given (callers passing a limiter report it)"""
         self.log_msg(f"Running {name}...")
-        proc = await asyncio.create_subprocess_exec(
-            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await proc.communicate()
-        if stdout:
-            self.query_one("#console").write(stdout.decode())
-        if stderr:
-            self.query_one("#console").write(stderr.decode())
+        log_file = log_file or self.logs.new(name.lower())
+        with TRACER.span(f"spawn {name}", "process"):
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        with TRACER.span(f"run {name}", "tool") as span:
+            stdout, stderr = await proc.communicate()
+            span["returncode"] = proc.returncode
+        owned = limiter is None
+        limiter = limiter or LineLimiter()
+        with TRACER.span(f"output {name}", "ui", bytes=len(stdout) + len(stderr)):
+            console = self.query_one("#console")
+            for data, level in ((stdout, "info"), (stderr, "error")):
+                lines = data.decode(errors="replace").splitlines()
+                console.write_lines(
+                    limiter.filter(lines, (console.write, level)), level
+                )
+        Path(log_file).write_bytes(stdout + stderr)
+        if owned:
+            self.report_suppressed(limiter, log_file)
         return proc.returncode
 
+    def report_suppressed(self, limiter, log_file=None):
+        """Summarize output kept off the console and show how it ended"""
+        if limiter.suppressed:
+            self.log_msg(limiter.summary(log_file))
+            for (write, level), line in limiter.tail:
+                write(line, level)
+
     def run_simulation(self):
         if self.active_rtl and self.active_tb:
             self.action_save_files()
             self.run_worker(self._sim_flow())
 
     async def _sim_flow(self):
-        if (
-            await self.run_process(
-                ["iverilog", "-o", "sim.vvp", self.active_rtl, self.active_tb],
-                "iVerilog",
+        sources = [os.path.abspath(self.active_rtl), os.path.abspath(self.active_tb)]
+        key = self.run_key("sim")
+        # Private run directory so sim.vvp / dump.vcd are never shared
+        with self.runs.staging("sim") as run_dir:
+            cmd = ["iverilog", "-o", "sim.vvp", *sources]
+            if await self.run_process(cmd, "iVerilog", cwd=run_dir) != 0:
+                return
+            limiter = LineLimiter()
+            cmd = ["vvp", "sim.vvp"]
+            code = await self.run_process(
+                cmd, "VVP", run_dir, run_dir / "sim.log", limiter
             )
-            == 0
-        ):
-            await self.run_process(["vvp", "sim.vvp"], "VVP")
+            if code == 0:
+                run_dir = self.runs.publish("sim", key, run_dir, replace=True)
+        # A failed run's directory (and its log) has been discarded
+        self.report_suppressed(limiter, run_dir / "sim.log" if code == 0 else None)
 
     def run_verilator(self):
         if self.active_rtl:
@@ -319,26 +412,67 @@ class AnandForge(App):
                 )
             )
 
+    async def run_yosys(self, commands, name):
+        """Run commands on the persistent Yosys worker (design stays parsed)"""
+        self.log_msg(f"Running {name}...")
+        loop = asyncio.get_running_loop()
+        try:
+            with TRACER.span(f"yosys worker {name}", "tool"):
+                output, reparsed = await loop.run_in_executor(
+                    None, self.yosys.request, [self.active_rtl], commands
+                )
+        except YosysError as e:
+            self.query_one("#console").write(str(e), "error")
+            return 1
+        if reparsed:
+            self.log_msg(f"{name}: parsed {Path(self.active_rtl).name}")
+        self.query_one("#console").write(output)
+        return 0
+
+    async def run_yosys_in(self, run_dir, commands, name):
+        """Run commands on the worker, or as a cold script in run_dir"""
+        if YosysSession.available():
+            return await self.run_yosys(commands, name)
+        rtl = os.path.abspath(self.active_rtl)
+        script = f"read_verilog {rtl}; " + "; ".join(commands)
+        (run_dir / "script.ys").write_text(script)
+        return await self.run_process(["yosys", "script.ys"], name, cwd=run_dir)
+
     def run_synthesis(self):
         if self.active_rtl:
             self.action_save_files()
-            script = f"read_verilog {self.active_rtl}; synth -top {Path(self.active_rtl).stem}; write_verilog synth.v; stat"
-            Path("synth.ys").write_text(script)
-            self.run_worker(self.run_process(["yosys", "synth.ys"], "Yosys"))
+            self.run_worker(self._synth_flow())
+
+    async def _synth_flow(self):
+        top = Path(self.active_rtl).stem
+        key = self.run_key("synth")
+        with self.runs.staging("synth") as run_dir:
+            commands = [
+                f"synth -top {top}",
+                f"write_verilog {run_dir / 'synth.v'}",
+                "stat",
+            ]
+            if await self.run_yosys_in(run_dir, commands, "Yosys") == 0:
+                self.runs.publish("synth", key, run_dir, replace=True)
 
     def run_schematic(self):
         if self.active_rtl:
             self.action_save_files()
-            Path("schem.ys").write_text(
-                f"read_verilog {self.active_rtl}; proc; opt; show -format png -prefix schematic"
-            )
             self.run_worker(self._schem_flow())
 
     async def _schem_flow(self):
-        await self.run_process(["yosys", "schem.ys"], "Schematic")
+        key = self.run_key("schematic")
+        with self.runs.staging("schematic") as run_dir:
+            commands = [
+                "proc; opt",
+                f"show -format png -prefix {run_dir / 'schematic'}",
+            ]
+            if await self.run_yosys_in(run_dir, commands, "Schematic") != 0:
+                return
+            run_dir = self.runs.publish("schematic", key, run_dir, replace=True)
         for v in ["display", "eog", "xdg-open"]:
             if shutil.which(v):
-                subprocess.Popen([v, "schematic.png"])
+                subprocess.Popen([v, str(run_dir / "schematic.png")])
                 break
 
     def action_view_rtl(self):
@@ -362,3 +496,4 @@ class AnandForge(App):
 
 if __name__ == "__main__":
     AnandForge().run()
+    PROFILE.dump()
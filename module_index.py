@@ -0,0 +1,191 @@
+"""
+Workspace module index: maps Verilog module names to the files that define
+them and records which modules each one instantiates. From a chosen top it
+yields the transitive set of files to hand to iverilog/yosys/verilator.
+Files are re-parsed only when their mtime or size changes.
+"""
+
+import os
+import re
+from collections import deque
+from pathlib import Path
+
+VERILOG_EXTS = (".v", ".sv")
+
+SKIP_DIRS = {"node_modules", "obj_dir", "mavenik_workspace", "__pycache__", "venv"}
+
+# Regex fallback when tree-sitter is unavailable
+MODULE_RE = re.compile(r"^\s*(?:macro)?module\s+(\w+)(.*?)^\s*endmodule", re.M | re.S)
+INSTANCE_RE = re.compile(
+    r"^\s*(\w+)(?:\s*#\s*\([^;]*?\))?\s+\w+\s*(?:\[[^\]]*\]\s*)?\(", re.M
+)
+# Without the declarations at hand, tree-sitter-verilog reads instances with
+# only a name and ports ("full_adder uut (.*);") as checker instantiations
+INSTANCE_NODES = ("module_instantiation", "checker_instantiation")
+
+COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.S)
+KEYWORDS = {
+    "module", "if", "else", "for", "while", "case", "always", "assign", "begin",
+    "end", "function", "task", "initial", "input", "output", "inout", "wire",
+    "reg", "logic", "integer", "genvar", "generate", "repeat", "forever", "return",
+}  # fmt: skip
+
+
+def parse_modules_regex(text: str) -> dict:
+    """{module name: set of instantiated module names} using regexes"""
+    text = COMMENT_RE.sub("", text)
+    modules = {}
+    for match in MODULE_RE.finditer(text):
+        body = match.group(2)
+        modules[match.group(1)] = {
+            m.group(1)
+            for m in INSTANCE_RE.finditer(body)
+            if m.group(1) not in KEYWORDS and not m.group(1).startswith("$")
+        }
+    return modules
+
+
+def parse_modules_tree_sitter(parser, source: bytes) -> dict:
+    """{module name: set of instantiated module names} from a tree-sitter parse"""
+    modules = {}
+    tree = parser.parse(source)
+    stack = [(tree.root_node, None)]
+    while stack:
+        node, current = stack.pop()
+        if node.type == "module_declaration":
+            current = None
+            for child in node.children:
+                if child.type == "module_header":
+                    for part in child.children:
+                        if part.type == "simple_identifier":
+                            current = part.text.decode()
+                            modules[current] = set()
+                            break
+        elif node.type in INSTANCE_NODES and current is not None:
+            for child in node.children:
+                if child.type in ("simple_identifier", "checker_identifier"):
+                    modules[current].add(child.text.decode())
+                    break
+            continue
+        stack.extend((child, current) for child in reversed(node.children))
+    return modules
+
+
+def roots(modules: dict) -> list:
+    """Modules of a file that no other module in it instantiates (its tops)"""
+    inner = set().union(*modules.values()) if modules else set()
+    return [module for module in modules if module not in inner]
+
+
+class ModuleIndex:
+    """Incrementally maintained module -> file map for a workspace"""
+
+    def __init__(self, root, parser=None):
+        self.root = Path(root).resolve()
+        self.parser = parser
+        self.files = {}  # path -> (mtime, size, {module: instances})
+        self.modules = {}  # module -> [paths defining it], sorted
+
+    def parse(self, path: Path) -> dict:
+        source = path.read_bytes()
+        if self.parser is not None:
+            try:
+                return parse_modules_tree_sitter(self.parser, source)
+            except Exception:
+                pass
+        return parse_modules_regex(source.decode(errors="replace"))
+
+    def scan(self):
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [
+                d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")
+            ]
+            for name in filenames:
+                if name.endswith(VERILOG_EXTS) and not name.startswith("."):
+                    yield Path(dirpath) / name
+
+    def refresh(self) -> int:
+        """Re-parse new or modified files; returns the number re-parsed"""
+        seen = set()
+        changed = 0
+        for path in self.scan():
+            seen.add(path)
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            cached = self.files.get(path)
+            if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                continue
+            self.files[path] = (st.st_mtime_ns, st.st_size, self.parse(path))
+            changed += 1
+
+        removed = set(self.files) - seen
+        for path in removed:
+            del self.files[path]
+        if changed or removed:
+            self._rebuild()
+        return changed + len(removed)
+
+    def _rebuild(self) -> None:
+        self.modules = {}
+        for path in sorted(self.files):
+            for module in self.files[path][2]:
+                self.modules.setdefault(module, []).append(path)
+
+    def modules_in(self, path) -> list:
+        entry = self.files.get(Path(path).resolve())
+        return list(entry[2]) if entry else []
+
+    def top_of(self, path):
+        """The one module of a file that no other module in it instantiates,
+        or None if there are several (or none)"""
+        entry = self.files.get(Path(path).resolve())
+        tops = roots(entry[2]) if entry else []
+        return tops[0] if len(tops) == 1 else None
+
+    def lookup(self, module: str, prefer=(), near=None):
+        """(file defining module, other equally likely files)
+
+        The given files (e.g. open editors) come first; among several
+        definitions, a file named after the module wins, then one in the
+        directory `near` (the instantiating file's), then the first by path.
+        """
+        for path in prefer:
+            entry = self.files.get(Path(path).resolve())
+            if entry and module in entry[2]:
+                return Path(path).resolve(), []
+        paths = self.modules.get(module)
+        if not paths:
+            return None, []
+
+        def rank(path):
+            return path.stem != module, near is None or path.parent != near
+
+        best = min(paths, key=rank)
+        ties = [path for path in paths if path != best and rank(path) == rank(best)]
+        return best, ties
+
+    def closure(self, top, prefer=()):
+        """(files needed to build top, instantiated modules with no definition,
+        {module: files} of modules whose definition was picked among several
+        equally likely files); top may be a module name or a list of them"""
+        tops = [top] if isinstance(top, str) else list(top)
+        files, missing, ambiguous = [], set(), {}
+        seen = set(tops)
+        queue = deque((module, None) for module in tops)
+        while queue:
+            module, near = queue.popleft()
+            path, ties = self.lookup(module, prefer, near)
+            if path is None:
+                missing.add(module)
+                continue
+            if ties:
+                ambiguous[module] = [path, *ties]
+            if path not in files:
+                files.append(path)
+            for child in sorted(self.files[path][2].get(module, ())):
+                if child not in seen:
+                    seen.add(child)
+                    queue.append((child, path.parent))
+        return files, missing, ambiguous
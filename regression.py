@@ -0,0 +1,195 @@
+"""
+Parallel regression runner: finds every testbench in the workspace, pairs it
+with its design, and compiles + simulates each pair in its own directory on
+a process pool. Results can be written as a JUnit XML summary.
+"""
+
+import os
+import re
+import signal
+import subprocess
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+TB_PATTERNS = ["*_tb.v", "tb_*.v", "*_tb.sv", "tb_*.sv"]
+
+# Directories never scanned for testbenches
+SKIP_DIRS = {"node_modules", "obj_dir", "mavenik_workspace", "__pycache__", "venv"}
+
+# Simulator output that marks a failing testbench even with exit code 0
+FAIL_PATTERN = re.compile(r"\b(FAIL(ED|URE)?|ERROR)\b", re.IGNORECASE)
+
+CASE_TIMEOUT = 300
+
+# In a case's directory: process group of the tool running there. In the
+# output root: marks the run cancelled, so no tool keeps running
+PID_FILE = ".pgid"
+CANCEL_FILE = ".cancelled"
+
+
+class RegressionCase:
+    """One testbench plus the design files it is compiled with"""
+
+    def __init__(self, name, testbench, sources):
+        self.name = name
+        self.testbench = str(testbench)
+        self.sources = [str(s) for s in sources]
+
+
+def design_name(tb_path: Path) -> str:
+    """counter for tb_counter.v / counter_tb.v"""
+    stem = tb_path.stem
+    if stem.startswith("tb_"):
+        return stem[3:]
+    if stem.endswith("_tb"):
+        return stem[:-3]
+    return stem
+
+
+def find_design(tb_path: Path, root: Path):
+    """Look for <name>.v/.sv next to the testbench, then at the root"""
+    name = design_name(tb_path)
+    for folder in (tb_path.parent, root):
+        for ext in (".v", ".sv"):
+            candidate = folder / f"{name}{ext}"
+            if candidate.exists():
+                return candidate
+    return None
+
+
+def discover(root=".", index=None):
+    """All testbench/design pairs under root, sorted by name
+
+    With a ModuleIndex, each testbench is compiled with the transitive set
+    of files its top module needs (its design by file name first, where that
+    defines a needed module); otherwise it is paired with its design by file
+    name.
+    """
+    root = Path(root).resolve()
+    testbenches = set()
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames[:] = [
+            d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")
+        ]
+        for pattern in TB_PATTERNS:
+            testbenches.update(
+                tb for tb in Path(dirpath).glob(pattern) if not tb.name.startswith(".")
+            )
+
+    cases = []
+    for tb in sorted(testbenches):
+        tops = index.modules_in(tb) if index is not None else []
+        design = find_design(tb, root)
+        if tops:
+            prefer = [tb, design] if design else [tb]
+            sources, _, _ = index.closure(tops, prefer=prefer)
+        else:
+            sources = [design, tb] if design else [tb]
+        name = tb.relative_to(root).as_posix()
+        cases.append(RegressionCase(name, tb, sources))
+    return cases
+
+
+def _run(cmd, cwd, timeout):
+    """Run a tool in its own process group; kill the group on timeout
+
+    The group is recorded in cwd/PID_FILE while it runs, so that
+    kill_running can stop it from the parent process on cancel.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+        start_new_session=True,
+    )
+    pid_file = Path(cwd) / PID_FILE
+    try:
+        pid_file.write_text(str(proc.pid))
+        # Cancelled after kill_running looked for groups to kill
+        if (Path(cwd).parent / CANCEL_FILE).exists():
+            os.killpg(proc.pid, signal.SIGKILL)
+        out, _ = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        out, _ = proc.communicate()
+        return -1, out + f"\nTimeout ({timeout}s exceeded)"
+    finally:
+        pid_file.unlink(missing_ok=True)
+    return proc.returncode, out
+
+
+def run_case(case, out_root, iverilog="iverilog", vvp="vvp", timeout=CASE_TIMEOUT):
+    """Compile and simulate one case in out_root/<name>; returns a result dict"""
+    run_dir = Path(out_root) / case.name.replace("/", "__")
+    run_dir.mkdir(parents=True, exist_ok=True)
+    start = time.monotonic()
+    result = {"name": case.name, "testbench": case.testbench, "dir": str(run_dir)}
+
+    try:
+        code, log = _run(
+            [iverilog, "-g2012", "-o", "sim.vvp", *case.sources], run_dir, timeout
+        )
+        if code == 0:
+            code, sim_log = _run([vvp, "sim.vvp"], run_dir, timeout)
+            log += sim_log
+            failed = code != 0 or FAIL_PATTERN.search(sim_log)
+            result["status"] = "fail" if failed else "pass"
+        else:
+            result["status"] = "error"
+    except OSError as e:
+        log = str(e)
+        result["status"] = "error"
+
+    (run_dir / "run.log").write_text(log)
+    result["time"] = time.monotonic() - start
+    result["log"] = log[-4000:]
+    return result
+
+
+def kill_running(out_root) -> int:
+    """Kill the tools run_case is running in out_root (they are in their own
+    sessions, so stopping the pool leaves them running); returns how many"""
+    out_root = Path(out_root)
+    (out_root / CANCEL_FILE).touch()
+    killed = 0
+    for pid_file in out_root.glob(f"*/{PID_FILE}"):
+        try:
+            os.killpg(int(pid_file.read_text()), signal.SIGKILL)
+            killed += 1
+        except (OSError, ValueError):
+            pass  # finished meanwhile
+    return killed
+
+
+def make_pool(jobs=None) -> ProcessPoolExecutor:
+    """Process pool sized to the machine's cores"""
+    return ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1)
+
+
+def write_junit(results, path) -> Path:
+    """Write a JUnit-style XML summary of regression results"""
+    suite = ET.Element(
+        "testsuite",
+        name="regression",
+        tests=str(len(results)),
+        failures=str(sum(r["status"] == "fail" for r in results)),
+        errors=str(sum(r["status"] == "error" for r in results)),
+        time=f"{sum(r['time'] for r in results):.3f}",
+    )
+    for r in results:
+        case = ET.SubElement(
+            suite, "testcase", classname="tb", name=r["name"], time=f"{r['time']:.3f}"
+        )
+        if r["status"] == "fail":
+            ET.SubElement(case, "failure", message="simulation failed").text = r["log"]
+        elif r["status"] == "error":
+            ET.SubElement(case, "error", message="compile failed").text = r["log"]
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+    return path
@@ -0,0 +1,160 @@
+"""
+Isolated run directories. Each job works in a private staging directory
+and publishes it under a content-addressed name (<kind>-<key>) with one
+atomic rename, so concurrent jobs and TUI instances never share artifacts.
+A per-kind "latest-<kind>" symlink is swapped atomically on success and
+old runs are garbage-collected under a disk budget, sparing the latest run
+of each kind and the runs the owner says it is using.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from build_cache import hash_key
+from verilator_cache import dir_size
+
+# Total size of published runs before the oldest are deleted
+RUN_BUDGET = 1024**3
+
+# Staging directories older than this are leftovers of killed jobs
+STALE_STAGING = 24 * 3600
+
+# Seconds between the collections publish runs: sizing every run on each
+# publish (sync snapshots included) would cost a walk of the whole store
+GC_INTERVAL = 60
+
+LATEST = "latest-"
+
+
+class RunStore:
+    """Manages <root>/<kind>-<key>/ run directories"""
+
+    def __init__(self, root, budget: int = RUN_BUDGET, in_use=None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.budget = budget
+        self.in_use = in_use  # () -> run dirs gc must keep
+        self.collected = None  # monotonic time of the last gc
+
+    def path(self, kind: str, key: str) -> Path:
+        return self.root / f"{kind}-{key[:16]}"
+
+    def find(self, kind: str, key: str):
+        """Published run for key, or None; marks it recently used"""
+        run_dir = self.path(kind, key)
+        if not run_dir.is_dir():
+            return None
+        os.utime(run_dir)
+        return run_dir
+
+    def stage(self, kind: str) -> Path:
+        """Fresh private directory for one job"""
+        staging = Path(tempfile.mkdtemp(prefix=f".{kind}-", dir=self.root))
+        staging.chmod(0o755)  # mkdtemp is owner-only; runs are shared
+        return staging
+
+    def discard(self, staging: Path) -> None:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    @contextmanager
+    def staging(self, kind: str):
+        """Staging directory that is removed unless it was published"""
+        staging = self.stage(kind)
+        try:
+            yield staging
+        finally:
+            if staging.exists():
+                self.discard(staging)
+
+    def snapshot(self, kind: str, files: dict) -> Path:
+        """Immutable, content-addressed copy of {file name: text}"""
+        key = hash_key(*(f"{name}\0{files[name]}" for name in sorted(files)))
+        run_dir = self.find(kind, key)
+        if run_dir is None:
+            with self.staging(kind) as staging:
+                for name, text in files.items():
+                    (staging / name).write_text(text)
+                run_dir = self.publish(kind, key, staging)
+        return run_dir
+
+    def publish(self, kind: str, key: str, staging: Path, replace=False) -> Path:
+        """Move staging to <kind>-<key> and point latest-<kind> at it
+
+        If another job already published the same key its run is kept,
+        unless replace is set (e.g. a forced re-run).
+        """
+        run_dir = self.path(kind, key)
+        if replace and run_dir.exists():
+            old = self.root / f".old-{run_dir.name}-{os.getpid()}"
+            try:
+                os.rename(run_dir, old)
+            except OSError:
+                pass
+            else:
+                shutil.rmtree(old, ignore_errors=True)
+        try:
+            os.rename(staging, run_dir)
+        except OSError:
+            if not run_dir.is_dir():
+                raise  # a real failure (no space, permissions...)
+            # Same inputs were published concurrently; their results stand
+            self.discard(staging)
+        os.utime(run_dir)
+        self.set_latest(kind, run_dir)
+        now = time.monotonic()
+        if self.collected is None or now - self.collected >= GC_INTERVAL:
+            self.gc()
+        return run_dir
+
+    def set_latest(self, kind: str, run_dir: Path) -> None:
+        link = self.root / f"{LATEST}{kind}"
+        tmp = self.root / f".{LATEST}{kind}.{os.getpid()}"
+        tmp.unlink(missing_ok=True)
+        os.symlink(run_dir.name, tmp)
+        os.replace(tmp, link)
+
+    def latest(self, kind: str):
+        """Most recently published run of kind, or None"""
+        link = self.root / f"{LATEST}{kind}"
+        if not link.is_symlink():
+            return None
+        run_dir = link.resolve()
+        return run_dir if run_dir.is_dir() else None
+
+    def gc(self) -> list:
+        """Delete the least recently used runs until under budget"""
+        self.collected = time.monotonic()
+        pinned = {
+            link.resolve() for link in self.root.glob(f"{LATEST}*") if link.is_symlink()
+        }
+        if self.in_use is not None:
+            pinned.update(
+                Path(run_dir).resolve() for run_dir in self.in_use() if run_dir
+            )
+        now = time.time()
+        runs = []
+        for run_dir in self.root.iterdir():
+            if run_dir.is_symlink() or not run_dir.is_dir():
+                continue
+            mtime = run_dir.stat().st_mtime
+            if run_dir.name.startswith("."):
+                if now - mtime > STALE_STAGING:
+                    shutil.rmtree(run_dir, ignore_errors=True)
+                continue
+            runs.append((mtime, run_dir, dir_size(run_dir)))
+
+        total = sum(size for _, _, size in runs)
+        removed = []
+        for _, run_dir, size in sorted(runs, key=lambda r: r[0]):
+            if total <= self.budget:
+                break
+            if run_dir.resolve() in pinned:
+                continue
+            shutil.rmtree(run_dir, ignore_errors=True)
+            total -= size
+            removed.append(run_dir.name)
+        return removed
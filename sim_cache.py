@@ -0,0 +1,60 @@
+"""
+Simulation result cache. A sim run directory is keyed on the hash of the
+compiled image, the runtime arguments (plusargs) and the simulator version,
+and keeps the captured output, exit status and timing next to the dump.vcd
+it produced, so an identical simulation is replayed instead of re-run.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from build_cache import hash_key
+from tool_runner import ToolResult
+
+RESULT = "result.json"
+# Full simulator output, next to the result (the console may show less)
+LOG = "sim.log"
+
+
+def file_digest(path) -> str:
+    """sha256 of a file's bytes, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sim_key(image, args, version: str) -> str:
+    return hash_key(file_digest(image), version, *args)
+
+
+def save_result(run_dir, result: ToolResult) -> None:
+    """Record a finished simulation in its run directory"""
+    data = {
+        "cmd": result.cmd,
+        "returncode": result.returncode,
+        "stdout": result.stdout,
+        "stderr": result.stderr,
+        "elapsed": result.elapsed,
+        "truncated": result.truncated,
+    }
+    (Path(run_dir) / RESULT).write_text(json.dumps(data))
+
+
+def load_result(run_dir):
+    """The recorded ToolResult of a cached simulation, or None"""
+    try:
+        data = json.loads((Path(run_dir) / RESULT).read_text())
+    except (OSError, ValueError):
+        return None
+    return ToolResult(
+        data["cmd"],
+        data["returncode"],
+        data["stdout"],
+        data["stderr"],
+        data["elapsed"],
+        data["truncated"],
+        cancelled=False,
+    )
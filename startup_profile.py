@@ -0,0 +1,130 @@
+"""
+Startup profiler for the TUI entry points, enabled with --profile-startup.
+Records how long each module imported directly by the app takes, named
+phases (compose, on_mount work, deferred loading, directory scan) and
+milestones such as first paint and editors ready, all relative to the
+moment the profiler was created. The breakdown is printed and dumped as
+JSON once the app exits.
+"""
+
+import builtins
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+FLAG = "--profile-startup"
+REPORT_PATH = "startup_profile.json"
+
+
+class StartupProfile:
+    """Collects startup timings; every method is a cheap no-op when disabled"""
+
+    def __init__(self, enabled: bool, owner: str = "__main__"):
+        self.enabled = enabled
+        self.owner = owner
+        self.t0 = time.monotonic()
+        self.imports = {}  # module -> seconds
+        self.phases = {}  # name -> seconds
+        self.marks = {}  # name -> seconds since t0
+        self.running = {}
+        self.finished = False
+        self._import = None
+        if enabled:
+            self.hook_imports()
+
+    @classmethod
+    def from_argv(cls, owner: str):
+        """Enabled iff --profile-startup is on the command line (and removed)"""
+        enabled = FLAG in sys.argv
+        if enabled:
+            sys.argv.remove(FLAG)
+        return cls(enabled, owner)
+
+    # --- IMPORTS ---
+    def hook_imports(self) -> None:
+        """Time first-time imports made directly by the owner module"""
+        original = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            direct = (
+                globals is not None
+                and globals.get("__name__") == self.owner
+                and level == 0
+                and name not in sys.modules
+            )
+            if not direct:
+                return original(name, globals, locals, fromlist, level)
+            start = time.monotonic()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                self.imports[name] = time.monotonic() - start
+
+        self._import = original
+        builtins.__import__ = timed_import
+
+    def unhook_imports(self) -> None:
+        if self._import is not None:
+            builtins.__import__ = self._import
+            self._import = None
+
+    # --- PHASES AND MARKS ---
+    @contextmanager
+    def phase(self, name: str):
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name)
+
+    def start(self, name: str) -> None:
+        if self.enabled and not self.finished:
+            self.running[name] = time.monotonic()
+
+    def stop(self, name: str) -> None:
+        started = self.running.pop(name, None)
+        if started is not None:
+            self.phases[name] = self.phases.get(name, 0.0) + time.monotonic() - started
+
+    def mark(self, name: str) -> None:
+        if self.enabled and not self.finished and name not in self.marks:
+            self.marks[name] = time.monotonic() - self.t0
+
+    def timed_paths(self, name: str, paths) -> list:
+        """Materialize a directory listing, timing it as phase name"""
+        with self.phase(name):
+            return list(paths)
+
+    # --- REPORT ---
+    def finish(self) -> None:
+        self.unhook_imports()
+        self.finished = True
+
+    def report(self) -> dict:
+        return {
+            "imports": dict(sorted(self.imports.items(), key=lambda kv: -kv[1])),
+            "imports_total": sum(self.imports.values()),
+            "phases": self.phases,
+            "marks": dict(sorted(self.marks.items(), key=lambda kv: kv[1])),
+        }
+
+    def dump(self, path=REPORT_PATH) -> None:
+        """Print the breakdown and write it as JSON (only when enabled)"""
+        if not self.enabled:
+            return
+        self.finish()
+        data = self.report()
+        print("\n⏱ STARTUP PROFILE")
+        print(f"  imports ({data['imports_total'] * 1000:.1f} ms total)")
+        for name, seconds in data["imports"].items():
+            print(f"    {name:<28} {seconds * 1000:8.1f} ms")
+        print("  phases")
+        for name, seconds in data["phases"].items():
+            print(f"    {name:<28} {seconds * 1000:8.1f} ms")
+        print("  milestones (since start)")
+        for name, seconds in data["marks"].items():
+            print(f"    {name:<28} {seconds * 1000:8.1f} ms")
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+        print(f"  written to {path}")
@@ -0,0 +1,79 @@
+"""
+Single-pass synthesis pipeline. One Yosys run writes every artifact the
+F7/F9 views need: the RTL schematic (dot), machine-readable stats, a JSON
+netlist and the synthesized Verilog. Artifacts are stamped with the source
+hash so views can tell whether they are still current.
+"""
+
+import json
+from pathlib import Path
+
+from build_cache import hash_key
+
+STAMP = ".sources"
+
+
+class SynthArtifacts:
+    """Paths of the artifacts produced by one pipeline run"""
+
+    def __init__(self, out_dir):
+        self.out_dir = Path(out_dir)
+        self.stats = self.out_dir / "stat.json"
+        self.netlist = self.out_dir / "netlist.json"
+        self.verilog = self.out_dir / "synth_out.v"
+        self.dot = self.out_dir / "schematic.dot"
+        self.png = self.out_dir / "schematic.png"
+        self.stamp = self.out_dir / STAMP
+
+    def commands(self) -> list:
+        """Yosys commands run on the parsed design (after hierarchy)"""
+        return [
+            "proc; opt",
+            f"show -format dot -prefix {self.out_dir / 'schematic'}",
+            "fsm; opt; memory; opt",
+            "techmap; opt",
+            f"tee -q -o {self.stats} stat -json",
+            f"write_json {self.netlist}",
+            f"write_verilog -noattr {self.verilog}",
+        ]
+
+    @staticmethod
+    def sources_key(sources, top=None, version: str = "") -> str:
+        texts = (f"{s}\0{Path(s).read_text()}" for s in sources)
+        return hash_key(top or "", version, *texts)
+
+    def is_fresh(self, key: str) -> bool:
+        return (
+            self.stamp.exists()
+            and self.stamp.read_text() == key
+            and self.stats.exists()
+            and self.dot.exists()
+        )
+
+    def mark(self, key: str) -> None:
+        self.stamp.write_text(key)
+
+    def invalidate(self) -> None:
+        self.stamp.unlink(missing_ok=True)
+
+    def png_stale(self) -> bool:
+        return (
+            not self.png.exists() or self.png.stat().st_mtime < self.dot.stat().st_mtime
+        )
+
+
+def summarize_stats(stats_path) -> dict:
+    """Totals from `stat -json`: cells, wires, wire bits and cells by type"""
+    data = json.loads(Path(stats_path).read_text())
+    design = data.get("design")
+    if design is None:
+        # Single module designs may only report per-module stats
+        modules = list(data.get("modules", {}).values())
+        design = modules[0] if modules else {}
+    return {
+        "cells": design.get("num_cells", 0),
+        "wires": design.get("num_wires", 0),
+        "wire_bits": design.get("num_wire_bits", 0),
+        "area": design.get("area"),
+        "cell_types": design.get("num_cells_by_type", design.get("cells", {})),
+    }
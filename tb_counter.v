@@ -20,14 +20,7 @@ module counter_tb;
     always #5 clk = ~clk;
 
     initial begin
-        // --- Tabular Header ---
-        $display("\n-------------------------------------------");
-        $display(" TIME | RESET | LOAD | LOAD_DATA | COUNT ");
-        $display("-------------------------------------------");
-        
-        // --- Monitor Signal Changes ---
-        $monitor("%5t |   %b   |  %b   |    %h     |   %h", 
-                 $time, reset, load, load_data, count);
+        // Signal table: Shift+F8 (sampled from dump.vcd at clock edges)
 
         // Initialize signals
         clk = 0; reset = 1; load = 0; load_data = 0;
@@ -43,7 +36,6 @@ module counter_tb;
         load = 0;            // Resume counting
         
         #40;
-        $display("-------------------------------------------");
         $display("Counter Simulation Finished");
         $finish;
     end
@@ -0,0 +1,109 @@
+"""ModuleIndex on the testbenches shipped at the top of the repository"""
+
+from pathlib import Path
+
+import pytest
+
+import regression
+from module_index import ModuleIndex
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# testbench -> (top module, file its design must come from)
+TESTBENCHES = {
+    "my_design_tb.v": ("full_adder_tb", "full_adder.v"),
+    "full_adder_tb.sv": ("full_adder_tb", "full_adder.v"),
+    "full_adder_tb.v": ("full_adder_tb", "full_adder.v"),
+    "traffic_tb.sv": ("traffic_tb", "traffic_fsm.sv"),
+    "tb_counter.sv": ("full_adder_tb", "full_adder.v"),
+    "tb_active.v": ("full_adder_tb", "full_adder.v"),
+    "work_tb.v": ("full_adder_tb", "full_adder.v"),
+}
+
+# A top instantiating an adder defined elsewhere
+TOP = "module top;\n    adder u (.*);\nendmodule\n"
+
+
+def tree_sitter_parser():
+    tree_sitter = pytest.importorskip("tree_sitter")
+    tree_sitter_verilog = pytest.importorskip("tree_sitter_verilog")
+    return tree_sitter.Parser(tree_sitter.Language(tree_sitter_verilog.language()))
+
+
+@pytest.fixture(scope="module", params=["regex", "tree-sitter"])
+def index(request):
+    parser = tree_sitter_parser() if request.param == "tree-sitter" else None
+    index = ModuleIndex(ROOT, parser=parser)
+    index.refresh()
+    return index
+
+
+@pytest.mark.parametrize("testbench", sorted(TESTBENCHES))
+def test_testbench_closure(index, testbench):
+    top, design = TESTBENCHES[testbench]
+    path = ROOT / testbench
+    assert index.modules_in(path) == [top]
+    files, missing, _ = index.closure(top, prefer=[path])
+    assert files == [path, ROOT / design]
+    assert not missing
+
+
+def test_file_named_after_module_wins(index):
+    path, ties = index.lookup("full_adder")
+    assert path == ROOT / "full_adder.v"
+    assert ties == []
+
+
+def test_regression_pairs_design_by_name(index):
+    cases = {case.name: case for case in regression.discover(ROOT, index)}
+    for testbench, design in (
+        ("full_adder_tb.sv", "full_adder.v"),
+        ("my_design_tb.v", "my_design.v"),
+    ):
+        sources = [str(ROOT / testbench), str(ROOT / design)]
+        assert cases[testbench].sources == sources
+
+
+def test_definition_near_instance_wins(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    adder = "module adder;\nendmodule\n"
+    (tmp_path / "a" / "lib.v").write_text(adder)
+    (tmp_path / "b" / "lib.v").write_text(adder)
+    (tmp_path / "b" / "top.v").write_text(TOP)
+    index = ModuleIndex(tmp_path)
+    index.refresh()
+    files, _, ambiguous = index.closure("top")
+    assert files == [tmp_path / "b" / "top.v", tmp_path / "b" / "lib.v"]
+    assert ambiguous == {}
+
+
+def test_ambiguous_definition_is_reported(tmp_path):
+    adder = "module adder;\nendmodule\n"
+    (tmp_path / "one.v").write_text(adder)
+    (tmp_path / "two.v").write_text(adder)
+    (tmp_path / "top.v").write_text(TOP)
+    index = ModuleIndex(tmp_path)
+    index.refresh()
+    files, _, ambiguous = index.closure("top")
+    assert files == [tmp_path / "top.v", tmp_path / "one.v"]
+    assert ambiguous == {"adder": [tmp_path / "one.v", tmp_path / "two.v"]}
+
+
+@pytest.mark.parametrize("parser", ["regex", "tree-sitter"])
+def test_top_is_the_module_nothing_instantiates(tmp_path, parser):
+    # Leaf first, as files defining their own submodules usually are
+    (tmp_path / "full.v").write_text(
+        "module half;\nendmodule\n"
+        "module full;\n    half h1 (.*);\n    half h2 (.*);\n    adder u (.*);\n"
+        "endmodule\n"
+    )
+    (tmp_path / "adder.v").write_text("module adder;\nendmodule\n")
+    (tmp_path / "pair.v").write_text("module a;\nendmodule\nmodule b;\nendmodule\n")
+    index = ModuleIndex(tmp_path, tree_sitter_parser() if parser != "regex" else None)
+    index.refresh()
+    assert index.modules_in(tmp_path / "full.v") == ["half", "full"]
+    assert index.top_of(tmp_path / "full.v") == "full"
+    files, _, _ = index.closure(index.modules_in(tmp_path / "full.v"))
+    assert files == [tmp_path / "full.v", tmp_path / "adder.v"]
+    assert index.top_of(tmp_path / "pair.v") is None
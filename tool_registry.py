@@ -0,0 +1,116 @@
+"""
+Tool registry: resolves each EDA tool from its configured path or $PATH and
+probes its version once. Probe results are cached on disk per executable
+and reused until the executable's mtime changes, so a restart only
+re-probes tools that were upgraded.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+
+# Arguments that make each tool print its version banner and exit
+VERSION_ARGS = {
+    "iverilog": ["-V"],
+    "vvp": ["-V"],
+    "verilator": ["--version"],
+    "yosys": ["-V"],
+    "gtkwave": ["--version"],
+    "surfer": ["--version"],
+    "dot": ["-V"],
+}
+
+PROBE_TIMEOUT = 10
+
+CACHE_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "mavenik"
+    / "tools.json"
+)
+
+
+class ToolRegistry:
+    """Resolved paths and versions for a set of tools; thread-safe"""
+
+    def __init__(self, configured: dict, cache_path=CACHE_PATH):
+        self.configured = dict(configured)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.paths = {}
+        self.versions = {}
+        self.lock = threading.Lock()
+        self.cache = self._load_cache()
+
+    def _load_cache(self) -> dict:
+        if self.cache_path is None:
+            return {}
+        try:
+            return json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}")
+            tmp.write_text(json.dumps(self.cache, indent=1))
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            pass
+
+    def resolve(self, name: str):
+        """Absolute path of the tool (configured path first, then $PATH) or None"""
+        if name not in self.paths:
+            configured = self.configured.get(name)
+            if configured and os.access(configured, os.X_OK):
+                self.paths[name] = str(configured)
+            else:
+                self.paths[name] = shutil.which(name)
+        return self.paths[name]
+
+    def path(self, name: str) -> str:
+        """Path to run the tool with; the bare name if it was not found"""
+        return self.resolve(name) or self.configured.get(name) or name
+
+    def version(self, name: str) -> str:
+        """First line of the tool's version banner ("missing" if not found)"""
+        with self.lock:
+            if name in self.versions:
+                return self.versions[name]
+            path = self.resolve(name)
+            if path is None:
+                version = "missing"
+            else:
+                mtime = os.stat(path).st_mtime_ns
+                entry = self.cache.get(path)
+                if entry and entry["mtime_ns"] == mtime:
+                    version = entry["version"]
+                else:
+                    version = self._probe(name, path)
+                    self.cache[path] = {"mtime_ns": mtime, "version": version}
+                    self._save_cache()
+            self.versions[name] = version
+            return version
+
+    def _probe(self, name: str, path: str) -> str:
+        try:
+            proc = subprocess.run(
+                [path, *VERSION_ARGS.get(name, ["--version"])],
+                capture_output=True,
+                text=True,
+                errors="replace",
+                timeout=PROBE_TIMEOUT,
+                stdin=subprocess.DEVNULL,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return "unknown"
+        banner = (proc.stdout or proc.stderr).strip().splitlines()
+        return banner[0].strip() if banner else "unknown"
+
+    def probe_all(self) -> dict:
+        """Version of every configured tool (blocking; run in a worker thread)"""
+        return {name: self.version(name) for name in self.configured}
@@ -0,0 +1,230 @@
+"""
+Async streaming runner for EDA tools (iverilog, vvp, yosys, verilator).
+Streams stdout/stderr without blocking the Textual event loop. Output is
+read in chunks of up to 64 KiB and split into lines, so a tool printing
+millions of lines wakes the loop once per chunk rather than once per
+line, and can be copied verbatim to a log file.
+"""
+
+import asyncio
+import os
+import signal
+import time
+
+from tracing import TRACER
+
+# Captured output beyond this many bytes per stream is dropped (still streamed)
+MAX_CAPTURE_BYTES = 4 * 1024 * 1024
+# Longest single line; longer output is split
+LINE_LIMIT = 1024 * 1024
+# Bytes read from a pipe at a time
+CHUNK_SIZE = 64 * 1024
+
+
+class ToolResult:
+    """Outcome of a single tool invocation"""
+
+    def __init__(self, cmd, returncode, stdout, stderr, elapsed, truncated, cancelled):
+        self.cmd = cmd
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.elapsed = elapsed
+        self.truncated = truncated
+        self.cancelled = cancelled
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.cancelled
+
+    def summary(self) -> str:
+        if self.cancelled:
+            status = "cancelled"
+        elif self.returncode is None or self.returncode < 0:
+            status = f"killed ({self.returncode})"
+        else:
+            status = f"exit {self.returncode}"
+        note = " [output truncated]" if self.truncated else ""
+        return f"{status} in {self.elapsed:.2f}s{note}"
+
+
+class _Capture:
+    """Bounded line capture for one stream"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.size = 0
+        self.lines = []
+        self.dropped = 0
+
+    def add(self, line: str) -> None:
+        if self.size + len(line) > self.limit:
+            self.dropped += 1
+            return
+        self.size += len(line)
+        self.lines.append(line)
+
+    def extend(self, lines) -> None:
+        size = sum(map(len, lines))
+        if self.size + size <= self.limit:
+            self.size += size
+            self.lines.extend(lines)
+        else:
+            for line in lines:
+                self.add(line)
+
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+class ToolRunner:
+    """Runs one shell command at a time and streams its output"""
+
+    def __init__(self, max_capture_bytes: int = MAX_CAPTURE_BYTES):
+        self.max_capture_bytes = max_capture_bytes
+        self.proc = None
+        self._cancelled = False
+
+    @property
+    def running(self) -> bool:
+        return self.proc is not None and self.proc.returncode is None
+
+    async def run(
+        self,
+        cmd: str,
+        cwd=None,
+        on_line=None,
+        timeout=None,
+        log_file=None,
+        on_lines=None,
+    ) -> ToolResult:
+        """Run cmd through the shell, calling on_line(stream, line) per line
+
+        on_lines(stream, lines) instead gets each chunk's lines in one call,
+        which keeps per-line overhead out of floods of output. With
+        log_file, everything the tool prints is also written there, uncapped
+        and in arrival order.
+        """
+        self._cancelled = False
+        out = _Capture(self.max_capture_bytes)
+        err = _Capture(self.max_capture_bytes)
+        start = time.monotonic()
+        tool = os.path.basename(cmd.split()[0]) if cmd.strip() else "sh"
+        spawned = time.perf_counter()
+
+        log = None
+        try:
+            if log_file:
+                log = open(log_file, "wb")
+            self.proc = await asyncio.create_subprocess_shell(
+                cmd,
+                cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True,
+            )
+        except OSError as e:
+            if log:
+                log.close()
+            return ToolResult(cmd, -1, "", str(e), 0.0, False, False)
+        running = time.perf_counter()
+        TRACER.record(f"spawn {tool}", "process", spawned, running - spawned)
+
+        # Time spent in on_line (console updates), reported as one span
+        ui = {"time": 0.0, "lines": 0}
+
+        def emit(data, capture, stream):
+            text = data.decode(errors="replace")
+            if "\r" in text:
+                text = text.replace("\r\n", "\n")
+            lines = text.split("\n")
+            capture.extend(lines)
+            if on_line or on_lines:
+                t = time.perf_counter()
+                if on_lines:
+                    on_lines(stream, lines)
+                if on_line:
+                    for line in lines:
+                        on_line(stream, line)
+                ui["time"] += time.perf_counter() - t
+                ui["lines"] += len(lines)
+
+        async def pump(reader, capture, stream):
+            partial = b""
+            while True:
+                chunk = await reader.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if log:
+                    log.write(chunk)
+                data = partial + chunk
+                cut = data.rfind(b"\n")
+                if cut < 0 and len(data) <= LINE_LIMIT:
+                    partial = data
+                    continue
+                if cut < 0:
+                    cut = len(data)
+                # Decode whole lines only, so no character is split
+                partial = data[cut + 1 :]
+                emit(data[:cut], capture, stream)
+            if partial:
+                emit(partial, capture, stream)
+
+        pumps = asyncio.gather(
+            pump(self.proc.stdout, out, "stdout"),
+            pump(self.proc.stderr, err, "stderr"),
+        )
+        try:
+            await asyncio.wait_for(asyncio.shield(pumps), timeout)
+            await self.proc.wait()
+        except asyncio.TimeoutError:
+            self._kill()
+            await self.proc.wait()
+            err.add(f"Command timeout ({timeout}s exceeded)")
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+        finally:
+            if self.proc.returncode is None:
+                self._kill()
+            await asyncio.gather(pumps, return_exceptions=True)
+            if log:
+                log.close()
+            TRACER.record(
+                f"run {tool}",
+                "tool",
+                running,
+                time.perf_counter() - running,
+                returncode=self.proc.returncode,
+            )
+            if ui["lines"]:
+                TRACER.record(
+                    f"output {tool}", "ui", running, ui["time"], lines=ui["lines"]
+                )
+
+        return ToolResult(
+            cmd,
+            self.proc.returncode,
+            out.text(),
+            err.text(),
+            time.monotonic() - start,
+            bool(out.dropped or err.dropped),
+            self._cancelled,
+        )
+
+    def cancel(self) -> bool:
+        """Kill the running command and everything it spawned"""
+        if not self.running:
+            return False
+        self._cancelled = True
+        self._kill()
+        return True
+
+    def _kill(self) -> None:
+        try:
+            os.killpg(self.proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            try:
+                self.proc.kill()
+            except ProcessLookupError:
+                pass
@@ -0,0 +1,114 @@
+"""
+Lightweight, always-on tracing. Spans (name, category, start, duration,
+track, args) are appended to a fixed-size ring buffer and can be exported
+as Chrome / Perfetto trace-event JSON (load in chrome://tracing or
+ui.perfetto.dev). Spans recorded inside a job land on that job's track,
+so concurrent jobs show up as separate rows.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Spans kept in memory; older ones are dropped
+RING_SIZE = 4096
+
+# Track (trace row) of the code currently running; set per job
+current_track = ContextVar("current_track", default=None)
+
+
+class Span:
+    __slots__ = ("name", "cat", "start", "dur", "track", "args")
+
+    def __init__(self, name, cat, start, dur, track, args):
+        self.name = name
+        self.cat = cat
+        self.start = start
+        self.dur = dur
+        self.track = track
+        self.args = args
+
+
+class Tracer:
+    """Ring buffer of finished spans; safe to use from threads and tasks"""
+
+    def __init__(self, size: int = RING_SIZE):
+        self.spans = deque(maxlen=size)
+        self.t0 = time.perf_counter()
+
+    def _track(self) -> str:
+        return current_track.get() or threading.current_thread().name
+
+    def record(self, name: str, cat: str, start: float, dur: float, **args) -> None:
+        self.spans.append(Span(name, cat, start, dur, self._track(), args))
+
+    @contextmanager
+    def span(self, name: str, cat: str = "app", **args):
+        """Time the block; yields the args dict so callers can add results"""
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.record(name, cat, start, time.perf_counter() - start, **args)
+
+    @contextmanager
+    def track(self, name: str):
+        """Put spans recorded inside the block on their own trace row"""
+        token = current_track.set(name)
+        try:
+            yield
+        finally:
+            current_track.reset(token)
+
+    def recent(self, limit: int = None) -> list:
+        """Newest spans first"""
+        spans = list(self.spans)
+        spans.reverse()
+        return spans[:limit] if limit else spans
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+    def chrome_trace(self) -> dict:
+        """Trace-event JSON ("X" complete events, microseconds)"""
+        pid = os.getpid()
+        tids = {}
+        events = []
+        for span in list(self.spans):
+            tid = tids.setdefault(span.track, len(tids) + 1)
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.cat,
+                    "ph": "X",
+                    "ts": round((span.start - self.t0) * 1e6, 1),
+                    "dur": round(span.dur * 1e6, 1),
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {k: str(v) for k, v in span.args.items()},
+                }
+            )
+        for track, tid in tids.items():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": track},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path) -> str:
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+        return str(path)
+
+
+# Process-wide tracer used by the apps and helpers
+TRACER = Tracer()
@@ -1,17 +1,20 @@
 import subprocess
-import shutil
 from pathlib import Path
 
+from tool_registry import ToolRegistry
+
+TOOLS = ['iverilog', 'verilator', 'yosys', 'gtkwave', 'surfer']
+
 class EDAProcessor:
     def __init__(self, workspace="workspace"):
         self.workspace = Path(workspace)
         self.workspace.mkdir(exist_ok=True)
+        self.tools = ToolRegistry({tool: None for tool in TOOLS})
     
     def check_tools(self):
-        tools = ['iverilog', 'verilator', 'yosys', 'gtkwave', 'surfer']
         available = {}
-        for tool in tools:
-            if shutil.which(tool):
+        for tool in TOOLS:
+            if self.tools.resolve(tool):
                 available[tool] = True
         return available
     
@@ -0,0 +1,241 @@
+"""
+Checkpoint index for VCD dumps, kept next to the dump (dump.vcd.idx) and
+reused until the dump's size or mtime changes. Every CHECKPOINT_BYTES of
+value changes it records the byte offset, the simulation time and the
+value of every signal there, so the value of a signal at any time is a
+binary search over checkpoints plus a scan of at most one stride of the
+file, instead of a read from the start.
+
+Building and single-signal lookups work on whole chunks with bytes-level
+passes, which expects one value change per line as every common
+simulator writes; VcdReader.changes makes no such assumption.
+"""
+
+import json
+import os
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from vcd_reader import SCALAR, VECTOR, VcdReader, skip_comment
+
+# Bytes of value changes between checkpoints (the most a lookup scans)
+CHECKPOINT_BYTES = 1024**2
+
+INDEX_SUFFIX = ".idx"
+FORMAT = 1
+
+# Rewrites that turn a chunk of value change lines into "value code" pairs
+RARE_SCALAR_RE = re.compile(rb"\n([xzXZuUwWlLhH-])")
+DIRECTIVE_RE = re.compile(rb"\n[#$][^\n]*")  # time and directive lines
+COMMENT_RE = re.compile(rb"\$comment.*?\$end", re.S)
+TIME_RE = re.compile(rb"#(\d+)")
+
+# Value of a signal before its first change
+UNKNOWN = b"x"
+
+
+def index_path(vcd_path) -> Path:
+    vcd_path = Path(vcd_path)
+    return vcd_path.with_name(vcd_path.name + INDEX_SUFFIX)
+
+
+def last_time(chunk: bytes, default: int) -> int:
+    """Time of the last #<time> line in chunk, or default"""
+    pos = chunk.rfind(b"\n#")
+    if pos < 0:
+        if not chunk.startswith(b"#"):
+            return default
+        pos = -1
+    return int(TIME_RE.match(chunk, pos + 1)[1])
+
+
+def chunk_changes(chunk: bytes):
+    """(code, value) pairs of the changes in a chunk of whole lines, in order
+
+    The chunk is rewritten to "value code" tokens with a few bytes-level
+    passes and paired up in C; should the tokens not pair up (several
+    changes on one line, a $comment cut by the chunk), it is tokenized the
+    way VcdReader.changes does instead.
+    """
+    text = b"\n" + chunk
+    if b"$comment" in text:
+        text = COMMENT_RE.sub(b"", text)
+    text = text.replace(b"\n0", b"\n0 ").replace(b"\n1", b"\n1 ")
+    text = RARE_SCALAR_RE.sub(rb"\n\1 ", text)
+    for prefix in (b"\nb", b"\nr", b"\nB", b"\nR"):
+        if prefix in text:
+            text = text.replace(prefix, b"\n")
+    tokens = DIRECTIVE_RE.sub(b"", text).split()
+    if len(tokens) % 2 == 0:
+        return zip(tokens[1::2], tokens[::2])
+
+    pairs = []
+    tokens = iter(chunk.split())
+    for token in tokens:
+        if token[0] in SCALAR:
+            pairs.append((token[1:], token[:1]))
+        elif token[0] in VECTOR:
+            code = next(tokens, None)
+            if code is not None:
+                pairs.append((code, token[1:]))
+        elif token == b"$comment":
+            skip_comment(tokens)
+    return pairs
+
+
+class VcdIndex:
+    """Checkpoints of a VcdReader's dump: offsets, times and signal values"""
+
+    def __init__(self, reader: VcdReader, codes, times, offsets, snapshots):
+        self.reader = reader
+        self.codes = codes
+        self.times = times
+        self.offsets = offsets
+        self.snapshots = snapshots  # per checkpoint: values in codes order
+        self.columns = {code: i for i, code in enumerate(codes)}
+
+    @classmethod
+    def open(cls, reader: VcdReader, save: bool = True) -> "VcdIndex":
+        """The saved index of reader's dump if still valid, else a new one"""
+        return cls.load(reader) or cls.build(reader, save)
+
+    @classmethod
+    def build(cls, reader: VcdReader, save: bool = True) -> "VcdIndex":
+        """Read the whole dump once, checkpointing every CHECKPOINT_BYTES"""
+        codes = list(reader.header.codes)
+        state = dict.fromkeys(codes, UNKNOWN)
+        times, offsets, snapshots = array("Q"), array("Q"), []
+        offset = reader.header.data_start
+        time = 0
+        for chunk in reader.chunks(chunk_size=CHECKPOINT_BYTES):
+            times.append(time)
+            offsets.append(offset)
+            snapshots.append(b" ".join(state.values()))
+            state.update(chunk_changes(chunk))
+            if len(state) > len(codes):
+                # Undeclared codes (or a stray line in a $comment)
+                state = {code: state[code] for code in codes}
+            time = last_time(chunk, time)
+            offset += len(chunk)
+        index = cls(reader, codes, times, offsets, snapshots)
+        if save:
+            index.save()
+        return index
+
+    @classmethod
+    def load(cls, reader: VcdReader):
+        """The saved index, or None if missing or made for another dump"""
+        try:
+            with open(index_path(reader.path), "rb") as f:
+                meta = json.loads(f.readline())
+                if meta != {**meta, "format": FORMAT, **dump_stamp(reader)}:
+                    return None
+                count = meta["checkpoints"]
+                times, offsets = array("Q"), array("Q")
+                times.fromfile(f, count)
+                offsets.fromfile(f, count)
+                snapshots = f.read().split(b"\n")
+        except (OSError, ValueError, KeyError, EOFError):
+            return None
+        codes = [code.encode() for code in meta["codes"]]
+        if codes != list(reader.header.codes) or len(snapshots) != count:
+            return None
+        return cls(reader, codes, times, offsets, snapshots)
+
+    def save(self) -> None:
+        meta = {
+            "format": FORMAT,
+            **dump_stamp(self.reader),
+            "checkpoints": len(self.times),
+            "codes": [code.decode() for code in self.codes],
+        }
+        path = index_path(self.reader.path)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}")
+        try:
+            with open(tmp, "wb") as f:
+                f.write(json.dumps(meta).encode() + b"\n")
+                self.times.tofile(f)
+                self.offsets.tofile(f)
+                f.write(b"\n".join(self.snapshots))
+            os.replace(tmp, path)
+        except OSError:
+            # e.g. a read-only run directory; the index is rebuilt next time
+            tmp.unlink(missing_ok=True)
+
+    # --- LOOKUPS ---
+    def checkpoint(self, time: int) -> int:
+        """Last checkpoint at or before time"""
+        return max(0, bisect_right(self.times, time) - 1)
+
+    def segment(self, time: int) -> tuple:
+        """(checkpoint, start, end): the bytes holding the changes up to time
+        since that checkpoint"""
+        i = self.checkpoint(time)
+        start = self.offsets[i]
+        end = self.offsets[i + 1] if i + 1 < len(self.offsets) else self.reader.size
+        return i, start, self.time_offset(time, start, end)
+
+    def time_offset(self, time: int, start: int, end: int) -> int:
+        """Offset of the first #<t> line with t > time in start..end, or end
+
+        Times only grow through the dump, so this bisects byte offsets,
+        reading one time line per step.
+        """
+        data = self.reader.map
+        found = end
+        lo, hi = start - 1, end
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = data.find(b"\n#", mid, end)
+            if pos < 0 or pos >= hi:
+                hi = mid
+                continue
+            match = TIME_RE.match(data, pos + 1)
+            if match and int(match[1]) > time:
+                found, hi = pos + 1, mid
+            else:
+                lo = pos + 2
+        return found
+
+    def value_at(self, code: bytes, time: int) -> bytes:
+        """Value of one signal after every change up to and including time"""
+        i, start, end = self.segment(time)
+        data = self.reader.map
+        tail = code + b"\n"
+        # The code's last change in the segment, found from the end
+        pos = data.rfind(tail, start, end)
+        while pos >= 0:
+            line = data[max(start, data.rfind(b"\n", start, pos) + 1) : pos]
+            if len(line) == 1 and line[0] in SCALAR:
+                return line
+            if line[:1] and line[0] in VECTOR and line[-1:] in (b" ", b"\t"):
+                return line[1:].rstrip()
+            pos = data.rfind(tail, start, pos)
+        return self.snapshots[i].split(b" ")[self.columns[code]]
+
+    def values_at(self, time: int, codes=None) -> dict:
+        """{code: value} at time, for codes (default: every signal)"""
+        if codes is not None and len(codes) <= 16:
+            return {code: self.value_at(code, time) for code in codes}
+        i, start, end = self.segment(time)
+        state = dict(zip(self.codes, self.snapshots[i].split(b" ")))
+        state.update(chunk_changes(self.reader.map[start:end]))
+        if codes is not None:
+            return {code: state[code] for code in codes}
+        return {code: state[code] for code in self.codes}
+
+    def changes(self, codes=None, start: int = 0, end: int = None):
+        """VcdReader.changes from time start on, read from the checkpoint
+        before start instead of the top of the dump"""
+        # Strictly before: a checkpoint at start may follow some of its changes
+        i = max(0, bisect_left(self.times, start) - 1)
+        return self.reader.changes(
+            codes, start, end, offset=self.offsets[i], time=self.times[i]
+        )
+
+
+def dump_stamp(reader: VcdReader) -> dict:
+    stat = os.fstat(reader.file.fileno())
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
@@ -0,0 +1,273 @@
+"""
+Streaming VCD reader. The header is parsed into a scope tree of signals;
+value changes are then streamed from a memory map of the file one chunk
+at a time as plain (time, code, value) tuples of bytes, so memory stays
+flat however large the dump is and nothing is kept per change.
+"""
+
+import mmap
+import re
+from pathlib import Path
+
+# Bytes of value changes tokenized at a time
+CHUNK_SIZE = 1024**2
+
+# Time units as powers of ten of a second
+UNITS = {"s": 0, "ms": -3, "us": -6, "ns": -9, "ps": -12, "fs": -15}
+
+TIMESCALE_RE = re.compile(r"(\d+)\s*([a-z]+)")
+
+# First bytes of value tokens (ints, as indexing bytes gives)
+SCALAR = frozenset(b"01xzXZuUwWlLhH-")
+VECTOR = frozenset(b"bBrR")
+TIME, DIRECTIVE = ord("#"), ord("$")
+
+
+class VcdError(ValueError):
+    pass
+
+
+class Signal:
+    """One $var: identifier code (bytes, as in the value changes), name and width"""
+
+    __slots__ = ("code", "name", "width", "kind", "scope", "range")
+
+    def __init__(self, code: bytes, name: str, width: int, kind: str, scope):
+        self.code = code
+        self.name = name
+        self.width = width
+        self.kind = kind
+        self.scope = scope
+        self.range = ""
+
+    @property
+    def path(self) -> str:
+        return f"{self.scope.path}.{self.name}" if self.scope.path else self.name
+
+    def __repr__(self):
+        return f"Signal({self.path!r}, width={self.width})"
+
+
+class Scope:
+    """A $scope (module, task, begin...) with its signals and sub-scopes"""
+
+    __slots__ = ("name", "kind", "parent", "scopes", "signals")
+
+    def __init__(self, name: str, kind: str, parent=None):
+        self.name = name
+        self.kind = kind
+        self.parent = parent
+        self.scopes = {}
+        self.signals = []
+
+    @property
+    def path(self) -> str:
+        if self.parent is None:
+            return ""
+        return f"{self.parent.path}.{self.name}" if self.parent.path else self.name
+
+    def walk(self):
+        """Every signal in this scope and below, depth first"""
+        yield from self.signals
+        for scope in self.scopes.values():
+            yield from scope.walk()
+
+    def find(self, path: str):
+        """Signal or scope at a dotted path below this scope, or None"""
+        node = self
+        *scopes, last = path.split(".")
+        for name in scopes:
+            node = node.scopes.get(name)
+            if node is None:
+                return None
+        if last in node.scopes:
+            return node.scopes[last]
+        return next((s for s in node.signals if s.name == last), None)
+
+    def __repr__(self):
+        return f"Scope({self.path or '<root>'!r}, {len(self.signals)} signals)"
+
+
+class VcdHeader:
+    """Declarations up to $enddefinitions"""
+
+    def __init__(self):
+        self.date = ""
+        self.version = ""
+        self.timescale = "1s"
+        self.root = Scope("", "root")
+        self.codes = {}  # code -> [Signal] (several vars may share a code)
+        self.data_start = 0  # offset of the first byte after $enddefinitions $end
+
+    @property
+    def time_unit(self) -> float:
+        """Seconds per time step"""
+        return timescale_seconds(self.timescale)
+
+    @property
+    def signals(self) -> list:
+        return list(self.root.walk())
+
+
+def timescale_seconds(timescale: str) -> float:
+    """Seconds per time step of a $timescale ("10ps"); 1.0 if unreadable"""
+    match = TIMESCALE_RE.fullmatch(timescale)
+    if match is None or match[2] not in UNITS:
+        return 1.0
+    return int(match[1]) * 10.0 ** UNITS[match[2]]
+
+
+def parse_header(data) -> VcdHeader:
+    """Parse the declarations of a VCD held in a bytes-like object or mmap"""
+    end = data.find(b"$enddefinitions")
+    if end < 0:
+        raise VcdError("no $enddefinitions in VCD header")
+    close = data.find(b"$end", end + len(b"$enddefinitions"))
+    if close < 0:
+        raise VcdError("unterminated $enddefinitions")
+
+    header = VcdHeader()
+    header.data_start = close + len(b"$end")
+    tokens = data[:end].split()
+    scope = header.root
+    i = 0
+    while i < len(tokens):
+        keyword = tokens[i]
+        try:
+            stop = tokens.index(b"$end", i + 1)
+        except ValueError:
+            raise VcdError(f"unterminated {keyword.decode()}") from None
+        args = tokens[i + 1 : stop]
+        i = stop + 1
+        if keyword == b"$var" and len(args) >= 4:
+            kind, width, code, name = args[:4]
+            signal = Signal(code, name.decode(), int(width), kind.decode(), scope)
+            # A bit range ("[7:0]") may follow the name
+            signal.range = b"".join(args[4:]).decode()
+            scope.signals.append(signal)
+            header.codes.setdefault(code, []).append(signal)
+        elif keyword == b"$scope" and args:
+            kind, name = args[0].decode(), args[-1].decode()
+            scope = scope.scopes.setdefault(name, Scope(name, kind, scope))
+        elif keyword == b"$upscope":
+            scope = scope.parent or header.root
+        elif keyword == b"$timescale":
+            header.timescale = b"".join(args).decode()
+        elif keyword == b"$date":
+            header.date = b" ".join(args).decode()
+        elif keyword == b"$version":
+            header.version = b" ".join(args).decode()
+    return header
+
+
+class VcdReader:
+    """A VCD file, memory-mapped; the header is parsed on first use"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.file = open(self.path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise VcdError(f"{self.path} is empty") from None
+        self._header = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self.map.close()
+        self.file.close()
+
+    @property
+    def header(self) -> VcdHeader:
+        if self._header is None:
+            self._header = parse_header(self.map)
+        return self._header
+
+    @property
+    def size(self) -> int:
+        return len(self.map)
+
+    def refresh(self) -> bool:
+        """Map bytes appended since opening (a dump still being written);
+        True if the file grew"""
+        size = self.file.seek(0, 2)
+        if size <= len(self.map):
+            return False
+        # Chunks already taken are copies; the old map is freed with them
+        self.map = mmap.mmap(self.file.fileno(), size, access=mmap.ACCESS_READ)
+        return True
+
+    def chunks(self, start: int = None, end: int = None, chunk_size=CHUNK_SIZE):
+        """Whole-line pieces of the value change section, about chunk_size
+        bytes at a time"""
+        data = self.map
+        pos = self.header.data_start if start is None else start
+        end = len(data) if end is None else end
+        while pos < end:
+            stop = min(end, pos + chunk_size)
+            if stop < end:
+                cut = data.rfind(b"\n", pos, stop)
+                if cut < 0:
+                    # A single line longer than a chunk: take all of it
+                    cut = data.find(b"\n", stop, end)
+                stop = end if cut < 0 else cut + 1
+            yield data[pos:stop]
+            pos = stop
+
+    def changes(self, codes=None, start: int = 0, end: int = None, offset=None, time=0):
+        """Value changes as (time, code, value) tuples of int, bytes, bytes
+
+        codes limits the stream to some identifier codes; changes before
+        time `start` are skipped and the stream stops after time `end`.
+        Scalar values are one byte (b"1"), vectors the digits after the
+        b/r prefix (b"1010"). Directives ($dumpvars, $dumpoff...) are
+        skipped, so the initial values read as changes at their time.
+        Reading can resume at a line-start offset reached at `time` (see
+        vcd_index).
+        """
+        wanted = None if codes is None else set(codes)
+        scalar, vector = SCALAR, VECTOR
+        live = time >= start  # reached time `start`
+        comment = False  # inside a $comment split over two chunks
+        value = None  # vector value whose code is in the next chunk
+        for chunk in self.chunks(offset):
+            tokens = iter(chunk.split())
+            if comment:
+                comment = skip_comment(tokens)
+            if value is not None:
+                code = next(tokens)
+                if live and (wanted is None or code in wanted):
+                    yield time, code, value
+                value = None
+            for token in tokens:
+                head = token[0]
+                if head in scalar:
+                    if live and (wanted is None or token[1:] in wanted):
+                        yield time, token[1:], token[:1]
+                elif head == TIME:
+                    time = int(token[1:])
+                    if end is not None and time > end:
+                        return
+                    live = time >= start
+                elif head in vector:
+                    code = next(tokens, None)
+                    if code is None:
+                        value = token[1:]
+                    elif live and (wanted is None or code in wanted):
+                        yield time, code, token[1:]
+                elif token == b"$comment":
+                    comment = skip_comment(tokens)
+
+
+def skip_comment(tokens) -> bool:
+    """Consume tokens up to the $end of a comment; True if it did not end"""
+    for token in tokens:
+        if token == b"$end":
+            return False
+    return True
@@ -0,0 +1,104 @@
+"""
+Persistent Verilator build directories, one per top module and flag set.
+Sources are written in place only when they change so `make` rebuilds just
+the affected objects; an up-to-date model skips Verilator entirely.
+Least-recently-used builds are evicted to stay under a disk budget.
+"""
+
+import json
+import shutil
+import time
+from pathlib import Path
+
+from build_cache import hash_key, write_if_changed
+
+# Total size of all cached builds before LRU eviction kicks in
+DISK_BUDGET = 2 * 1024**3
+
+STAMP = ".sources"
+LAST_USED = ".last_used"
+
+
+def dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+class VerilatorCache:
+    """Manages <root>/<top>-<flags hash>/ build directories"""
+
+    def __init__(self, root, budget: int = DISK_BUDGET):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.budget = budget
+
+    def prepare(self, top: str, flags, sources: dict, version: str = ""):
+        """Write sources into the top's build dir; returns (build_dir, sources key)"""
+        names = sorted(sources)
+        build_dir = self.root / f"{top}-{hash_key(top, version, *flags, *names)[:12]}"
+        build_dir.mkdir(parents=True, exist_ok=True)
+        for name in names:
+            write_if_changed(build_dir / name, sources[name])
+        (build_dir / LAST_USED).write_text(str(time.time()))
+        key = hash_key(version, *flags, *(f"{n}\0{sources[n]}" for n in names))
+        return build_dir, key
+
+    def binary(self, build_dir: Path, top: str) -> Path:
+        return build_dir / "obj_dir" / f"V{top}"
+
+    def is_fresh(self, build_dir: Path, key: str, top: str) -> bool:
+        """True if the model in build_dir was built from exactly these sources"""
+        stamp = build_dir / STAMP
+        return (
+            stamp.exists()
+            and stamp.read_text() == key
+            and self.binary(build_dir, top).exists()
+        )
+
+    def mark_built(self, build_dir: Path, key: str) -> None:
+        (build_dir / STAMP).write_text(key)
+        self.evict(keep=build_dir)
+
+    def evict(self, keep=None) -> list:
+        """Delete least-recently-used builds until under budget"""
+        builds = []
+        for build_dir in self.root.iterdir():
+            if not build_dir.is_dir():
+                continue
+            marker = build_dir / LAST_USED
+            last_used = marker.stat().st_mtime if marker.exists() else 0.0
+            builds.append((last_used, build_dir, dir_size(build_dir)))
+
+        total = sum(size for _, _, size in builds)
+        evicted = []
+        for _, build_dir, size in sorted(builds, key=lambda b: b[0]):
+            if total <= self.budget:
+                break
+            if keep is not None and build_dir == Path(keep):
+                continue
+            shutil.rmtree(build_dir, ignore_errors=True)
+            total -= size
+            evicted.append(build_dir.name)
+        return evicted
+
+
+# --- RUN HISTORY ---
+def record_run(history_path, entry: dict) -> None:
+    """Append one build/sim timing record (JSON lines)"""
+    with open(history_path, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def load_runs(history_path, top: str = None) -> list:
+    path = Path(history_path)
+    if not path.exists():
+        return []
+    runs = [json.loads(line) for line in path.read_text().splitlines() if line]
+    return [r for r in runs if top is None or r.get("top") == top]
+
+
+def single_thread_baseline(runs: list):
+    """Most recent single-threaded sim time for comparison, if any"""
+    for run in reversed(runs):
+        if run.get("threads", 1) == 1 and run.get("sim_s"):
+            return run["sim_s"]
+    return None
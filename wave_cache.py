@@ -0,0 +1,596 @@
+"""
+Columnar waveform cache. A dump is parsed once into NumPy arrays: for
+every signal the times of its changes (int64), their values in the
+narrowest unsigned type that holds the signal (float64 for reals, packed
+bit rows for buses wider than 64 bits) and a known/x/z flag per change.
+The arrays are kept next to the dump (dump.vcd.waves/) as .npy files and
+memory-mapped when a run is reopened, so that takes milliseconds however
+large the dump is. Wave turns the usual questions (edge counts, duty
+cycle, sampling at clock edges, value search) into array operations.
+
+Building reads the dump in chunks and turns each into a byte matrix of
+its lines (one value change per line, as simulators write them); chunks
+that do not fit that mould go through the tokenizer VcdReader.changes
+uses. Changes are spilled to disk chunk by chunk and scattered into the
+per-signal arrays in a second pass, so memory stays flat while building.
+"""
+
+import json
+import os
+import shutil
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from vcd_index import dump_stamp
+from vcd_reader import SCALAR, TIME, VECTOR, VcdReader, skip_comment
+
+CACHE_SUFFIX = ".waves"
+FORMAT = 1
+
+# Chunks whose lines are all up to this long are parsed as a byte matrix
+# (a 64-bit vector change and an 8-byte code fit), others by the tokenizer
+LINE_WIDTH = 80
+CODE_WIDTH = 8  # identifier codes are compared as one uint64
+TABLE_SIZE = 2**16
+
+# Flag of each change
+KNOWN, UNKNOWN, HIGHZ = 0, 1, 2
+
+SPACE, DIRECTIVE = ord(" "), ord("$")
+NOT_SCALAR = 255
+
+# Value and flag of each scalar value character
+SCALAR_VALUES = np.zeros(256, np.uint64)
+SCALAR_FLAGS = np.full(256, NOT_SCALAR, np.uint8)
+for chars, value, flag in (
+    (b"0lL", 0, KNOWN),
+    (b"1hH", 1, KNOWN),
+    (b"xXuUwW-", 0, UNKNOWN),
+    (b"zZ", 0, HIGHZ),
+):
+    for char in chars:
+        SCALAR_VALUES[char], SCALAR_FLAGS[char] = value, flag
+
+# Spill files of the first pass: (name, dtype) per change
+SPILL = (
+    ("columns", np.int32),
+    ("times", np.int64),
+    ("values", np.uint64),
+    ("flags", np.uint8),
+)
+
+
+def cache_path(vcd_path) -> Path:
+    vcd_path = Path(vcd_path)
+    return vcd_path.with_name(vcd_path.name + CACHE_SUFFIX)
+
+
+def value_dtype(width: int, kind: str) -> str:
+    """Storage of one signal's values: u1..u8, f8 (reals) or wide"""
+    if kind == "real":
+        return "f8"
+    for size in (1, 2, 4, 8):
+        if width <= 8 * size:
+            return f"u{size}"
+    return "wide"
+
+
+def code_keys(codes) -> np.ndarray:
+    """Identifier codes (bytes, at most CODE_WIDTH long) as uint64 keys"""
+    return np.array(codes, dtype=f"S{CODE_WIDTH}").view("<u8").reshape(-1)
+
+
+def parse_decimal(digits: np.ndarray):
+    """Numbers in a NUL-padded matrix of ASCII digits, or None if one is not"""
+    present = digits != 0
+    values = digits.astype(np.int64) - ord("0")
+    if (present & ((values < 0) | (values > 9))).any():
+        return None
+    numbers = np.zeros(len(digits), np.int64)
+    for j in range(digits.shape[1]):
+        if not present[:, j].any():
+            break
+        numbers = np.where(present[:, j], numbers * 10 + values[:, j], numbers)
+    return numbers
+
+
+class Columns:
+    """Maps identifier codes to signal columns, one at a time or as arrays"""
+
+    def __init__(self, codes, dtypes):
+        self.index = {code: i for i, code in enumerate(codes)}
+        self.wide = np.array([dtype == "wide" for dtype in dtypes], bool)
+        short = [i for i, code in enumerate(codes) if len(code) <= CODE_WIDTH]
+        keys = code_keys([codes[i] for i in short])
+        order = np.argsort(keys)
+        self.keys = keys[order]
+        self.columns = np.array(short, np.int32)[order]
+        # Codes of up to two bytes (up to 8836 signals in iverilog's dumps)
+        # are looked up in a table instead of by binary search
+        self.table = None
+        if len(keys) and self.keys[-1] < TABLE_SIZE:
+            self.table = np.full(TABLE_SIZE, -1, np.int32)
+            self.table[self.keys] = self.columns
+        # Columns sort as int16 (a radix sort) when there are few enough
+        self.sort_type = np.int16 if len(codes) < 2**15 else np.int32
+
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        """Column of each key, -1 for undeclared codes"""
+        if self.table is not None:
+            return np.where(keys < TABLE_SIZE, self.table[keys % TABLE_SIZE], -1)
+        if not len(self.keys):
+            return np.full(len(keys), -1, np.int32)
+        pos = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        return np.where(self.keys[pos] == keys, self.columns[pos], -1)
+
+    def sort(self, found: np.ndarray) -> np.ndarray:
+        """Stable order of changes (in line order) by column"""
+        return np.argsort(found.astype(self.sort_type), kind="stable")
+
+
+def parse_fast(chunk: bytes, time: int, columns: Columns):
+    """(columns, times, values, flags, time) of a chunk's changes, sorted by
+    column, or None if the chunk needs the tokenizer (comments, reals, long
+    lines or codes, buses wider than 64 bits, several changes on a line)"""
+    if b"$comment" in chunk or b"\r" in chunk:
+        return None
+    lines = chunk.split(b"\n")
+    longest = max(map(len, lines))
+    if longest > LINE_WIDTH:
+        return None
+    # NUL padding past the longest line leaves room to read a code after it
+    width = longest + CODE_WIDTH + 2
+    matrix = np.array(lines, dtype=f"S{width}").view(np.uint8).reshape(-1, width)
+    head = matrix[:, 0]
+    is_time = head == TIME
+    is_scalar = SCALAR_FLAGS[head] != NOT_SCALAR
+    is_vector = (head == ord("b")) | (head == ord("B"))
+    # What is left may only be blank lines and lone directives ($end...)
+    rest = matrix[~(is_time | is_scalar | is_vector)]
+    if ((rest[:, 0] != 0) & (rest[:, 0] != DIRECTIVE)).any() or (rest == SPACE).any():
+        return None
+
+    stamps = parse_decimal(matrix[is_time, 1:])
+    if stamps is None:
+        return None
+    marks = np.concatenate(([time], stamps))
+    line_times = marks[np.cumsum(is_time)]
+
+    scalars = np.flatnonzero(is_scalar)
+    code = matrix[scalars, 1 : CODE_WIDTH + 2]
+    if code[:, -1].any():
+        return None
+    scalar_keys = np.ascontiguousarray(code[:, :-1]).view("<u8").reshape(-1)
+    scalar_values = SCALAR_VALUES[head[scalars]]
+    scalar_flags = SCALAR_FLAGS[head[scalars]]
+
+    vectors = np.flatnonzero(is_vector)
+    rows = matrix[vectors]
+    n = np.arange(len(vectors))
+    space = (rows == SPACE).argmax(axis=1)
+    bits = space - 1
+    if (rows[n, space] != SPACE).any() or bits.max(initial=0) > 64:
+        return None
+    code = rows[n[:, None], space[:, None] + 1 + np.arange(CODE_WIDTH + 1)]
+    if code[:, -1].any() or (code == SPACE).any():
+        return None
+    vector_keys = np.ascontiguousarray(code[:, :-1]).view("<u8").reshape(-1)
+    digits = rows[:, 1 : 1 + bits.max(initial=0)] | 0x20  # lower case
+    valid = np.arange(digits.shape[1]) < bits[:, None]
+    one = digits == ord("1")
+    x, z = valid & (digits == ord("x")), valid & (digits == ord("z"))
+    if (valid & ~(one | x | z | (digits == ord("0")))).any():
+        return None
+    vector_values = np.zeros(len(vectors), np.uint64)
+    for j in range(digits.shape[1]):
+        shifted = (vector_values << np.uint64(1)) | one[:, j]
+        vector_values = np.where(valid[:, j], shifted, vector_values)
+    vector_flags = np.where((x | z).any(axis=1), UNKNOWN, KNOWN).astype(np.uint8)
+    vector_flags[z.sum(axis=1) == np.maximum(bits, 1)] = HIGHZ
+    vector_values[vector_flags != KNOWN] = 0
+
+    lines_at = np.concatenate((scalars, vectors))
+    found = columns.lookup(np.concatenate((scalar_keys, vector_keys)))
+    keep = np.flatnonzero(found >= 0)
+    if columns.wide[found[keep]].any():
+        return None
+    # Back to line order (two sorted runs merge in linear time), then by column
+    keep = keep[np.argsort(lines_at[keep], kind="stable")]
+    order = keep[columns.sort(found[keep])]
+    return (
+        found[order].astype(np.int32),
+        line_times[lines_at[order]],
+        np.concatenate((scalar_values, vector_values))[order],
+        np.concatenate((scalar_flags, vector_flags))[order],
+        int(marks[-1]),
+    )
+
+
+def parse_exact(chunk: bytes, time: int, columns: Columns, wide: dict, comment: bool):
+    """parse_fast's result for any chunk, tokenized like VcdReader.changes;
+    values of wide buses are appended to wide[column] instead. Also returns
+    whether a $comment is still open at the end of the chunk."""
+    found, times, values, flags = [], [], [], []
+    tokens = iter(chunk.split())
+    if comment:
+        comment = skip_comment(tokens)
+    for token in tokens:
+        head = token[0]
+        if head in SCALAR:
+            code, text = token[1:], token[:1]
+        elif head == TIME:
+            time = int(token[1:])
+            continue
+        elif head in VECTOR:
+            code, text = next(tokens, None), token[1:]
+        elif token == b"$comment":
+            comment = skip_comment(tokens)
+            continue
+        else:
+            continue
+        column = columns.index.get(code)
+        if column is None:
+            continue
+        if head in SCALAR:
+            value, flag = int(SCALAR_VALUES[head]), int(SCALAR_FLAGS[head])
+        elif head in b"rR":
+            value, flag = struct.unpack("<Q", struct.pack("<d", float(text)))[0], KNOWN
+        else:
+            value, flag = vector_value(text)
+            if columns.wide[column]:
+                wide.setdefault(column, []).append(text if flag == KNOWN else b"")
+                value = 0
+        found.append(column)
+        times.append(time)
+        values.append(value & 0xFFFFFFFFFFFFFFFF)
+        flags.append(flag)
+    found = np.array(found, np.int32)
+    order = columns.sort(found)
+    return (
+        found[order],
+        np.array(times, np.int64)[order],
+        np.array(values, np.uint64)[order],
+        np.array(flags, np.uint8)[order],
+        time,
+    ), comment
+
+
+def vector_value(text: bytes) -> tuple:
+    """(value, flag) of the digits of a vector change"""
+    try:
+        return int(text, 2), KNOWN
+    except ValueError:
+        if text and not text.lower().strip(b"z"):
+            return 0, HIGHZ
+        return 0, UNKNOWN
+
+
+def pack_bits(texts: list, width: int) -> np.ndarray:
+    """Rows of big-endian bytes for the values of a wide bus (b"" = unknown)"""
+    size = (width + 7) // 8
+    rows = np.zeros((len(texts), size), np.uint8)
+    for i, text in enumerate(texts):
+        if text:
+            value = int(text, 2) & ((1 << 8 * size) - 1)
+            rows[i] = np.frombuffer(value.to_bytes(size, "big"), np.uint8)
+    return rows
+
+
+class Wave:
+    """One signal's changes: times, values and flags as (mapped) arrays
+
+    values are integers (float64 for reals; for buses wider than 64 bits,
+    rows of big-endian bytes); a change flagged UNKNOWN or HIGHZ has value
+    0. Before its first change a signal is unknown.
+    """
+
+    def __init__(self, name: str, width: int, kind: str, times, values, flags):
+        self.name = name
+        self.width = width
+        self.kind = kind
+        self.times = times
+        self.values = values
+        self.flags = flags
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __repr__(self):
+        return f"Wave({self.name!r}, width={self.width}, changes={len(self)})"
+
+    def index_at(self, at, before: bool = False):
+        """Index of the change in effect at time(s) at, -1 before the first;
+        with before=True a change exactly at a time does not count yet"""
+        side = "left" if before else "right"
+        return np.searchsorted(self.times, at, side=side) - 1
+
+    def sample(self, at, before: bool = False) -> tuple:
+        """(values, flags) at time(s) at"""
+        index = self.index_at(at, before)
+        valid = index >= 0
+        index = np.maximum(index, 0)
+        if not len(self):
+            return np.zeros_like(index, np.uint64), np.full_like(
+                index, UNKNOWN, np.uint8
+            )
+        flags = np.where(valid, self.flags[index], UNKNOWN).astype(np.uint8)
+        return self.values[index], flags
+
+    def value_at(self, time: int) -> tuple:
+        """(value, flag) at one time"""
+        values, flags = self.sample(np.array([time]))
+        return values[0], int(flags[0])
+
+    def high(self) -> np.ndarray:
+        """Per change: is the signal a known nonzero value"""
+        values = self.values
+        nonzero = values.any(axis=1) if values.ndim > 1 else values != 0
+        return nonzero & (self.flags == KNOWN)
+
+    def edges(self, rising: bool = True) -> np.ndarray:
+        """Times of 0 -> 1 (or 1 -> 0) transitions between known levels"""
+        high = self.high()
+        known = self.flags == KNOWN
+        if rising:
+            mask = known[:-1] & ~high[:-1] & high[1:]
+        else:
+            mask = high[:-1] & known[1:] & ~high[1:]
+        return self.times[1:][mask]
+
+    def edge_count(self, rising: bool = True) -> int:
+        return len(self.edges(rising))
+
+    def duty_cycle(self, start: int = None, end: int = None) -> float:
+        """Fraction of start..end (default: first to last change) spent high"""
+        if not len(self):
+            return 0.0
+        start = int(self.times[0]) if start is None else start
+        end = int(self.times[-1]) if end is None else end
+        if end <= start:
+            return 0.0
+        bounds = np.clip(np.append(self.times, end), start, end)
+        return float(np.diff(bounds)[self.high()].sum()) / (end - start)
+
+    def find(self, value, flag: int = KNOWN) -> np.ndarray:
+        """Times at which the signal changes to value (or to x/z by flag)"""
+        match = self.flags == flag
+        if flag == KNOWN:
+            if self.values.ndim > 1:
+                size = self.values.shape[1]
+                row = np.frombuffer(int(value).to_bytes(size, "big"), np.uint8)
+                match &= (self.values == row).all(axis=1)
+            else:
+                match &= self.values == value
+        return self.times[match]
+
+
+def at_edges(clock: Wave, waves, rising: bool = True, before: bool = True) -> tuple:
+    """Sample waves at the clock's edges: (edge times, [(values, flags)])
+
+    By default the values are those just before each edge, i.e. what a
+    flip-flop clocked by it would capture.
+    """
+    times = clock.edges(rising)
+    return times, [wave.sample(times, before) for wave in waves]
+
+
+class WaveCache:
+    """The columnar cache of one dump, memory-mapped"""
+
+    def __init__(self, path: Path, meta: dict):
+        self.path = path
+        self.meta = meta
+        self.codes = [code.encode() for code in meta["codes"]]
+        self.columns = {code: i for i, code in enumerate(self.codes)}
+        self.names = {}  # the first of several vars with one path wins
+        for name, column in meta["signals"]:
+            self.names.setdefault(name, column)
+        self.times = self.load_array("times")
+        self.flags = self.load_array("flags")
+        self.starts = self.load_array("starts")
+        self.offsets = self.load_array("offsets")  # into the dtype's values
+        self.values = {}
+
+    def load_array(self, name: str) -> np.ndarray:
+        return np.load(self.path / f"{name}.npy", mmap_mode="r")
+
+    @property
+    def timescale(self) -> str:
+        return self.meta["timescale"]
+
+    @property
+    def end_time(self) -> int:
+        return self.meta["end_time"]
+
+    @property
+    def signals(self) -> list:
+        """Dotted paths of every signal, in declaration order"""
+        return list(self.names)
+
+    @classmethod
+    def open(cls, vcd_path) -> "WaveCache":
+        """The cache of a dump, built first if missing or out of date"""
+        return cls.load(vcd_path) or cls.build(vcd_path)
+
+    @classmethod
+    def load(cls, vcd_path):
+        """The saved cache, or None if missing or made for another dump"""
+        path = cache_path(vcd_path)
+        try:
+            meta = json.loads((path / "meta.json").read_text())
+            stat = os.stat(vcd_path)
+            stamp = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            if meta != {**meta, "format": FORMAT, **stamp}:
+                return None
+            return cls(path, meta)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @classmethod
+    def build(cls, vcd_path) -> "WaveCache":
+        """Parse the whole dump into a fresh cache next to it"""
+        path = cache_path(vcd_path)
+        work = path.with_name(f".{path.name}.{os.getpid()}")
+        shutil.rmtree(work, ignore_errors=True)
+        work.mkdir()
+        try:
+            with VcdReader(vcd_path) as reader:
+                meta = write_cache(reader, work)
+            install(work, path)
+        except BaseException:
+            shutil.rmtree(work, ignore_errors=True)
+            raise
+        return cls(path, meta)
+
+    def column(self, name) -> int:
+        """Column of a signal by dotted path or identifier code"""
+        if isinstance(name, bytes):
+            return self.columns[name]
+        if name in self.names:
+            return self.names[name]
+        return self.columns[name.encode()]
+
+    def wave(self, name) -> Wave:
+        """A signal's changes by dotted path or identifier code"""
+        column = self.column(name)
+        start, stop = int(self.starts[column]), int(self.starts[column + 1])
+        dtype = self.meta["dtypes"][column]
+        if dtype == "wide":
+            values = np.load(self.path / f"wide_{column}.npy", mmap_mode="r")
+        else:
+            if dtype not in self.values:
+                self.values[dtype] = self.load_array(f"values_{dtype}")
+            offset = int(self.offsets[column])
+            values = self.values[dtype][offset : offset + stop - start]
+        label = name.decode() if isinstance(name, bytes) else name
+        return Wave(
+            label,
+            self.meta["widths"][column],
+            self.meta["kinds"][column],
+            self.times[start:stop],
+            values,
+            self.flags[start:stop],
+        )
+
+
+def install(work: Path, path: Path) -> None:
+    """Move a finished cache directory into place, replacing any old one"""
+    old = path.with_name(f".{path.name}.old.{os.getpid()}")
+    if path.exists():
+        path.rename(old)
+    work.rename(path)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+def declarations(header) -> tuple:
+    """(codes, widths, kinds, dtypes) of a dump's columns, one per code"""
+    codes = list(header.codes)
+    widths = [max(s.width for s in header.codes[code]) for code in codes]
+    kinds = [header.codes[code][0].kind for code in codes]
+    dtypes = [value_dtype(w, k) for w, k in zip(widths, kinds)]
+    return codes, widths, kinds, dtypes
+
+
+def write_cache(reader: VcdReader, path: Path) -> dict:
+    """Write the cache of reader's dump into directory path; returns its meta"""
+    header = reader.header
+    codes, widths, kinds, dtypes = declarations(header)
+    columns = Columns(codes, dtypes)
+
+    # First pass: each chunk's changes, sorted by column, spilled to disk
+    spill = {name: open(path / f"{name}.tmp", "wb") for name, _ in SPILL}
+    counts = np.zeros(len(codes), np.int64)
+    chunk_rows = []
+    wide = {}
+    time, comment = 0, False
+    try:
+        for chunk in reader.chunks():
+            result = None
+            if not comment:
+                result = parse_fast(chunk, time, columns)
+            if result is None:
+                result, comment = parse_exact(chunk, time, columns, wide, comment)
+            *arrays, time = result
+            for (name, _), array in zip(SPILL, arrays):
+                array.tofile(spill[name])
+            counts += np.bincount(arrays[0], minlength=len(codes))
+            chunk_rows.append(len(arrays[0]))
+    finally:
+        for f in spill.values():
+            f.close()
+
+    # Second pass: scatter every chunk into the per-signal arrays
+    starts = np.concatenate(([0], np.cumsum(counts)))
+    offsets = np.zeros(len(codes), np.int64)
+    group = np.array([dtype for dtype in dtypes])
+    totals = {}
+    for dtype in sorted(set(dtypes) - {"wide"}):
+        members = group == dtype
+        offsets[members] = np.cumsum(counts[members]) - counts[members]
+        totals[dtype] = int(counts[members].sum())
+    total = int(starts[-1])
+    times = open_array(path / "times.npy", np.int64, total)
+    flags = open_array(path / "flags.npy", np.uint8, total)
+    values = {
+        dtype: open_array(path / f"values_{dtype}.npy", dtype, size)
+        for dtype, size in totals.items()
+    }
+    written = np.zeros(len(codes), np.int64)
+    spill = {name: open(path / f"{name}.tmp", "rb") for name, _ in SPILL}
+    try:
+        for rows in chunk_rows:
+            found, chunk_times, chunk_values, chunk_flags = (
+                np.fromfile(spill[name], dtype, rows) for name, dtype in SPILL
+            )
+            chunk_counts = np.bincount(found, minlength=len(codes))
+            # Position of each change among its column's in this chunk
+            rank = np.arange(rows) - np.repeat(
+                np.cumsum(chunk_counts) - chunk_counts, chunk_counts
+            )
+            done = written[found] + rank
+            times[starts[found] + done] = chunk_times
+            flags[starts[found] + done] = chunk_flags
+            for dtype, array in values.items():
+                mine = group[found] == dtype
+                if dtype == "f8":
+                    chunk_dtype_values = chunk_values[mine].view(np.float64)
+                else:
+                    chunk_dtype_values = chunk_values[mine]
+                array[offsets[found[mine]] + done[mine]] = chunk_dtype_values
+            written += chunk_counts
+    finally:
+        for f in spill.values():
+            f.close()
+        for name, _ in SPILL:
+            (path / f"{name}.tmp").unlink(missing_ok=True)
+    for array in (times, flags, *values.values()):
+        array.flush()
+    for column, texts in wide.items():
+        np.save(path / f"wide_{column}.npy", pack_bits(texts, widths[column]))
+    for column in np.flatnonzero(columns.wide):
+        if column not in wide:
+            size = (widths[column] + 7) // 8
+            np.save(path / f"wide_{column}.npy", np.zeros((0, size), np.uint8))
+    np.save(path / "starts.npy", starts)
+    np.save(path / "offsets.npy", offsets)
+
+    meta = {
+        "format": FORMAT,
+        **dump_stamp(reader),
+        "timescale": header.timescale,
+        "end_time": time,
+        "codes": [code.decode() for code in codes],
+        "widths": widths,
+        "kinds": kinds,
+        "dtypes": dtypes,
+        "signals": [[s.path, columns.index[s.code]] for s in header.signals],
+    }
+    (path / "meta.json").write_text(json.dumps(meta))
+    return meta
+
+
+def open_array(path: Path, dtype, size: int) -> np.ndarray:
+    """A new .npy file of size elements, mapped for writing"""
+    return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(size,))
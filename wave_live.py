@@ -0,0 +1,259 @@
+"""
+Follows a dump while the simulator is still writing it. Each update maps
+what was appended since the last one and parses it from the last parsed
+offset with the wave cache's chunk parsers, appending every signal's
+changes to arrays that grow in place. LiveWaves answers like a WaveCache
+(wave, column, signals, end_time), so the waveform and monitor views can
+show a run in progress; once the run is over its changes are saved as
+the dump's cache, so the finished dump is never parsed again.
+"""
+
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+
+from vcd_index import dump_stamp
+from vcd_reader import VcdError, VcdReader
+from wave_cache import (
+    FORMAT,
+    Columns,
+    Wave,
+    cache_path,
+    declarations,
+    install,
+    pack_bits,
+    parse_exact,
+    parse_fast,
+)
+
+INITIAL_CAPACITY = 64
+
+
+class Growing:
+    """An array appended to in place, doubling its capacity when full;
+    views taken earlier stay valid (appends only write past them)"""
+
+    def __init__(self, dtype, row=()):
+        self.data = np.empty((INITIAL_CAPACITY, *row), dtype)
+        self.size = 0
+
+    def extend(self, items: np.ndarray) -> None:
+        end = self.size + len(items)
+        if end > len(self.data):
+            capacity = max(end, 2 * len(self.data))
+            data = np.empty((capacity, *self.data.shape[1:]), self.data.dtype)
+            data[: self.size] = self.data[: self.size]
+            self.data = data
+        self.data[self.size : end] = items
+        self.size = end
+
+    def view(self) -> np.ndarray:
+        return self.data[: self.size]
+
+
+class LiveWaves:
+    """The changes of a dump that is still growing, per signal"""
+
+    def __init__(self, vcd_path):
+        self.vcd_path = vcd_path
+        self.reader = None
+        self.meta = None  # set once the header is complete
+        self.codes = []
+        self.columns = None
+        self.names = {}
+        self.times, self.values, self.flags = [], [], []  # Growing per column
+        self.offset = 0  # first byte not parsed yet
+        self.time = 0
+        self.comment = False  # inside a $comment cut by the last update
+        self.version = 0  # bumped by every update that found something
+        self.running = True  # cleared by the owner once the simulator exits
+        # update() runs in a thread: parsing is serialized, and the views'
+        # reads only wait for appends
+        self.parsing = threading.Lock()
+        self.lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """The header has been read"""
+        return self.meta is not None
+
+    @property
+    def complete(self) -> bool:
+        """Every byte written so far has been parsed"""
+        return self.ready and self.offset >= self.reader.size
+
+    @property
+    def timescale(self) -> str:
+        return self.meta["timescale"]
+
+    @property
+    def end_time(self) -> int:
+        return self.time
+
+    @property
+    def signals(self) -> list:
+        """Dotted paths of every signal, in declaration order"""
+        return list(self.names)
+
+    def close(self) -> None:
+        """Unmap the dump (the changes read so far stay readable)"""
+        with self.parsing:
+            if self.reader is not None:
+                self.reader.close()
+
+    # --- PARSING ---
+    def update(self) -> bool:
+        """Parse what was appended since the last call; True if anything was"""
+        with self.parsing:
+            if self.reader is None:
+                try:
+                    self.reader = VcdReader(self.vcd_path)
+                except (OSError, VcdError):
+                    return False  # not created yet, or still empty
+            else:
+                self.reader.refresh()
+            if self.meta is None and not self.read_header():
+                return False
+            # Whole lines only: the simulator may be half way through one
+            data = self.reader.map
+            end = data.rfind(b"\n", self.offset) + 1
+            if end <= self.offset:
+                return False
+            for chunk in self.reader.chunks(self.offset, end):
+                self.append(chunk)
+                self.offset += len(chunk)
+            self.version += 1
+            return True
+
+    def read_header(self) -> bool:
+        try:
+            header = self.reader.header
+        except VcdError:
+            return False  # $enddefinitions not written yet
+        codes, widths, kinds, dtypes = declarations(header)
+        self.columns = Columns(codes, dtypes)
+        self.codes = codes
+        self.times = [Growing(np.int64) for _ in codes]
+        self.flags = [Growing(np.uint8) for _ in codes]
+        self.values = []
+        for width, dtype in zip(widths, dtypes):
+            if dtype == "wide":
+                # Rows of big-endian bytes, as pack_bits makes them
+                self.values.append(Growing(np.uint8, ((width + 7) // 8,)))
+            else:
+                self.values.append(Growing(dtype))
+        for signal in header.signals:
+            self.names.setdefault(signal.path, self.columns.index[signal.code])
+        self.meta = {
+            "timescale": header.timescale,
+            "codes": [code.decode() for code in codes],
+            "widths": widths,
+            "kinds": kinds,
+            "dtypes": dtypes,
+            "signals": [[s.path, self.columns.index[s.code]] for s in header.signals],
+        }
+        self.offset = header.data_start
+        self.version += 1
+        return True
+
+    def append(self, chunk: bytes) -> None:
+        """Parse one chunk of whole lines onto the signals' arrays"""
+        wide = {}
+        result = None
+        if not self.comment:
+            result = parse_fast(chunk, self.time, self.columns)
+        if result is None:
+            result, self.comment = parse_exact(
+                chunk, self.time, self.columns, wide, self.comment
+            )
+        found, times, values, flags, time = result
+        counts = np.bincount(found, minlength=len(self.codes))
+        ends = np.cumsum(counts)
+        dtypes, widths = self.meta["dtypes"], self.meta["widths"]
+        with self.lock:
+            for column in np.flatnonzero(counts):
+                mine = slice(ends[column] - counts[column], ends[column])
+                dtype = dtypes[column]
+                if dtype == "wide":
+                    column_values = pack_bits(wide[column], widths[column])
+                elif dtype == "f8":
+                    column_values = values[mine].view(np.float64)
+                else:
+                    column_values = values[mine]
+                self.times[column].extend(times[mine])
+                self.values[column].extend(column_values)
+                self.flags[column].extend(flags[mine])
+            self.time = time
+
+    # --- LOOKUPS (as WaveCache) ---
+    def column(self, name) -> int:
+        """Column of a signal by dotted path or identifier code"""
+        if isinstance(name, bytes):
+            return self.columns.index[name]
+        if name in self.names:
+            return self.names[name]
+        return self.columns.index[name.encode()]
+
+    def wave(self, name) -> Wave:
+        """A signal's changes so far by dotted path or identifier code"""
+        column = self.column(name)
+        with self.lock:
+            times = self.times[column].view()
+            values = self.values[column].view()
+            flags = self.flags[column].view()
+        label = name.decode() if isinstance(name, bytes) else name
+        return Wave(
+            label,
+            self.meta["widths"][column],
+            self.meta["kinds"][column],
+            times,
+            values,
+            flags,
+        )
+
+    # --- SAVING ---
+    def save(self, vcd_path) -> None:
+        """Write the changes as the cache of the finished dump (now at
+        vcd_path), in WaveCache's layout"""
+        path = cache_path(vcd_path)
+        work = path.with_name(f".{path.name}.{os.getpid()}")
+        shutil.rmtree(work, ignore_errors=True)
+        work.mkdir()
+        try:
+            self.write(work)
+            install(work, path)
+        except BaseException:
+            shutil.rmtree(work, ignore_errors=True)
+            raise
+
+    def write(self, path) -> None:
+        dtypes = self.meta["dtypes"]
+        counts = np.array([grown.size for grown in self.times], np.int64)
+        offsets = np.zeros(len(self.codes), np.int64)
+        np.save(path / "times.npy", joined(self.times, np.int64))
+        np.save(path / "flags.npy", joined(self.flags, np.uint8))
+        group = np.array(dtypes)
+        for dtype in sorted(set(dtypes) - {"wide"}):
+            members = np.flatnonzero(group == dtype)
+            offsets[members] = np.cumsum(counts[members]) - counts[members]
+            values = joined([self.values[column] for column in members], dtype)
+            np.save(path / f"values_{dtype}.npy", values)
+        for column in np.flatnonzero(group == "wide"):
+            np.save(path / f"wide_{column}.npy", self.values[column].view())
+        np.save(path / "starts.npy", np.concatenate(([0], np.cumsum(counts))))
+        np.save(path / "offsets.npy", offsets)
+        meta = {
+            "format": FORMAT,
+            **dump_stamp(self.reader),
+            **self.meta,
+            "end_time": self.time,
+        }
+        (path / "meta.json").write_text(json.dumps(meta))
+
+
+def joined(arrays: list, dtype) -> np.ndarray:
+    """The contents of Growing arrays, end to end"""
+    return np.concatenate([np.zeros(0, dtype), *(grown.view() for grown in arrays)])
@@ -0,0 +1,210 @@
+"""
+Tabular monitor built from a dump instead of $monitor calls: chosen
+signals are sampled at a clock's edges with one searchsorted per signal
+(Wave.sample), and the table widget formats only the rows on screen, so
+millions of cycles page as quickly as ten.
+"""
+
+import re
+
+import numpy as np
+from rich.segment import Segment
+from rich.style import Style
+from textual.binding import Binding
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from vcd_reader import timescale_seconds
+from wave_view import format_time, format_value
+
+EDGES = ("rising", "falling", "both")
+
+# Signals sampled by default besides the clock
+MAX_COLUMNS = 12
+MAX_CELL = 18  # widest column, in characters
+
+CLOCK_RE = re.compile(r"clk|clock", re.I)
+
+HEADER_STYLE = Style(color="#FFD700", bold=True)
+TIME_STYLE = Style(color="bright_black")
+CHANGED_STYLE = Style(color="#00FF41", bold=True)
+
+
+def guess_clock(cache):
+    """Dotted path of the likeliest clock (a 1-bit *clk* / *clock* signal
+    nearest the top), or None"""
+    found = []
+    for name in cache.signals:
+        leaf = name.rsplit(".", 1)[-1]
+        width = cache.meta["widths"][cache.column(name)]
+        if width == 1 and CLOCK_RE.search(leaf):
+            found.append((name.count("."), len(leaf), name))
+    return min(found)[2] if found else None
+
+
+def default_signals(cache, clock: str) -> list:
+    """The clock's sibling signals (same scope), up to MAX_COLUMNS"""
+    scope = clock.rpartition(".")[0]
+    siblings = [
+        name
+        for name in cache.signals
+        if name != clock and name.rpartition(".")[0] == scope
+    ]
+    return siblings[:MAX_COLUMNS]
+
+
+class Monitor:
+    """Signals sampled at a clock's edges: one row per edge, as arrays"""
+
+    def __init__(self, cache, clock: str, names, edge="rising", before=False):
+        self.cache = cache
+        self.clock = clock
+        self.names = [clock, *names]
+        self.edge = edge
+        self.before = before
+        self.unit = timescale_seconds(cache.timescale)
+        self.waves = [cache.wave(name) for name in self.names]
+        clock_wave = self.waves[0]
+        if edge == "both":
+            times = np.concatenate((clock_wave.edges(True), clock_wave.edges(False)))
+            self.times = np.sort(times)
+        else:
+            self.times = clock_wave.edges(edge == "rising")
+        # before=True: values just before each edge, as flip-flops see them;
+        # otherwise once the edge's time step has settled (like $strobe)
+        samples = [wave.sample(self.times, before) for wave in self.waves]
+        self.values = [values for values, _ in samples]
+        self.flags = [flags for _, flags in samples]
+        self.rows = np.arange(len(self.times))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def changed(self) -> np.ndarray:
+        """Per edge: does any sampled signal differ from the previous edge"""
+        changed = np.zeros(len(self.times), bool)
+        if len(changed):
+            changed[0] = True
+        for values, flags in zip(self.values, self.flags):
+            differs = values[1:] != values[:-1]
+            if differs.ndim > 1:
+                differs = differs.any(axis=1)
+            changed[1:] |= differs | (flags[1:] != flags[:-1])
+        return changed
+
+    def changes_only(self, on: bool) -> None:
+        """Show only the edges where something changed (as $monitor would)"""
+        self.rows = np.flatnonzero(self.changed()) if on else np.arange(len(self.times))
+
+    def changed_cells(self, row: int) -> list:
+        """Per signal: does it differ from the edge before this row's"""
+        i = self.rows[row]
+        if i == 0:
+            return [False] * len(self.waves)
+        changed = []
+        for values, flags in zip(self.values, self.flags):
+            differs = values[i] != values[i - 1]
+            changed.append(bool(np.any(differs)) or flags[i] != flags[i - 1])
+        return changed
+
+    def row_at_time(self, time: int) -> int:
+        """First shown row at or after time"""
+        return int(np.searchsorted(self.times[self.rows], time))
+
+    def cells(self, row: int) -> list:
+        """Time and value texts of a shown row"""
+        i = self.rows[row]
+        cells = [format_time(self.times[i], self.unit)]
+        for wave, values, flags in zip(self.waves, self.values, self.flags):
+            cells.append(format_value(wave, values[i], flags[i]))
+        return cells
+
+    def widths(self) -> list:
+        """Column widths fitting the headers and the widest possible value"""
+        widths = [max(8, len("TIME"))]
+        for name, wave in zip(self.names, self.waves):
+            digits = 10 if wave.kind == "real" else -(-wave.width // 4)
+            header = name.rsplit(".", 1)[-1]
+            widths.append(min(MAX_CELL, max(len(header), digits, 1)))
+        return widths
+
+
+class MonitorTable(ScrollView, can_focus=True):
+    """Virtualized view of a Monitor: a fixed header, rows drawn on demand"""
+
+    BINDINGS = [
+        Binding("g", "goto_row(0)", "Top", show=False),
+        Binding("G", "goto_end", "Bottom", show=False),
+    ]
+
+    DEFAULT_CSS = """
+    MonitorTable {
+        background: $surface;
+        color: $text;
+        overflow: auto;
+    }
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.monitor = None
+        self.column_widths = []
+
+    def show(self, monitor: Monitor) -> None:
+        self.monitor = monitor
+        self.column_widths = monitor.widths()
+        self.update_rows()
+
+    def update_rows(self) -> None:
+        """Resize to the monitor's rows (after a filter change)"""
+        width = sum(self.column_widths) + 3 * len(self.column_widths)
+        self.virtual_size = Size(width, len(self.monitor) + 1)
+        self.refresh()
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        status = getattr(self.screen, "update_status", None)
+        if status is not None:
+            status()
+
+    def action_goto_row(self, row: int) -> None:
+        self.scroll_to(y=row, animate=False)
+
+    def action_goto_end(self) -> None:
+        self.scroll_end(animate=False, x_axis=False)
+
+    def current_row(self) -> int:
+        return int(self.scroll_y)
+
+    def cell(self, text: str, column: int) -> str:
+        width = self.column_widths[column]
+        if len(text) > width:
+            text = "…" + text[1 - width :]
+        return f"{text:>{width}}"
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.size.width
+        base = self.rich_style
+        monitor = self.monitor
+        if monitor is None:
+            return Strip.blank(width, base)
+        if y == 0:
+            headers = ["TIME"] + [
+                name.rsplit(".", 1)[-1].upper() for name in monitor.names
+            ]
+            text = " | ".join(self.cell(h, i) for i, h in enumerate(headers))
+            strip = Strip([Segment(text, base + HEADER_STYLE)])
+            return strip.crop_extend(scroll_x, scroll_x + width, base)
+        row = scroll_y + y - 1
+        if row >= len(monitor):
+            return Strip.blank(width, base)
+        cells = monitor.cells(row)
+        segments = [Segment(self.cell(cells[0], 0), base + TIME_STYLE)]
+        # Values that changed since the previous edge stand out
+        for i, changed in enumerate(monitor.changed_cells(row), 1):
+            style = base + CHANGED_STYLE if changed else base
+            segments.append(Segment(" | ", base + TIME_STYLE))
+            segments.append(Segment(self.cell(cells[i], i), style))
+        return Strip(segments).crop_extend(scroll_x, scroll_x + width, base)
@@ -0,0 +1,473 @@
+"""
+In-terminal waveform viewer for WaveCache signals: one row per signal
+drawn with block characters, a time ruler and a cursor. Each screen
+column is summarized with one binary search per column boundary, and
+columns holding many changes take their min/max from a per-signal
+pyramid of block summaries (built off the UI thread the first time it
+is needed), so a frame costs O(columns) whatever the zoom or dump size.
+"""
+
+import asyncio
+import math
+
+import numpy as np
+from rich.segment import Segment
+from rich.style import Style
+from textual.binding import Binding
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from vcd_reader import timescale_seconds
+from wave_cache import HIGHZ, KNOWN, UNKNOWN
+
+# Changes summarized per block at the finest pyramid level; spans of a
+# few blocks are reduced from the changes themselves
+BASE_BLOCK = 16
+
+NAME_WIDTH = 32  # signal name and value at the cursor
+VALUE_WIDTH = 10
+TICK_SPACING = 14  # columns between ruler labels
+MIN_SCALE = 1 / 16  # time steps per column when zoomed in all the way
+
+TIME_UNITS = (("s", 1.0), ("ms", 1e-3), ("us", 1e-6), ("ns", 1e-9), ("ps", 1e-12))
+
+HIGH_STYLE = Style(color="#00FF41")
+LOW_STYLE = Style(color="#00AA2B")
+BUS_STYLE = Style(color="#00BFFF")
+X_STYLE = Style(color="#FF5555")
+Z_STYLE = Style(color="#FFD700")
+RULER_STYLE = Style(color="bright_black")
+NAME_STYLE = Style(color="#C0C0C0")
+SELECTED_STYLE = Style(color="#FFD700", bold=True)
+CURSOR_STYLE = Style(reverse=True)
+
+
+def format_time(ticks, unit: float) -> str:
+    """A time in time steps of unit seconds, e.g. "12.5ns" """
+    seconds = ticks * unit
+    for name, scale in TIME_UNITS:
+        if abs(seconds) >= scale:
+            return f"{seconds / scale:.4g}{name}"
+    return f"{seconds / 1e-15:.4g}fs" if seconds else "0"
+
+
+def format_value(wave, value, flag) -> str:
+    """A value as shown: x/z, 0/1, a float or hex"""
+    if flag == UNKNOWN:
+        return "x"
+    if flag == HIGHZ:
+        return "z"
+    if wave.kind == "real":
+        return f"{float(value):.6g}"
+    if wave.values.ndim > 1:
+        value = int.from_bytes(bytes(value), "big")
+    if wave.width == 1:
+        return str(int(value))
+    return f"{int(value):x}"
+
+
+def reduce_ranges(ufunc, array, start, stop):
+    """ufunc.reduce over array[start[i]:stop[i]] for each i (stop > start)"""
+    last = len(array) - 1
+    bounds = np.empty(2 * len(start), np.intp)
+    bounds[0::2] = start
+    bounds[1::2] = np.minimum(stop, last)
+    result = ufunc.reduceat(array, bounds)[0::2]
+    # reduceat cannot take len(array) as a bound: fold the last one in
+    past = stop > last
+    result[past] = ufunc(result[past], array[last])
+    return result
+
+
+class Lod:
+    """Level-of-detail pyramid over a wave's changes: level k holds the min
+    and max value and the worst flag of each block of BASE_BLOCK * 2**k"""
+
+    def __init__(self, wave):
+        self.wave = wave
+        self.mins, self.maxs, self.flags = [], [], []
+        mins, maxs, flags = wave.values, wave.values, wave.flags
+        step = BASE_BLOCK
+        while len(mins) > 1:
+            starts = np.arange(0, len(mins), step)
+            mins = np.minimum.reduceat(mins, starts)
+            maxs = np.maximum.reduceat(maxs, starts)
+            flags = np.maximum.reduceat(flags, starts)
+            self.mins.append(mins)
+            self.maxs.append(maxs)
+            self.flags.append(flags)
+            step = 2
+
+    def summary(self, start, stop) -> tuple:
+        """(mins, maxs, worst flags) of the changes start[i]..stop[i]-1
+
+        Each span is read at the coarsest level whose blocks are at most a
+        quarter of it long; blocks at its ends may reach past it by less
+        than a block, which only shows at column boundaries.
+        """
+        span = np.maximum(stop - start, 1)
+        level = np.floor(np.log2(span / (4 * BASE_BLOCK))).astype(int)
+        level = np.minimum(level, len(self.mins) - 1)
+        wave = self.wave
+        mins = np.empty(len(start), wave.values.dtype)
+        maxs = np.empty(len(start), wave.values.dtype)
+        flags = np.empty(len(start), np.uint8)
+        for k in np.unique(level):
+            mine = level == k
+            if k < 0:
+                arrays = wave.values, wave.values, wave.flags
+                lo, hi = start[mine], stop[mine]
+            else:
+                arrays = self.mins[k], self.maxs[k], self.flags[k]
+                block = BASE_BLOCK << k
+                lo, hi = start[mine] // block, -(-stop[mine] // block)
+            mins[mine] = reduce_ranges(np.minimum, arrays[0], lo, hi)
+            maxs[mine] = reduce_ranges(np.maximum, arrays[1], lo, hi)
+            flags[mine] = reduce_ranges(np.maximum, arrays[2], lo, hi)
+        return mins, maxs, flags
+
+
+class WaveRow:
+    """A signal shown in the view"""
+
+    __slots__ = ("name", "wave", "lod", "building", "cells", "key")
+
+    def __init__(self, name: str, wave):
+        self.name = name
+        self.wave = wave
+        self.lod = None
+        self.building = False
+        self.cells = None  # drawn columns, for the view in key
+        self.key = None
+
+
+class WaveView(ScrollView, can_focus=True):
+    """Waveforms of WaveCache signals with a time ruler and a cursor"""
+
+    BINDINGS = [
+        Binding("left", "move_cursor(-1)", "Cursor left", show=False),
+        Binding("right", "move_cursor(1)", "Cursor right", show=False),
+        Binding("shift+left", "pan(-0.5)", "Pan left", show=False),
+        Binding("shift+right", "pan(0.5)", "Pan right", show=False),
+        Binding("up", "select(-1)", "Previous signal", show=False),
+        Binding("down", "select(1)", "Next signal", show=False),
+        Binding("plus,equals_sign", "zoom(0.5)", "Zoom in"),
+        Binding("minus", "zoom(2)", "Zoom out"),
+        Binding("f", "fit", "Fit"),
+        Binding("n", "next_change(1)", "Next change"),
+        Binding("N", "next_change(-1)", "Previous change"),
+        Binding("home", "goto_time(0)", "Start", show=False),
+        Binding("end", "goto_end", "End", show=False),
+    ]
+
+    DEFAULT_CSS = """
+    WaveView {
+        background: $surface;
+        color: $text;
+        overflow-x: hidden;
+        overflow-y: auto;
+    }
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = None
+        self.rows = []
+        self.selected = 0
+        self.start = 0.0  # time at the left edge
+        self.scale = 1.0  # time steps per column
+        self.cursor = 0
+        self.unit = 1.0
+        self.fitted = True  # refit on resize until zoomed or panned
+
+    def show(self, cache, names) -> None:
+        """Show signals (dotted paths) of a WaveCache, zoomed to fit"""
+        self.cache = cache
+        self.unit = timescale_seconds(cache.timescale)
+        self.set_signals(names)
+        self.action_fit()
+
+    def set_signals(self, names) -> None:
+        self.rows = [WaveRow(name, self.cache.wave(name)) for name in names]
+        self.selected = 0
+        self.virtual_size = Size(0, len(self.rows) + 1)
+        self.scroll_to(0, 0, animate=False)
+        self.invalidate()
+
+    def reload(self) -> None:
+        """Take up changes appended since (the cache is a LiveWaves)"""
+        for row in self.rows:
+            row.wave = self.cache.wave(row.name)
+        if self.fitted:
+            self.action_fit()
+        else:
+            self.invalidate()
+
+    @property
+    def end_time(self) -> int:
+        return self.cache.end_time if self.cache is not None else 0
+
+    @property
+    def wave_width(self) -> int:
+        return max(1, self.size.width - NAME_WIDTH)
+
+    def invalidate(self) -> None:
+        """Redraw every row and the status line"""
+        for row in self.rows:
+            row.cells = None
+        self.refresh()
+        status = (
+            getattr(self.screen, "update_status", None) if self.is_mounted else None
+        )
+        if status is not None:
+            status()
+
+    def on_resize(self, event) -> None:
+        if self.fitted:
+            self.action_fit()
+        else:
+            self.invalidate()
+
+    def status(self) -> str:
+        """Cursor, visible time range and zoom, for the screen's status line"""
+        if self.cache is None:
+            return ""
+        unit = self.unit
+        end = self.start + self.wave_width * self.scale
+        return " | ".join(
+            [
+                f"cursor {format_time(self.cursor, unit)}",
+                f"view {format_time(self.start, unit)} - {format_time(end, unit)}",
+                f"{format_time(self.scale, unit)}/col",
+                f"{len(self.rows):,} signals",
+            ]
+        )
+
+    # --- NAVIGATION ---
+    def column_of(self, time) -> int:
+        return math.floor((time - self.start) / self.scale)
+
+    def set_view(self, start: float, scale: float) -> None:
+        top = max(self.end_time, 1) * 2 / self.wave_width
+        self.scale = min(max(scale, MIN_SCALE), max(top, MIN_SCALE))
+        self.start = max(0.0, start)
+        self.invalidate()
+
+    def set_cursor(self, time) -> None:
+        """Move the cursor, panning to keep it on screen"""
+        self.cursor = int(min(max(time, 0), self.end_time))
+        if not 0 <= self.column_of(self.cursor) < self.wave_width:
+            self.fitted = False
+            self.start = max(0.0, self.cursor - self.wave_width * self.scale / 2)
+        self.invalidate()
+
+    def action_fit(self) -> None:
+        self.fitted = True
+        self.set_view(0.0, (self.end_time + 1) / self.wave_width)
+
+    def action_zoom(self, factor: float) -> None:
+        """Zoom around the cursor (it keeps its column)"""
+        self.fitted = False
+        column = (self.cursor - self.start) / self.scale
+        scale = self.scale * factor
+        self.set_view(self.cursor - column * max(scale, MIN_SCALE), scale)
+
+    def action_pan(self, fraction: float) -> None:
+        self.fitted = False
+        self.set_view(self.start + fraction * self.wave_width * self.scale, self.scale)
+
+    def action_move_cursor(self, columns: int) -> None:
+        self.set_cursor(self.cursor + columns * max(1.0, self.scale))
+
+    def action_goto_time(self, time: int) -> None:
+        self.set_cursor(time)
+
+    def action_goto_end(self) -> None:
+        self.set_cursor(self.end_time)
+
+    def action_next_change(self, direction: int) -> None:
+        """Move the cursor to the selected signal's next (or previous) change"""
+        if not self.rows:
+            return
+        times = self.rows[self.selected].wave.times
+        if direction > 0:
+            i = np.searchsorted(times, self.cursor, side="right")
+            if i < len(times):
+                self.set_cursor(times[i])
+        else:
+            i = np.searchsorted(times, self.cursor, side="left") - 1
+            if i >= 0:
+                self.set_cursor(times[i])
+
+    def action_select(self, step: int) -> None:
+        if not self.rows:
+            return
+        self.selected = max(0, min(self.selected + step, len(self.rows) - 1))
+        top = int(self.scroll_y)
+        visible = max(1, self.size.height - 1)
+        if self.selected < top:
+            self.scroll_to(y=self.selected, animate=False)
+        elif self.selected >= top + visible:
+            self.scroll_to(y=self.selected - visible + 1, animate=False)
+        self.refresh()
+
+    def on_click(self, event) -> None:
+        """Select the clicked signal and put the cursor under the mouse"""
+        number = int(self.scroll_y) + event.y - 1
+        if 0 <= number < len(self.rows):
+            self.selected = number
+        if event.x >= NAME_WIDTH and self.cache is not None:
+            self.set_cursor(math.ceil(self.start + (event.x - NAME_WIDTH) * self.scale))
+        self.refresh()
+
+    # --- RENDERING ---
+    def lod(self, row: WaveRow):
+        """The row's pyramid, or None while it is being built in a thread
+        (again, when the wave has grown since)"""
+        if row.lod is not None and row.lod.wave is row.wave:
+            return row.lod
+        if not row.building and row.wave.values.ndim == 1:
+            row.building = True
+            self.run_worker(self.build_lod(row), group="lod")
+        return None
+
+    async def build_lod(self, row: WaveRow) -> None:
+        row.lod = await asyncio.to_thread(Lod, row.wave)
+        row.building = False
+        row.cells = None
+        self.refresh()
+
+    def bounds(self) -> np.ndarray:
+        """First time step of each column, then the end of the last one"""
+        edges = self.start + np.arange(self.wave_width + 1) * self.scale
+        return np.ceil(edges).astype(np.int64)
+
+    def draw(self, row: WaveRow) -> list:
+        """(character, style) of each column of a row"""
+        wave = row.wave
+        columns = self.wave_width
+        if not len(wave):
+            return [(" ", None)] * columns
+        index = np.searchsorted(wave.times, self.bounds())
+        lo, hi = index[:-1], index[1:]
+        count = hi - lo
+        started, entered = hi > 0, lo > 0
+        before, after = np.maximum(lo - 1, 0), np.maximum(hi - 1, 0)
+        values, flags = wave.values, wave.flags
+        start_value, end_value = values[before], values[after]
+        start_flag, end_flag = flags[before], flags[after]
+        if values.ndim > 1:
+            differs = (start_value != end_value).any(axis=1)
+        else:
+            differs = start_value != end_value
+
+        # Columns with several changes: busy unless they hold one value
+        busy = count >= 2
+        busy_x = np.zeros(columns, bool)
+        if busy.any():
+            lod = self.lod(row)
+            if lod is not None:
+                mins, maxs, worst = lod.summary(before[busy], hi[busy])
+                busy[busy] = (mins != maxs) | (worst != KNOWN)
+                busy_x[count >= 2] = worst != KNOWN
+
+        bit = wave.width == 1 and wave.kind != "real" and values.ndim == 1
+        cells = []
+        for j in range(columns):
+            if not started[j]:
+                cells.append((" ", None))
+            elif busy[j]:
+                cells.append(("▒", X_STYLE if busy_x[j] else BUS_STYLE))
+            elif count[j] and entered[j] and differs[j] and not bit:
+                cells.append(("╳", BUS_STYLE))
+            elif end_flag[j] == UNKNOWN:
+                cells.append(("▒", X_STYLE))
+            elif end_flag[j] == HIGHZ:
+                cells.append(("─", Z_STYLE))
+            elif not bit:
+                cells.append(("═", BUS_STYLE))
+            elif count[j] and entered[j] and differs[j] and start_flag[j] == KNOWN:
+                cells.append(("╱", HIGH_STYLE) if end_value[j] else ("╲", LOW_STYLE))
+            else:
+                cells.append(("▔", HIGH_STYLE) if end_value[j] else ("▁", LOW_STYLE))
+        if not bit:
+            self.label_runs(cells, wave, end_value)
+        return cells
+
+    def label_runs(self, cells: list, wave, values) -> None:
+        """Write each stable stretch of a bus's value into it, as far as fits"""
+        j = 0
+        while j < len(cells):
+            if cells[j][0] != "═":
+                j += 1
+                continue
+            k = j
+            while k < len(cells) and cells[k][0] == "═":
+                k += 1
+            text = format_value(wave, values[j], KNOWN)
+            if len(text) > k - j:
+                text = text[: k - j - 1] + "…" if k - j >= 2 else ""
+            for i, char in enumerate(text):
+                cells[j + i] = (char, BUS_STYLE)
+            j = k
+
+    def gutter(self, row: WaveRow, number: int) -> Segment:
+        """Signal name (its tail if long) and value at the cursor"""
+        width = NAME_WIDTH - VALUE_WIDTH - 2
+        name = row.name if len(row.name) <= width else "…" + row.name[1 - width :]
+        value = ""
+        if len(row.wave) and row.wave.times[0] <= self.cursor:
+            value = format_value(row.wave, *row.wave.value_at(self.cursor))
+            if len(value) > VALUE_WIDTH:
+                value = "…" + value[1 - VALUE_WIDTH :]
+        style = SELECTED_STYLE if number == self.selected else NAME_STYLE
+        return Segment(f"{name:<{width}} {value:>{VALUE_WIDTH}} ", style)
+
+    def render_ruler(self, width: int) -> Strip:
+        base = self.rich_style
+        label = f"@ {format_time(self.cursor, self.unit)}"
+        chars = [" "] * self.wave_width
+        for j in range(0, self.wave_width, TICK_SPACING):
+            tick = "▏" + format_time(self.start + j * self.scale, self.unit)
+            chars[j : j + len(tick)] = tick[: self.wave_width - j]
+        cursor = self.column_of(self.cursor)
+        if 0 <= cursor < self.wave_width:
+            chars[cursor] = "▼"
+        segments = [
+            Segment(f"{label:<{NAME_WIDTH}}", base + SELECTED_STYLE),
+            Segment("".join(chars), base + RULER_STYLE),
+        ]
+        return Strip(segments).crop_extend(0, width, base)
+
+    def render_line(self, y: int) -> Strip:
+        width = self.size.width
+        base = self.rich_style
+        if self.cache is None:
+            return Strip.blank(width, base)
+        if y == 0:
+            return self.render_ruler(width)
+        number = int(self.scroll_y) + y - 1
+        if number >= len(self.rows):
+            return Strip.blank(width, base)
+        row = self.rows[number]
+        key = (self.start, self.scale, self.wave_width)
+        if row.cells is None or row.key != key:
+            row.cells, row.key = self.draw(row), key
+        cells = list(row.cells)
+        cursor = self.column_of(self.cursor)
+        if 0 <= cursor < len(cells):
+            char, style = cells[cursor]
+            cells[cursor] = (char, (style or Style()) + CURSOR_STYLE)
+
+        segments = [self.gutter(row, number)]
+        run, run_style = [], None
+        for char, style in cells:
+            if style is not run_style and run:
+                segments.append(Segment("".join(run), base + (run_style or Style())))
+                run = []
+            run.append(char)
+            run_style = style
+        if run:
+            segments.append(Segment("".join(run), base + (run_style or Style())))
+        return Strip(segments).crop_extend(0, width, base)
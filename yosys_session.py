@@ -0,0 +1,129 @@
+"""
+Long-lived Yosys worker driven over its interactive shell with pexpect.
+The parsed design is kept in memory (`design -save`) so repeated stat,
+schematic and netlist requests skip Yosys startup and re-parsing; sources
+are only re-read when their content hash changes.
+"""
+
+import os
+import signal
+import threading
+
+try:
+    import pexpect
+except ImportError:
+    pexpect = None
+
+from build_cache import hash_key
+
+# Interactive prompt: "yosys> " or "yosys [top]> " after `cd`
+PROMPT = r"yosys[^\r\n>]*> "
+
+# Name of the saved, freshly parsed design inside the session
+PARSED = "parsed"
+
+
+class YosysError(Exception):
+    """Yosys reported an ERROR for a command"""
+
+
+class YosysSession:
+    """One persistent `yosys` process; all methods are blocking and thread-safe"""
+
+    def __init__(self, yosys: str = "yosys", timeout: int = 300):
+        self.yosys = yosys
+        self.timeout = timeout
+        self.child = None
+        self.loaded_key = None
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def available() -> bool:
+        return pexpect is not None
+
+    @property
+    def alive(self) -> bool:
+        return self.child is not None and self.child.isalive()
+
+    def start(self) -> None:
+        try:
+            self.child = pexpect.spawn(
+                self.yosys, ["-Q"], encoding="utf-8", timeout=self.timeout, echo=False
+            )
+            self.child.delaybeforesend = None
+            self.child.expect(PROMPT)
+        except pexpect.ExceptionPexpect as e:
+            self._reset()
+            raise YosysError(f"cannot start {self.yosys}: {e}") from e
+        self.loaded_key = None
+
+    def close(self) -> None:
+        """Kill the worker; a request in progress fails with YosysError and
+        the next one starts a fresh worker"""
+        child = self.child
+        if child is None:
+            return
+        try:
+            os.kill(child.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        # A request in progress is still using the child: it resets the
+        # session itself once the kill makes it fail
+        if self.lock.acquire(blocking=False):
+            try:
+                self._reset()
+            finally:
+                self.lock.release()
+
+    def _reset(self) -> None:
+        if self.child is not None:
+            self.child.close(force=True)
+        self.child = None
+        self.loaded_key = None
+
+    def _run(self, command: str) -> str:
+        self.child.sendline(command)
+        self.child.expect(PROMPT)
+        output = self.child.before.replace("\r\n", "\n")
+        if "ERROR:" in output:
+            raise YosysError(output.strip())
+        return output
+
+    def load(self, sources, top=None, read_flags: str = "-sv") -> bool:
+        """Parse sources unless already loaded; returns True if (re)parsed"""
+        texts = []
+        for path in sources:
+            with open(path) as f:
+                texts.append(f"{path}\0{f.read()}")
+        key = hash_key(read_flags, top or "", *texts)
+
+        if not self.alive:
+            self.start()
+        if key == self.loaded_key:
+            return False
+
+        self.loaded_key = None
+        self._run("design -reset")
+        self._run(f"read_verilog {read_flags} {' '.join(str(s) for s in sources)}")
+        self._run(f"hierarchy -top {top}" if top else "hierarchy -auto-top")
+        self._run(f"design -save {PARSED}")
+        self.loaded_key = key
+        return True
+
+    def request(self, sources, commands, top=None) -> tuple:
+        """Run commands on a fresh copy of the parsed design
+
+        Returns (output, reparsed). The worker is restarted if it died.
+        """
+        if pexpect is None:
+            raise YosysError("pexpect is not installed")
+        with self.lock:
+            try:
+                reparsed = self.load(sources, top)
+                self._run(f"design -load {PARSED}")
+                output = "".join(self._run(command) for command in commands)
+            except (pexpect.ExceptionPexpect, OSError) as e:
+                # Also a sendline to a worker close() killed
+                self._reset()
+                raise YosysError(f"yosys worker died: {e}") from e
+            return output, reparsed